@@ -0,0 +1,262 @@
+"""
+    mano_plugin.artifact_cache
+    ~~~~~~~~
+    Persistent cache of package content downloaded from blueprints.
+"""
+import hashlib
+import os
+import posixpath
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk.dedup import file_sha256
+
+DEFAULT_MAX_SIZE = 4 * 1024 ** 3
+OBJECTS_DIR = 'objects'
+INDEX_DIR = 'index'
+CHECKOUTS_DIR = 'checkouts'
+# Checkouts left behind by a killed process are removed after a day.
+CHECKOUT_TTL = 24 * 3600
+
+
+class ArtifactCache:
+    """
+        Content-addressed cache of blueprint resources on local disk.
+
+        Content is stored once per SHA-256 under `objects`, whatever the
+        blueprints it comes from. `index` maps each blueprint id, version
+        (e.g. its upload time, which changes when a blueprint is deleted
+        and uploaded again under the same id) and resource path to the
+        checksum of its content, so an indexed resource is not
+        downloaded again. Files are written then renamed, so agents
+        sharing `directory` never read partial content.
+
+        Content is handed out as a hard link under `checkouts`, removed
+        once used: eviction, by any process, never removes content in
+        use. When objects outgrow `max_size` bytes, the least recently
+        used ones which are not checked out are removed first.
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            max_size: int = DEFAULT_MAX_SIZE,
+            logger: Any = None
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.logger = logger
+        self.objects_dir = os.path.join(directory, OBJECTS_DIR)
+        self.index_dir = os.path.join(directory, INDEX_DIR)
+        self.checkouts_dir = os.path.join(directory, CHECKOUTS_DIR)
+        for path in (self.objects_dir, self.index_dir, self.checkouts_dir):
+            os.makedirs(path, exist_ok=True)
+
+    def _index_path(
+            self,
+            blueprint_id: str,
+            version: str,
+            resource_path: str
+    ) -> str:
+        key = '{}\0{}\0{}'.format(blueprint_id, version, resource_path)
+        return os.path.join(
+            self.index_dir,
+            hashlib.sha256(key.encode('utf-8')).hexdigest()
+        )
+
+    def _object_path(self, checksum: str) -> str:
+        return os.path.join(self.objects_dir, checksum.lower())
+
+    def _write(self, path: str, content: str) -> None:
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path),
+            prefix='.'
+        )
+        with os.fdopen(descriptor, 'w') as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+
+    def lookup(
+            self,
+            blueprint_id: str,
+            version: str,
+            resource_path: str,
+            checksum: Optional[str] = None
+    ) -> Optional[str]:
+        """
+            Checksum of cached `resource_path` of `blueprint_id` at
+            `version`, or `checksum` when content with that SHA-256 is
+            cached. None when it is not cached.
+        """
+        if checksum is None:
+            try:
+                with open(self._index_path(
+                        blueprint_id,
+                        version,
+                        resource_path
+                )) as index:
+                    checksum = index.read().strip()
+            except OSError:
+                return None
+        try:
+            # Last use, for eviction.
+            os.utime(self._object_path(checksum))
+        except OSError:
+            return None
+        return checksum.lower()
+
+    def store(
+            self,
+            blueprint_id: str,
+            version: str,
+            resource_path: str,
+            file_path: str,
+            checksum: Optional[str] = None
+    ) -> str:
+        """
+            Moves downloaded `file_path` into the cache and returns its
+            checksum. Raises `NonRecoverableError` when its content does
+            not match `checksum`.
+        """
+        actual = file_sha256(file_path)
+        if checksum is not None and actual != checksum.lower():
+            raise NonRecoverableError(
+                'Checksum of {} is {}, expected {}.'.format(
+                    repr(resource_path),
+                    actual,
+                    checksum
+                )
+            )
+        descriptor, temp_path = tempfile.mkstemp(
+            dir=self.objects_dir,
+            prefix='.'
+        )
+        os.close(descriptor)
+        shutil.move(file_path, temp_path)
+        os.replace(temp_path, self._object_path(actual))
+        self._write(
+            self._index_path(blueprint_id, version, resource_path),
+            actual
+        )
+        return actual
+
+    def _link(self, checksum: str, resource_path: str) -> Optional[str]:
+        # The extension of the resource is kept, it gives the content
+        # type of the upload.
+        link = os.path.join(self.checkouts_dir, '{}-{}{}'.format(
+            checksum,
+            uuid.uuid4().hex,
+            posixpath.splitext(resource_path)[1]
+        ))
+        try:
+            os.link(self._object_path(checksum), link)
+        except FileNotFoundError:
+            # Evicted since it was looked up.
+            return None
+        return link
+
+    @contextmanager
+    def checkout(
+            self,
+            blueprint_id: str,
+            version: str,
+            resource_path: str,
+            download: Callable[[], str],
+            checksum: Optional[str] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+            Yields a local path to the content of `resource_path` of
+            `blueprint_id` at `version`, and its SHA-256, calling
+            `download` (returning a local path) only on a cache miss.
+            The path is valid until the block exits.
+        """
+        link = None
+        found = self.lookup(blueprint_id, version, resource_path, checksum)
+        if found is not None:
+            link = self._link(found, resource_path)
+        if link is None:
+            found = self.store(
+                blueprint_id,
+                version,
+                resource_path,
+                download(),
+                checksum
+            )
+            link = self._link(found, resource_path)
+            self.evict()
+        elif self.logger is not None:
+            self.logger.debug('Using cached {} of {}.'.format(
+                repr(resource_path),
+                repr(blueprint_id)
+            ))
+        if checksum is not None:
+            self._write(
+                self._index_path(blueprint_id, version, resource_path),
+                found
+            )
+        try:
+            yield link, found
+        finally:
+            try:
+                os.remove(link)
+            except OSError:
+                pass
+
+    def _objects(self) -> List[Tuple[float, int, str, bool]]:
+        objects = []
+        for entry in os.scandir(self.objects_dir):
+            if entry.name.startswith('.'):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            objects.append((
+                stat.st_mtime,
+                stat.st_size,
+                entry.path,
+                # Checked out.
+                stat.st_nlink > 1
+            ))
+        return objects
+
+    def _remove_stale_checkouts(self) -> None:
+        expired = time.time() - CHECKOUT_TTL
+        for entry in os.scandir(self.checkouts_dir):
+            try:
+                if entry.stat().st_mtime < expired:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+    def evict(self) -> int:
+        """
+            Removes least recently used objects which are not checked
+            out, until the cache holds at most `max_size` bytes. Returns
+            the number of bytes freed.
+        """
+        self._remove_stale_checkouts()
+        objects = self._objects()
+        size = sum(object_size for _, object_size, _, _ in objects)
+        freed = 0
+        for _, object_size, path, checked_out in sorted(objects):
+            if size - freed <= self.max_size:
+                break
+            if checked_out:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            freed += object_size
+            if self.logger is not None:
+                self.logger.debug('Evicted {} from artifact cache.'.format(
+                    os.path.basename(path)
+                ))
+        return freed
@@ -1,14 +1,15 @@
+import os
+from contextlib import contextmanager
+from functools import wraps
 from os.path import exists as path_exists
-from typing import Dict
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Sequence,
+                    Tuple)
 
 from cloudify.context import CloudifyContext
 from cloudify.decorators import operation
 from cloudify.exceptions import NonRecoverableError, OperationRetry
 
-from mano_sdk.function_package import FunctionPackage
-from mano_sdk.network_instance import NetworkInstance
-from mano_sdk.network_operation import NetworkOperation
-from mano_sdk.network_package import NetworkPackage
+from mano_sdk.deadline import deadline
 
 OPERATION_RETRY_STATES = [
     "PROCESSING",
@@ -22,9 +23,358 @@ OPERATION_NON_RECOVERABLE_STATES = [
     "CANCELLED",
     "UNKNOWN"
 ]
+# Complex attributes of NsLcmOpOcc read while polling, the rest of the
+# default-excluded ones (operationParams, resourceChanges...) is skipped.
+OPERATION_FIELDS = [
+    "error"
+]
+# Seconds between runs of an upload operation waiting for onboarding.
+ONBOARDING_RETRY_INTERVAL = 15
+CLIENT_OPTIONS = [
+    "oauth2",
+    "pool_maxsize",
+    "retry_policy",
+    "conditional_cache",
+    "response_cache",
+    "json_codec",
+    "compress_threshold",
+    "circuit_breaker",
+    "rate_limit",
+    "connect_timeout",
+    "read_timeout",
+    "transport"
+]
+
+
+def _client_options(client_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+        Picks optional `Client` settings and credentials out of
+        `client_config`.
+    """
+    options = {
+        option: client_config[option]
+        for option in CLIENT_OPTIONS
+        if client_config.get(option) is not None
+    }
+    if client_config.get('metrics_dir'):
+        from mano_sdk.metrics import METRICS_FILE, get_prometheus_exporter
+        options['metrics_hooks'] = [get_prometheus_exporter(
+            os.path.join(client_config['metrics_dir'], METRICS_FILE)
+        )]
+    return options
+
+
+def _blueprint_version(ctx: CloudifyContext) -> Optional[str]:
+    """
+        Upload time of the blueprint, which changes when it is deleted
+        and uploaded again under the same id. None without a manager.
+    """
+    try:
+        from cloudify.manager import get_rest_client
+        return str(get_rest_client().blueprints.get(
+            ctx.blueprint.id,
+            _include=['id', 'created_at']
+        ).created_at)
+    except Exception as e:
+        ctx.logger.debug(
+            'Blueprint {} version unknown: {}'.format(ctx.blueprint.id, e)
+        )
+        return None
+
+
+@contextmanager
+def _package_file(
+        ctx: CloudifyContext,
+        client_config: Dict[str, Any],
+        file: str
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+        Yields the local path of package content `file`, downloaded from
+        the blueprint when it is not a local file, and its SHA-256 when
+        known. With `artifact_cache` in `client_config` downloads are
+        kept and reused across runs.
+    """
+    if not file:
+        raise NonRecoverableError(
+            'Either file or file_uri of the package must be set.'
+        )
+    if path_exists(file):
+        yield file, None
+        return
+    cache_config = client_config.get('artifact_cache')
+    version = _blueprint_version(ctx) if cache_config else None
+    if version is None:
+        yield ctx.download_resource(file), None
+        return
+    from mano_plugin.artifact_cache import DEFAULT_MAX_SIZE, ArtifactCache
+    cache = ArtifactCache(
+        cache_config['directory'],
+        cache_config.get('max_size') or DEFAULT_MAX_SIZE,
+        ctx.logger
+    )
+    with cache.checkout(
+            ctx.blueprint.id,
+            version,
+            file,
+            lambda: ctx.download_resource(file)
+    ) as cached:
+        yield cached
+
+
+def _package_users(package_info: Any) -> Optional[List[str]]:
+    """
+        Deployments listed as using a package in its user defined data,
+        None when the package does not list them.
+    """
+    from mano_sdk.dedup import USERS_KEY
+    users = (package_info.get('userDefinedData') or {}).get(USERS_KEY)
+    return list(users) if isinstance(users, list) else None
+
+
+def _reuse_package(
+        ctx: CloudifyContext,
+        package: Any,
+        file: str,
+        id_property: str,
+        identity: Sequence[tuple],
+        checksum: Optional[str] = None
+) -> Tuple[Optional[Any], str]:
+    """
+        Looks for an onboarded package with the content of `file`, by
+        SHA-256 (`checksum` when already known) or descriptor
+        `identity`. When there is one, the
+        deployment is added to the users of the package, the empty
+        package created for the upload is deleted, `id_property` points
+        at the existing one and the instance is marked as reusing it.
+        Returns the package found and the checksum of `file`.
+    """
+    from mano_sdk.dedup import (UNTRACKED_USER, USERS_KEY, file_sha256,
+                                package_identity, package_users_lock)
+    checksum = checksum or file_sha256(file)
+    identity = package_identity(file, identity)
+    created_id = ctx.instance.runtime_properties[id_property]
+    # Looked up under the lock, so the last user cannot delete the
+    # package between the lookup and the update of its users.
+    with package_users_lock(package.client.url):
+        existing = package.find_onboarded(
+            checksum=checksum,
+            identity=identity,
+            exclude_id=created_id
+        )
+        if existing is None:
+            return None, checksum
+        ctx.logger.info(
+            'Content of {} already onboarded as package {}, reusing it.'
+            .format(os.path.basename(file), existing['id'])
+        )
+        # The deployment which uploaded it may not be listed: it is kept
+        # as a user which never releases the package.
+        users = _package_users(existing) or [UNTRACKED_USER]
+        if ctx.deployment.id not in users:
+            package.update_user_defined_data(
+                existing['id'],
+                {USERS_KEY: users + [ctx.deployment.id]}
+            )
+    package.delete(created_id)
+    ctx.instance.runtime_properties[id_property] = existing['id']
+    ctx.instance.runtime_properties['reused_package'] = True
+    return existing, checksum
+
+
+def _tag_checksum(
+        ctx: CloudifyContext,
+        package: Any,
+        package_id: str,
+        checksum: str
+) -> None:
+    """
+        Records `checksum` in user defined data of the uploaded package
+        for later deduplication, with the deployment as its first user.
+        Deployments which already found it by descriptor identity stay
+        listed. Best effort, NFVOs may refuse changes while onboarding.
+    """
+    from mano_sdk.dedup import (CHECKSUM_KEY, UNTRACKED_USER, USERS_KEY,
+                                package_users_lock)
+    try:
+        with package_users_lock(package.client.url):
+            users = _package_users(package.get(
+                package_id,
+                fields=['userDefinedData'],
+                exclude_default=True
+            )) or []
+            # The untracked uploader they listed is this deployment.
+            users = [ctx.deployment.id] + [
+                user for user in users
+                if user not in (UNTRACKED_USER, ctx.deployment.id)
+            ]
+            package.update_user_defined_data(package_id, {
+                CHECKSUM_KEY: checksum,
+                USERS_KEY: users
+            })
+    except NonRecoverableError as e:
+        ctx.logger.warning(
+            'Checksum of package {} not recorded: {}'.format(package_id, e)
+        )
+
+
+def _keep_shared_package(
+        ctx: CloudifyContext,
+        package: Any,
+        package_id: str,
+        package_info: Any,
+        action: str,
+        release: bool = False
+) -> bool:
+    """
+        Whether the package of the instance is still used by other
+        deployments (see `_reuse_package`), so `action` must skip it.
+        With `release` the deployment is removed from its users. A
+        package not listing its users is kept only by the deployments
+        reusing it. Call it under `package_users_lock`, with
+        `package_info` read under the lock too.
+    """
+    users = _package_users(package_info)
+    if users is None:
+        keep = bool(ctx.instance.runtime_properties.get('reused_package'))
+        others = ['the deployment which uploaded it'] if keep else []
+    else:
+        others = [user for user in users if user != ctx.deployment.id]
+        if release and len(others) != len(users):
+            from mano_sdk.dedup import USERS_KEY
+            package.update_user_defined_data(package_id, {USERS_KEY: others})
+    if not others:
+        return False
+    ctx.logger.info(
+        'Package {} is still used by {}, not {} it.'.format(
+            package_id,
+            ', '.join(others),
+            action
+        )
+    )
+    return True
+
+
+@contextmanager
+def _shared_package_lock(ctx: CloudifyContext, package: Any) -> Iterator[bool]:
+    """
+        Holds `package_users_lock` when the package of the instance may
+        be used by other deployments: it reuses one, or was uploaded
+        with `deduplicate` so others may reuse it. Yields whether it
+        may be, otherwise its users are neither read nor locked.
+    """
+    runtime_properties = ctx.instance.runtime_properties
+    if not runtime_properties.get('reused_package') and \
+            not runtime_properties.get('deduplicated'):
+        yield False
+        return
+    from mano_sdk.dedup import package_users_lock
+    with package_users_lock(package.client.url):
+        yield True
+
+
+def _onboard_from_uri(
+        ctx: CloudifyContext,
+        package: Any,
+        package_id: str,
+        **upload_from_uri
+) -> None:
+    """
+        Makes the NFVO fetch the package content with `upload_from_uri`
+        arguments, unless an earlier run of the operation already did,
+        and retries the operation until the package is onboarded rather
+        than blocking the agent while the NFVO fetches it.
+    """
+    from mano_sdk.package_base import (ONBOARDING_FIELDS,
+                                       ONBOARDING_PENDING_STATES)
+    package_info = package.get(
+        package_id,
+        fields=ONBOARDING_FIELDS,
+        exclude_default=True,
+        cache=False
+    )
+    state = package.check_onboarding(package_id, package_info)
+    if state == 'ONBOARDED':
+        return
+    if state not in ONBOARDING_PENDING_STATES:
+        package.upload_from_uri(**upload_from_uri)
+    ctx.logger.info(
+        '{} {} is {}, waiting for it to be onboarded.'.format(
+            package.package_kind,
+            package_id,
+            state if state in ONBOARDING_PENDING_STATES else 'UPLOADING'
+        )
+    )
+    raise OperationRetry(retry_after=ONBOARDING_RETRY_INTERVAL)
+
+
+def _operation_arguments(
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+        Maps positional arguments of an operation call to their names.
+        Avoids `inspect`, which costs more to import than the tasks.
+    """
+    while hasattr(func, '__wrapped__'):
+        func = func.__wrapped__
+    code = func.__code__
+    arguments = dict(zip(code.co_varnames[:code.co_argcount], args))
+    arguments.update(kwargs)
+    return arguments
+
+
+def operation_deadline(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+        Runs the operation within the `deadline` (seconds) of its
+        `client_config`, shared by every request and retry it sends.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = _operation_arguments(func, args, kwargs)
+        client_config = arguments.get('client_config') or {}
+        with deadline(client_config.get('deadline')):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def operation_trace(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+        Runs the operation in a root span tagged with deployment, node
+        and instance ids, exported as set by `client_config['tracing']`.
+        Requests sent by the operation become its child spans.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = _operation_arguments(func, args, kwargs)
+        client_config = arguments.get('client_config') or {}
+        if not client_config.get('tracing'):
+            return func(*args, **kwargs)
+        from mano_sdk.tracing import get_exporters, start_span
+        exporters = get_exporters(client_config['tracing'])
+        ctx = arguments['ctx']
+        with start_span(
+                'mano_plugin.tasks.{}'.format(func.__name__),
+                {
+                    'deployment.id': ctx.deployment.id,
+                    'node.id': ctx.node.id,
+                    'node_instance.id': ctx.instance.id
+                },
+                exporters=exporters
+        ) as span:
+            try:
+                return func(*args, **kwargs)
+            except OperationRetry as e:
+                # Polling is expected, not an error of the span.
+                span.set_attribute('operation.retry', str(e))
+                retry = e
+        raise retry
+    return wrapper
 
 
 @operation
+@operation_trace
+@operation_deadline
 def create_vfn(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
@@ -33,12 +383,14 @@ def create_vfn(
     """
         Creates an initial function package (VNF).
     """
+    from mano_sdk.function_package import FunctionPackage
     function_package = FunctionPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     response = function_package.create(tags, "application/json")
     ctx.instance.runtime_properties['function_package_id'] = response['id']
@@ -48,34 +400,80 @@ def create_vfn(
 
 
 @operation
+@operation_trace
+@operation_deadline
 def upload_vfn(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
-        file: str
+        file: str = None,
+        file_uri: str = None,
+        file_uri_auth: Dict[str, str] = None,
+        deduplicate: bool = False,
+        validate: bool = False
 ) -> None:
     """
-        Uploads function package content using `function_id`.
+        Uploads function package content using `function_id`. With
+        `file_uri` the NFVO fetches the content from there itself. With
+        `deduplicate` an onboarded package with the same content is
+        reused instead. With `validate` a CSAR file is checked locally
+        before it is uploaded.
     """
+    from mano_sdk.function_package import FunctionPackage
     function_package = FunctionPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     function_id = ctx.instance.runtime_properties['function_package_id']
-    if not path_exists(file):
-        file = ctx.download_resource(file)
-    function_package.upload(
-        function_id=function_id,
-        file_name=file
-    )
+    if file_uri:
+        # The NFVO fetches the content asynchronously.
+        _onboard_from_uri(
+            ctx,
+            function_package,
+            function_id,
+            function_id=function_id,
+            uri=file_uri,
+            **(file_uri_auth or {})
+        )
+    else:
+        package_name = os.path.basename(file or '')
+        with _package_file(ctx, client_config, file) as (file, checksum):
+            if deduplicate:
+                from mano_sdk.dedup import VNF_IDENTITY
+                ctx.instance.runtime_properties['deduplicated'] = True
+                existing, checksum = _reuse_package(
+                    ctx,
+                    function_package,
+                    file,
+                    'function_package_id',
+                    VNF_IDENTITY,
+                    checksum
+                )
+                if existing is not None:
+                    ctx.instance.runtime_properties['resource_config'] = \
+                        function_package.get(package_id=existing['id'])
+                    return
+            from mano_sdk.upload import log_progress
+            function_package.upload(
+                function_id=function_id,
+                file_name=file,
+                chunk_size=client_config.get('upload_chunk_size'),
+                progress=log_progress(ctx.logger, package_name),
+                validate=validate
+            )
+        if deduplicate:
+            _tag_checksum(ctx, function_package, function_id, checksum)
     ctx.instance.runtime_properties['resource_config'] = function_package.get(
         package_id=function_id
     )
 
 
 @operation
+@operation_trace
+@operation_deadline
 def update_vfn_state(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
@@ -84,29 +482,47 @@ def update_vfn_state(
     """
         Updates `operational state` of function package (VFN).
     """
+    from mano_sdk.function_package import FunctionPackage
     function_package = FunctionPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     function_id = ctx.instance.runtime_properties['function_package_id']
-
-    current_operational_state = function_package.get(
-        package_id=function_id
-    )['operationalState']
-
-    if current_operational_state != operational_state:
+    with _shared_package_lock(ctx, function_package) as shared:
+        package_info = function_package.get(
+            package_id=function_id,
+            fields=['userDefinedData'] if shared else None,
+            exclude_default=True
+        )
+        if shared and operational_state == "DISABLED" and \
+                _keep_shared_package(
+                    ctx,
+                    function_package,
+                    function_id,
+                    package_info,
+                    'disabling'
+                ):
+            return
+        current_operational_state = package_info['operationalState']
+
+        if current_operational_state == operational_state:
+            return
         function_package.update(
             package_id=function_id,
             operational_state=operational_state
         )
-        ctx.instance.runtime_properties['resource_config'] = function_package\
-            .get(package_id=function_id)
+    ctx.instance.runtime_properties['resource_config'] = function_package.get(
+        package_id=function_id
+    )
 
 
 @operation
+@operation_trace
+@operation_deadline
 def delete_vfn(
         ctx: CloudifyContext,
         client_config: Dict[str, str]
@@ -114,20 +530,46 @@ def delete_vfn(
     """
         Deletes function package (VNF).
     """
+    from mano_sdk.function_package import FunctionPackage
     function_package = FunctionPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     function_id = ctx.instance.runtime_properties['function_package_id']
-    function_package.delete(
-        package_id=function_id
-    )
+    with _shared_package_lock(ctx, function_package) as shared:
+        if shared:
+            package_info = function_package.get(
+                package_id=function_id,
+                fields=['userDefinedData'],
+                exclude_default=True
+            )
+            if _keep_shared_package(
+                    ctx,
+                    function_package,
+                    function_id,
+                    package_info,
+                    'deleting',
+                    release=True
+            ):
+                return
+            # Left enabled on stop while other deployments used it.
+            if package_info.get('operationalState') == 'ENABLED':
+                function_package.update(
+                    package_id=function_id,
+                    operational_state='DISABLED'
+                )
+        function_package.delete(
+            package_id=function_id
+        )
 
 
 @operation
+@operation_trace
+@operation_deadline
 def create_nsd(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
@@ -136,12 +578,14 @@ def create_nsd(
     """
         Creates an initial network package (NSD).
     """
+    from mano_sdk.network_package import NetworkPackage
     network_package = NetworkPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     response = network_package.create(tags, "application/json")
     ctx.instance.runtime_properties['id'] = response['id']
@@ -150,34 +594,83 @@ def create_nsd(
 
 
 @operation
+@operation_trace
+@operation_deadline
 def upload_nsd(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
-        file: str
+        file: str = None,
+        file_uri: str = None,
+        file_uri_auth: Dict[str, str] = None,
+        deduplicate: bool = False,
+        validate: bool = False
 ) -> None:
     """
-        Uploads network package (NSD) content using `nsd_id`.
+        Uploads network package (NSD) content using `nsd_id`. With
+        `file_uri` the NFVO fetches the content from there itself. With
+        `deduplicate` an onboarded package with the same content is
+        reused instead. With `validate` a CSAR file is checked locally
+        before it is uploaded.
     """
+    from mano_sdk.network_package import NetworkPackage
     network_package = NetworkPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     nsd_id = ctx.instance.runtime_properties['id']
-    if not path_exists(file):
-        file = ctx.download_resource(file)
-    response = network_package.upload(
-        nsd_id=nsd_id,
-        file_name=file
-    )
-    get_response = network_package.get(response['id'])
+    if file_uri:
+        # The NFVO fetches the content asynchronously, nsdId is only
+        # known once it is onboarded.
+        _onboard_from_uri(
+            ctx,
+            network_package,
+            nsd_id,
+            nsd_id=nsd_id,
+            uri=file_uri,
+            **(file_uri_auth or {})
+        )
+        get_response = network_package.get(nsd_id)
+    else:
+        package_name = os.path.basename(file or '')
+        with _package_file(ctx, client_config, file) as (file, checksum):
+            existing = None
+            if deduplicate:
+                from mano_sdk.dedup import NSD_IDENTITY
+                ctx.instance.runtime_properties['deduplicated'] = True
+                existing, checksum = _reuse_package(
+                    ctx,
+                    network_package,
+                    file,
+                    'id',
+                    NSD_IDENTITY,
+                    checksum
+                )
+            if existing is None:
+                from mano_sdk.upload import log_progress
+                response = network_package.upload(
+                    nsd_id=nsd_id,
+                    file_name=file,
+                    chunk_size=client_config.get('upload_chunk_size'),
+                    progress=log_progress(ctx.logger, package_name),
+                    validate=validate
+                )
+        if existing is not None:
+            get_response = network_package.get(existing['id'])
+        else:
+            if deduplicate:
+                _tag_checksum(ctx, network_package, nsd_id, checksum)
+            get_response = network_package.get(response['id'])
     ctx.instance.runtime_properties['resource_config'] = get_response
     ctx.instance.runtime_properties['nsd_id'] = get_response['nsdId']
 
 
 @operation
+@operation_trace
+@operation_deadline
 def update_nsd_state(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
@@ -186,28 +679,47 @@ def update_nsd_state(
     """
         Updates `operational state` of network package (NSD).
     """
+    from mano_sdk.network_package import NetworkPackage
     network_package = NetworkPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     nsd_id = ctx.instance.runtime_properties['id']
-    current_operational_state = network_package.get(
-        nsd_id=nsd_id
-    )['nsdOperationalState']
-
-    if current_operational_state != operational_state:
+    with _shared_package_lock(ctx, network_package) as shared:
+        package_info = network_package.get(
+            nsd_id=nsd_id,
+            fields=['userDefinedData'] if shared else None,
+            exclude_default=True
+        )
+        if shared and operational_state == "DISABLED" and \
+                _keep_shared_package(
+                    ctx,
+                    network_package,
+                    nsd_id,
+                    package_info,
+                    'disabling'
+                ):
+            return
+        current_operational_state = package_info['nsdOperationalState']
+
+        if current_operational_state == operational_state:
+            return
         network_package.update(
             nsd_id=nsd_id,
             operational_state=operational_state
         )
-        ctx.instance.runtime_properties['resource_config'] = network_package\
-            .get(nsd_id=nsd_id)
+    ctx.instance.runtime_properties['resource_config'] = network_package.get(
+        nsd_id=nsd_id
+    )
 
 
 @operation
+@operation_trace
+@operation_deadline
 def delete_nsd(
         ctx: CloudifyContext,
         client_config: Dict[str, str]
@@ -215,20 +727,46 @@ def delete_nsd(
     """
         Deletes network package (NSD).
     """
+    from mano_sdk.network_package import NetworkPackage
     network_package = NetworkPackage(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     nsd_id = ctx.instance.runtime_properties['id']
-    network_package.delete(
-        nsd_id=nsd_id
-    )
+    with _shared_package_lock(ctx, network_package) as shared:
+        if shared:
+            package_info = network_package.get(
+                nsd_id=nsd_id,
+                fields=['userDefinedData'],
+                exclude_default=True
+            )
+            if _keep_shared_package(
+                    ctx,
+                    network_package,
+                    nsd_id,
+                    package_info,
+                    'deleting',
+                    release=True
+            ):
+                return
+            # Left enabled on stop while other deployments used it.
+            if package_info.get('nsdOperationalState') == 'ENABLED':
+                network_package.update(
+                    nsd_id=nsd_id,
+                    operational_state='DISABLED'
+                )
+        network_package.delete(
+            nsd_id=nsd_id
+        )
 
 
 @operation
+@operation_trace
+@operation_deadline
 def create_ns_instance(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
@@ -240,12 +778,14 @@ def create_ns_instance(
     """
        Creates an initial network instance.
     """
+    from mano_sdk.network_instance import NetworkInstance
     network_instance = NetworkInstance(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     response = network_instance.create(
         nsd_id=nsd_id,
@@ -260,6 +800,8 @@ def create_ns_instance(
 
 
 @operation
+@operation_trace
+@operation_deadline
 def instantiate_ns_instance(
         ctx: CloudifyContext,
         client_config: Dict[str, str],
@@ -269,12 +811,14 @@ def instantiate_ns_instance(
     """
        Instantiates network instance using `ns_instance_id`.
     """
+    from mano_sdk.network_instance import NetworkInstance
     network_instance = NetworkInstance(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     ns_instance_id = ctx.instance.runtime_properties['ns_instance_id']
     response = network_instance.instantiate(
@@ -289,6 +833,8 @@ def instantiate_ns_instance(
 
 
 @operation
+@operation_trace
+@operation_deadline
 def terminate_ns_instance(
         ctx: CloudifyContext,
         client_config: Dict[str, str]
@@ -296,12 +842,14 @@ def terminate_ns_instance(
     """
        Terminates a network instance.
     """
+    from mano_sdk.network_instance import NetworkInstance
     network_instance = NetworkInstance(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     ns_instance_id = ctx.instance.runtime_properties['ns_instance_id']
     response = network_instance.terminate(
@@ -314,6 +862,8 @@ def terminate_ns_instance(
 
 
 @operation
+@operation_trace
+@operation_deadline
 def delete_ns_instance(
         ctx: CloudifyContext,
         client_config: Dict[str, str]
@@ -321,12 +871,14 @@ def delete_ns_instance(
     """
        Deletes a network instance.
     """
+    from mano_sdk.network_instance import NetworkInstance
     network_instance = NetworkInstance(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     ns_instance_id = ctx.instance.runtime_properties['ns_instance_id']
     network_instance.delete(
@@ -335,6 +887,8 @@ def delete_ns_instance(
 
 
 @operation(resumable=True)
+@operation_trace
+@operation_deadline
 def get_network_operation(
         ctx: CloudifyContext,
         client_config: Dict[str, str]
@@ -342,23 +896,30 @@ def get_network_operation(
     """
        Get the details of network operation.
     """
+    from mano_sdk.network_instance import NetworkInstance
+    from mano_sdk.network_operation import NetworkOperation
     network_operation = NetworkOperation(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     network_instance = NetworkInstance(
         client_config['endpoint_url'],
         ctx.logger,
         client_config['username'],
         client_config['password'],
-        client_config['token']
+        client_config['token'],
+        **_client_options(client_config)
     )
     operation_id = ctx.instance.runtime_properties['operation_id']
     response = network_operation.get(
-        operation_id=operation_id
+        operation_id=operation_id,
+        fields=OPERATION_FIELDS,
+        exclude_default=True,
+        cache=False
     )
     operation_state = response["operationState"]
     ctx.logger.info(
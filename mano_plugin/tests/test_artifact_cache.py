@@ -0,0 +1,119 @@
+import hashlib
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_plugin.artifact_cache import ArtifactCache
+
+
+class TestArtifactCache(TestCase):
+    BLUEPRINT_ID = 'router'
+    VERSION = '2026-01-01T10:00:00.000Z'
+    RESOURCE_PATH = 'packages/router.zip'
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.cache = ArtifactCache(
+            os.path.join(self.directory, 'cache'),
+            max_size=2500
+        )
+
+    def _download(self, content):
+        descriptor, path = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(descriptor, 'wb') as downloaded:
+            downloaded.write(content)
+        return path
+
+    def _checkout(self, download, version=VERSION, **kwargs):
+        return self.cache.checkout(
+            kwargs.pop('blueprint_id', self.BLUEPRINT_ID),
+            version,
+            kwargs.pop('resource_path', self.RESOURCE_PATH),
+            download,
+            **kwargs
+        )
+
+    def test_checkout(self):
+        content = os.urandom(1000)
+        checksum = hashlib.sha256(content).hexdigest()
+        download = mock.Mock(side_effect=lambda: self._download(content))
+        with self._checkout(download) as (path, found):
+            self.assertEqual(found, checksum)
+            self.assertTrue(path.endswith('.zip'))
+            with open(path, 'rb') as cached:
+                self.assertEqual(cached.read(), content)
+        self.assertFalse(os.path.exists(path))
+        with self._checkout(download) as (path, found):
+            self.assertEqual(found, checksum)
+        download.assert_called_once()
+        # Same content of another blueprint is found by checksum.
+        with self._checkout(
+                download,
+                blueprint_id='other',
+                checksum=checksum.upper()
+        ) as (path, found):
+            self.assertEqual(found, checksum)
+        download.assert_called_once()
+        self.assertEqual(
+            self.cache.lookup('other', self.VERSION, self.RESOURCE_PATH),
+            checksum
+        )
+        # A blueprint uploaded again under the same id is a new version.
+        self.assertIsNone(
+            self.cache.lookup(self.BLUEPRINT_ID, 'later', self.RESOURCE_PATH)
+        )
+
+    def test_checksum_mismatch(self):
+        with self.assertRaises(NonRecoverableError):
+            with self._checkout(
+                    lambda: self._download(b'content'),
+                    checksum='ab12'
+            ):
+                pass
+        self.assertIsNone(self.cache.lookup(
+            self.BLUEPRINT_ID,
+            self.VERSION,
+            self.RESOURCE_PATH
+        ))
+
+    def test_evicts_least_recently_used(self):
+        checksums = {}
+        for index, name in enumerate(('a.zip', 'b.zip')):
+            with self._checkout(
+                    lambda: self._download(os.urandom(1000)),
+                    resource_path=name
+            ) as (path, checksums[name]):
+                pass
+            os.utime(self.cache._object_path(checksums[name]), (index, index))
+        # Using a.zip makes b.zip the least recently used.
+        self.cache.lookup(self.BLUEPRINT_ID, self.VERSION, 'a.zip')
+        with self._checkout(
+                lambda: self._download(os.urandom(1000)),
+                resource_path='c.zip'
+        ):
+            pass
+        self.assertIsNotNone(
+            self.cache.lookup(self.BLUEPRINT_ID, self.VERSION, 'a.zip')
+        )
+        self.assertIsNone(
+            self.cache.lookup(self.BLUEPRINT_ID, self.VERSION, 'b.zip')
+        )
+        self.assertIsNotNone(
+            self.cache.lookup(self.BLUEPRINT_ID, self.VERSION, 'c.zip')
+        )
+
+    def test_checked_out_content_is_not_evicted(self):
+        content = os.urandom(3000)
+        with self._checkout(
+                lambda: self._download(content)
+        ) as (path, checksum):
+            # Over max_size, but in use by this checkout.
+            self.assertEqual(self.cache.evict(), 0)
+            os.remove(self.cache._object_path(checksum))
+            # Removed by another process: the checkout stays readable.
+            with open(path, 'rb') as cached:
+                self.assertEqual(cached.read(), content)
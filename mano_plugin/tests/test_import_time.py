@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+BUDGET_PATH = os.path.join(os.path.dirname(__file__), 'import_budget.json')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+
+def import_times(module, preload):
+    """
+        Runs `python -X importtime` in a fresh process, importing
+        `preload` then `module`, and returns the cumulative import time
+        (us) of every module listed.
+    """
+    statements = ['import {}'.format(name) for name in preload]
+    statements.append('import {}'.format(module))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '; '.join(statements)],
+        cwd=ROOT_DIR,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_ratio(module, preload):
+    """
+        Import time of `module` relative to the modules the Cloudify
+        agent has imported already, `preload`, measured in the same
+        process: the ratio holds on slow or loaded machines, where
+        absolute times do not.
+    """
+    times = import_times(module, preload)
+    reference = sum(times.get(name, 0) for name in preload)
+    return times[module] / reference
+
+
+class TestImportTime(TestCase):
+
+    def test_import_budget(self):
+        with open(BUDGET_PATH) as budget_file:
+            budget = json.load(budget_file)
+        for module, limits in budget['modules'].items():
+            # Best of a few runs, a single one may be slowed down by the
+            # rest of the machine.
+            ratio = min(
+                import_ratio(module, budget['preload'])
+                for _ in range(budget['runs'])
+            )
+            self.assertLessEqual(
+                ratio,
+                limits['max_ratio'],
+                '{} took {:.2f} times as long to import as {}'.format(
+                    module,
+                    ratio,
+                    ', '.join(budget['preload'])
+                )
+            )
@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+# Modules the Cloudify agent has imported before running an operation.
+PRELOAD = [
+    'cloudify.context',
+    'cloudify.decorators',
+    'cloudify.exceptions'
+]
+# Modules which importing each module must not load.
+FORBIDDEN = {
+    'mano_plugin.tasks': [
+        'aiohttp',
+        'asyncio',
+        'inspect',
+        'xmltodict',
+        'mano_sdk.client',
+        'mano_sdk.function_package',
+        'mano_sdk.network_instance',
+        'mano_sdk.network_operation',
+        'mano_sdk.network_package'
+    ],
+    'mano_sdk.function_package': [
+        'aiohttp',
+        'asyncio',
+        'xmltodict',
+        'xml.etree.ElementTree',
+        'mano_sdk.async_client',
+        'mano_sdk.network_instance',
+        'mano_sdk.network_operation',
+        'mano_sdk.network_package'
+    ]
+}
+
+
+def loaded_modules(module, preload):
+    """
+        Imports `module` in a fresh process and returns the modules it
+        loaded on top of `preload`.
+    """
+    script = (
+        'import json, sys\n'
+        '{}\n'
+        'before = set(sys.modules)\n'
+        'import {}\n'
+        'print(json.dumps(sorted(set(sys.modules) - before)))\n'
+    ).format(
+        '\n'.join('import {}'.format(name) for name in preload),
+        module
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True
+    )
+    return set(json.loads(result.stdout))
+
+
+class TestLazyImports(TestCase):
+
+    def test_heavy_modules_not_imported(self):
+        for module, forbidden in FORBIDDEN.items():
+            loaded = loaded_modules(module, PRELOAD)
+            self.assertIn(module, loaded)
+            for name in forbidden:
+                self.assertNotIn(
+                    name,
+                    loaded,
+                    '{} imports {} eagerly'.format(module, name)
+                )
@@ -1,5 +1,8 @@
 import copy
 import logging
+import os
+import tempfile
+import threading
 from unittest import TestCase, mock
 
 from cloudify.exceptions import NonRecoverableError, OperationRetry
@@ -8,6 +11,7 @@ from cloudify.mocks import MockCloudifyContext
 from cloudify.state import current_ctx
 
 import mano_plugin.tasks as tasks
+from mano_sdk.deadline import remaining
 
 
 class TestTasks(TestCase):
@@ -42,6 +46,7 @@ class TestTasks(TestCase):
         'cloudify.aws.etsi.sol.NSDPackage'
     ]
 
+    FILE_URI = "https://artifacts.example.com/packages/vnf.zip"
     NODE_PROPERTIES = {
         'tags': TAGS,
         'client_config': CLIENT_CONFIG,
@@ -314,9 +319,127 @@ class TestTasks(TestCase):
         tasks.upload_vfn(_ctx, self.CLIENT_CONFIG, self.FILE_NAME)
         mock_upload.assert_called_with(
             file_name=self.FILE_NAME,
-            function_id=self.FUNCTION_ID
+            function_id=self.FUNCTION_ID,
+            chunk_size=None,
+            progress=mock.ANY,
+            validate=False
         )
 
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.upload'
+    )
+    def test_upload_vfn_caches_download(self, mock_upload, mock_get):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        client_config = dict(
+            self.CLIENT_CONFIG,
+            artifact_cache={'directory': directory.name}
+        )
+
+        def download_resource(resource_path):
+            path = os.path.join(directory.name, 'downloaded.zip')
+            with open(path, 'wb') as downloaded:
+                downloaded.write(b'package')
+            return path
+
+        mock_get.return_value = self.GET_RESPONSE_VFN
+        downloads = mock.MagicMock(side_effect=download_resource)
+        rest_client = mock.patch('cloudify.manager.get_rest_client').start()
+        self.addCleanup(mock.patch.stopall)
+        rest_client.return_value.blueprints.get.return_value.created_at = \
+            '2026-01-01T10:00:00.000Z'
+        for _ in range(2):
+            _ctx = self.get_mock_ctx(
+                'test_upload',
+                test_properties=self.NODE_PROPERTIES,
+                test_runtime_properties=(
+                    self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN
+                ),
+                type_hierarchy=self.VFN_PACKAGE_TH
+            )
+            _ctx.download_resource = downloads
+            current_ctx.set(_ctx)
+            tasks.upload_vfn(_ctx, client_config, self.FILE_NAME)
+        downloads.assert_called_once_with(self.FILE_NAME)
+        # Uploaded from a checkout of the cache, removed afterwards.
+        cached = mock_upload.call_args.kwargs['file_name']
+        self.assertTrue(cached.startswith(directory.name))
+        self.assertTrue(cached.endswith('.zip'))
+        self.assertFalse(os.path.exists(cached))
+
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.upload_from_uri'
+    )
+    def test_upload_vfn_from_uri(self, mock_upload_from_uri, mock_get):
+        _ctx = self.get_mock_ctx(
+            'test_upload',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN,
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+        _ctx.download_resource = mock.MagicMock()
+        current_ctx.set(_ctx)
+        # The operation is retried while the NFVO fetches the content,
+        # which is asked for only once.
+        mock_get.side_effect = [
+            {'onboardingState': 'CREATED'},
+            {'onboardingState': 'PROCESSING'},
+            self.GET_RESPONSE_VFN,
+            self.GET_RESPONSE_VFN
+        ]
+        for _ in range(2):
+            with self.assertRaises(OperationRetry):
+                tasks.upload_vfn(
+                    _ctx,
+                    self.CLIENT_CONFIG,
+                    file_uri=self.FILE_URI,
+                    file_uri_auth={'username': 'repo', 'password': 'secret'}
+                )
+        tasks.upload_vfn(
+            _ctx,
+            self.CLIENT_CONFIG,
+            file_uri=self.FILE_URI,
+            file_uri_auth={'username': 'repo', 'password': 'secret'}
+        )
+        mock_upload_from_uri.assert_called_once_with(
+            function_id=self.FUNCTION_ID,
+            uri=self.FILE_URI,
+            username='repo',
+            password='secret'
+        )
+        mock_get.assert_any_call(
+            self.FUNCTION_ID,
+            fields=['onboardingFailureDetails'],
+            exclude_default=True,
+            cache=False
+        )
+        self.assertEqual(
+            _ctx.instance.runtime_properties['resource_config'],
+            self.GET_RESPONSE_VFN
+        )
+        _ctx.download_resource.assert_not_called()
+
+    def test_upload_vfn_without_file(self):
+        _ctx = self.get_mock_ctx(
+            'test_upload',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN,
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+        current_ctx.set(_ctx)
+        with self.assertRaises(NonRecoverableError):
+            tasks.upload_vfn(_ctx, self.CLIENT_CONFIG)
+
     @mock.patch(
         'mano_sdk.function_package.'
         'FunctionPackage.get'
@@ -345,12 +468,22 @@ class TestTasks(TestCase):
             operational_state="DISABLED",
             package_id=self.FUNCTION_ID
         )
+        # Without deduplication users of the package are not read.
+        mock_get.assert_any_call(
+            package_id=self.FUNCTION_ID,
+            fields=None,
+            exclude_default=True
+        )
 
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
     @mock.patch(
         'mano_sdk.function_package.'
         'FunctionPackage.delete'
     )
-    def test_delete_vfn(self, mock_delete):
+    def test_delete_vfn(self, mock_delete, mock_get):
         _ctx = self.get_mock_ctx(
             'test_create',
             test_properties=self.NODE_PROPERTIES,
@@ -359,6 +492,10 @@ class TestTasks(TestCase):
         )
 
         current_ctx.set(_ctx)
+        mock_get.return_value = dict(
+            self.GET_RESPONSE_VFN,
+            operationalState='DISABLED'
+        )
         tasks.delete_vfn(
             ctx=_ctx,
             client_config=self.CLIENT_CONFIG
@@ -366,6 +503,333 @@ class TestTasks(TestCase):
         mock_delete.assert_called_with(
             package_id=self.FUNCTION_ID
         )
+        mock_get.assert_not_called()
+
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.update_user_defined_data'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.update'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.delete'
+    )
+    def test_delete_vfn_shared(
+            self,
+            mock_delete,
+            mock_update,
+            mock_users,
+            mock_get
+    ):
+        _ctx = self.get_mock_ctx(
+            'test_delete',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=dict(
+                self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN,
+                deduplicated=True
+            ),
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+        current_ctx.set(_ctx)
+        deployment_id = _ctx.deployment.id
+        # The deployment which uploaded the package, with another one
+        # reusing it: the package is kept for the other one.
+        mock_get.return_value = dict(
+            self.GET_RESPONSE_VFN,
+            userDefinedData={
+                'usedByDeployments': [deployment_id, 'site-b']
+            }
+        )
+        tasks.update_vfn_state(
+            ctx=_ctx,
+            client_config=self.CLIENT_CONFIG,
+            operational_state='DISABLED'
+        )
+        tasks.delete_vfn(ctx=_ctx, client_config=self.CLIENT_CONFIG)
+        mock_update.assert_not_called()
+        mock_delete.assert_not_called()
+        mock_users.assert_called_once_with(
+            self.FUNCTION_ID,
+            {'usedByDeployments': ['site-b']}
+        )
+        # The last user disables the package left enabled and deletes it.
+        mock_users.reset_mock()
+        mock_get.return_value = dict(
+            self.GET_RESPONSE_VFN,
+            userDefinedData={'usedByDeployments': [deployment_id]}
+        )
+        tasks.delete_vfn(ctx=_ctx, client_config=self.CLIENT_CONFIG)
+        mock_update.assert_called_once_with(
+            package_id=self.FUNCTION_ID,
+            operational_state='DISABLED'
+        )
+        mock_delete.assert_called_once_with(package_id=self.FUNCTION_ID)
+
+    @mock.patch('mano_sdk.dedup.file_sha256', return_value='ab12')
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.update_user_defined_data'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.delete'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.upload'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.find_onboarded'
+    )
+    def test_upload_vfn_reuses_package(
+            self,
+            mock_find,
+            mock_upload,
+            mock_delete,
+            mock_users,
+            mock_get,
+            mock_sha256
+    ):
+        _ctx = self.get_mock_ctx(
+            'test_upload',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN,
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+        current_ctx.set(_ctx)
+        mock_find.return_value = {'id': 'fc-onboarded'}
+        mock_get.return_value = self.GET_RESPONSE_VFN
+        tasks.upload_vfn(
+            _ctx,
+            self.CLIENT_CONFIG,
+            __file__,
+            deduplicate=True
+        )
+        mock_find.assert_called_with(
+            checksum='ab12',
+            identity={},
+            exclude_id=self.FUNCTION_ID
+        )
+        mock_upload.assert_not_called()
+        mock_delete.assert_called_with(self.FUNCTION_ID)
+        # The uploader is not listed, it never releases the package.
+        mock_users.assert_called_with(
+            'fc-onboarded',
+            {'usedByDeployments': ['untracked', _ctx.deployment.id]}
+        )
+        self.assertEqual(
+            _ctx.instance.runtime_properties['function_package_id'],
+            'fc-onboarded'
+        )
+        self.assertTrue(_ctx.instance.runtime_properties['reused_package'])
+
+        mock_delete.reset_mock()
+        tasks.delete_vfn(ctx=_ctx, client_config=self.CLIENT_CONFIG)
+        mock_delete.assert_not_called()
+
+    @mock.patch('mano_sdk.dedup.file_sha256', return_value='ab12')
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.update_user_defined_data'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.upload'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.find_onboarded',
+        return_value=None
+    )
+    def test_upload_vfn_tags_checksum(
+            self,
+            mock_find,
+            mock_upload,
+            mock_tag,
+            mock_get,
+            mock_sha256
+    ):
+        _ctx = self.get_mock_ctx(
+            'test_upload',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN,
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+        current_ctx.set(_ctx)
+        mock_get.return_value = self.GET_RESPONSE_VFN
+        tasks.upload_vfn(
+            _ctx,
+            self.CLIENT_CONFIG,
+            __file__,
+            deduplicate=True
+        )
+        mock_upload.assert_called_once()
+        mock_tag.assert_called_with(
+            self.FUNCTION_ID,
+            {
+                'contentSha256': 'ab12',
+                'usedByDeployments': [_ctx.deployment.id]
+            }
+        )
+        self.assertNotIn(
+            'reused_package',
+            _ctx.instance.runtime_properties
+        )
+        self.assertTrue(_ctx.instance.runtime_properties['deduplicated'])
+
+    @mock.patch('mano_sdk.dedup.file_sha256', return_value='ab12')
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.upload'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.update'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.delete'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.update_user_defined_data'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.get'
+    )
+    @mock.patch(
+        'mano_sdk.function_package.'
+        'FunctionPackage.find_onboarded'
+    )
+    def test_interleaved_reuse_and_release(
+            self,
+            mock_find,
+            mock_get,
+            mock_users,
+            mock_delete,
+            mock_update,
+            mock_upload,
+            mock_sha256
+    ):
+        packages = {
+            'fc-shared': dict(
+                self.GET_RESPONSE_VFN,
+                id='fc-shared',
+                userDefinedData={'usedByDeployments': ['site-a']}
+            ),
+            self.FUNCTION_ID: dict(
+                self.CREATE_RESPONSE_VFN,
+                userDefinedData={}
+            )
+        }
+        # Steps of the race losing site B's update: B finds the package,
+        # A reads its users, B adds itself, then A removes itself and
+        # deletes the package. Under the lock the waits time out.
+        looked_up = threading.Event()
+        users_read = threading.Event()
+        reused = threading.Event()
+
+        def find_onboarded(checksum, identity, exclude_id):
+            existing = copy.deepcopy(packages.get('fc-shared'))
+            looked_up.set()
+            users_read.wait(0.5)
+            return existing
+
+        def get(package_id, fields=None, exclude_default=False):
+            if package_id == 'fc-shared' and fields:
+                looked_up.wait(0.5)
+                users_read.set()
+            return copy.deepcopy(packages[package_id])
+
+        def update_user_defined_data(package_id, user_defined_data):
+            users = user_defined_data['usedByDeployments']
+            if 'site-b' in users:
+                reused.set()
+            elif package_id == 'fc-shared':
+                reused.wait(0.5)
+            packages[package_id]['userDefinedData'].update(
+                user_defined_data
+            )
+
+        def delete(package_id):
+            del packages[package_id]
+
+        mock_find.side_effect = find_onboarded
+        mock_get.side_effect = get
+        mock_users.side_effect = update_user_defined_data
+        mock_delete.side_effect = delete
+        release_ctx = self.get_mock_ctx(
+            'site-a',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties={
+                'function_package_id': 'fc-shared',
+                'deduplicated': True
+            },
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+        reuse_ctx = self.get_mock_ctx(
+            'site-b',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_VFN,
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+
+        errors = []
+
+        def run(ctx, task, *args, **kwargs):
+            current_ctx.set(ctx)
+            try:
+                task(ctx, self.CLIENT_CONFIG, *args, **kwargs)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [
+            threading.Thread(
+                target=run,
+                args=(release_ctx, tasks.delete_vfn)
+            ),
+            threading.Thread(
+                target=run,
+                args=(reuse_ctx, tasks.upload_vfn, __file__),
+                kwargs={'deduplicate': True}
+            )
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        reused_id = reuse_ctx.instance.runtime_properties[
+            'function_package_id']
+        # Either site B reused the package, which site A then kept for
+        # it, or site A deleted it first and site B uploaded its own.
+        if 'fc-shared' in packages:
+            self.assertEqual(reused_id, 'fc-shared')
+            self.assertEqual(
+                packages['fc-shared']['userDefinedData'],
+                {'usedByDeployments': ['site-b']}
+            )
+            mock_upload.assert_not_called()
+        else:
+            self.assertEqual(reused_id, self.FUNCTION_ID)
+            mock_upload.assert_called_once()
 
     def test_create_nsd(self):
         _ctx = self.get_mock_ctx(
@@ -419,7 +883,72 @@ class TestTasks(TestCase):
                 tasks.upload_nsd(_ctx, self.CLIENT_CONFIG, self.FILE_NAME)
                 d.assert_called_with(
                     file_name=self.FILE_NAME,
-                    nsd_id=self.NSD_ID
+                    nsd_id=self.NSD_ID,
+                    chunk_size=None,
+                    progress=mock.ANY,
+                    validate=False
+                )
+
+    def test_upload_nsd_from_uri(self):
+        _ctx = self.get_mock_ctx(
+            'test_upload',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_NSD,
+            type_hierarchy=self.NSD_PACKAGE_TH
+        )
+        current_ctx.set(_ctx)
+        with mock.patch(
+                'mano_sdk.network_package.'
+                'NetworkPackage.get') as c:
+            with mock.patch(
+                    'mano_sdk.network_package.'
+                    'NetworkPackage.upload_from_uri') as d:
+                # nsdId is only set once the NFVO onboarded the content.
+                c.side_effect = [
+                    {'nsdOnboardingState': 'UPLOADING'},
+                    self.GET_RESPONSE_NSD,
+                    self.GET_RESPONSE_NSD
+                ]
+                # Already asked for by an earlier run of the operation.
+                with self.assertRaises(OperationRetry):
+                    tasks.upload_nsd(
+                        _ctx,
+                        self.CLIENT_CONFIG,
+                        file_uri=self.FILE_URI
+                    )
+                tasks.upload_nsd(
+                    _ctx,
+                    self.CLIENT_CONFIG,
+                    file_uri=self.FILE_URI
+                )
+                d.assert_not_called()
+                c.assert_called_with(self.NSD_ID)
+                self.assertEqual(
+                    _ctx.instance.runtime_properties['nsd_id'],
+                    self.GET_RESPONSE_NSD['nsdId']
+                )
+
+    def test_upload_nsd_from_uri_fails(self):
+        _ctx = self.get_mock_ctx(
+            'test_upload',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_AFTER_CREATE_NSD,
+            type_hierarchy=self.NSD_PACKAGE_TH
+        )
+        current_ctx.set(_ctx)
+        with mock.patch(
+                'mano_sdk.network_package.'
+                'NetworkPackage.get',
+                return_value={
+                    'nsdOnboardingState': 'ERROR',
+                    'onboardingFailureDetails': {'detail': 'Bad CSAR'}
+                }
+        ):
+            with self.assertRaisesRegex(NonRecoverableError, 'Bad CSAR'):
+                tasks.upload_nsd(
+                    _ctx,
+                    self.CLIENT_CONFIG,
+                    file_uri=self.FILE_URI
                 )
 
     def test_update_nsd(self):
@@ -461,7 +990,14 @@ class TestTasks(TestCase):
         with mock.patch(
                 'mano_sdk.network_package.'
                 'NetworkPackage.delete'
-        ) as d:
+        ) as d, mock.patch(
+                'mano_sdk.network_package.'
+                'NetworkPackage.get',
+                return_value=dict(
+                    self.GET_RESPONSE_NSD,
+                    nsdOperationalState='DISABLED'
+                )
+        ) as c:
             tasks.delete_nsd(
                 ctx=_ctx,
                 client_config=self.CLIENT_CONFIG
@@ -469,6 +1005,7 @@ class TestTasks(TestCase):
             d.assert_called_with(
                 nsd_id=self.NSD_ID
             )
+            c.assert_not_called()
 
     def test_create_ns_instance(self):
         _ctx = self.get_mock_ctx(
@@ -624,7 +1161,10 @@ class TestTasks(TestCase):
                     client_config=self.CLIENT_CONFIG
                 )
                 c.assert_called_with(
-                    operation_id=self.OPERATION_ID
+                    operation_id=self.OPERATION_ID,
+                    fields=tasks.OPERATION_FIELDS,
+                    exclude_default=True,
+                    cache=False
                 )
                 d.assert_called_with(
                     ns_instance_id=self.NETWORK_INSTANCE_ID
@@ -654,10 +1194,89 @@ class TestTasks(TestCase):
                         client_config=self.CLIENT_CONFIG
                     )
                 c.assert_called_with(
-                    operation_id=self.OPERATION_ID
+                    operation_id=self.OPERATION_ID,
+                    fields=tasks.OPERATION_FIELDS,
+                    exclude_default=True,
+                    cache=False
                 )
                 d.assert_not_called()
 
+    def test_client_options_metrics_dir(self):
+        options = tasks._client_options(
+            dict(self.CLIENT_CONFIG, metrics_dir='/tmp/metrics', deadline=5)
+        )
+        exporter, = options.pop('metrics_hooks')
+        self.assertEqual(options, {})
+        self.assertEqual(
+            exporter.path,
+            '/tmp/metrics/mano_sdk.prom'
+        )
+        self.assertEqual(exporter.const_labels, {})
+
+    def test_operation_trace(self):
+        _ctx = self.get_mock_ctx(
+            'test_get_operation',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.RUNTIME_PROPERTIES_OPERATION,
+            type_hierarchy=self.NETWORK_INSTANCE_TH
+        )
+
+        current_ctx.set(_ctx)
+        exporter = mock.MagicMock()
+        with mock.patch(
+                'mano_sdk.tracing.get_exporters',
+                return_value=[exporter]):
+            with mock.patch(
+                    'mano_sdk.network_operation.'
+                    'NetworkOperation.get') as c:
+                c.return_value = self.GET_PROCESSING_OPERATION_RESPONSE
+                with self.assertRaises(OperationRetry):
+                    tasks.get_network_operation(
+                        ctx=_ctx,
+                        client_config=dict(
+                            self.CLIENT_CONFIG,
+                            tracing={'console': True}
+                        )
+                    )
+        span = exporter.export.call_args[0][0]
+        self.assertEqual(span.name, 'mano_plugin.tasks.get_network_operation')
+        self.assertEqual(span.status, 'ok')
+        self.assertEqual(
+            span.attributes['node_instance.id'],
+            _ctx.instance.id
+        )
+        self.assertIn('operation.retry', span.attributes)
+        exporter.flush.assert_called_once_with()
+
+    def test_operation_deadline(self):
+        _ctx = self.get_mock_ctx(
+            'test_create',
+            test_properties=self.NODE_PROPERTIES,
+            test_runtime_properties=self.DEFAULT_RUNTIME_PROPERTIES,
+            type_hierarchy=self.VFN_PACKAGE_TH
+        )
+
+        current_ctx.set(_ctx)
+        budgets = []
+        with mock.patch(
+                'mano_sdk.function_package.'
+                'FunctionPackage.create') as c:
+            c.side_effect = lambda *args: budgets.append(
+                remaining()
+            ) or self.CREATE_RESPONSE_VFN
+            with mock.patch(
+                    'mano_sdk.function_package.'
+                    'FunctionPackage.get'):
+                tasks.create_vfn(
+                    _ctx,
+                    dict(self.CLIENT_CONFIG, deadline=30),
+                    self.TAGS
+                )
+                tasks.create_vfn(_ctx, self.CLIENT_CONFIG, self.TAGS)
+        self.assertLessEqual(budgets[0], 30)
+        self.assertIsNone(budgets[1])
+        self.assertIsNone(remaining())
+
     def test_get_processing_operation(self):
         _ctx = self.get_mock_ctx(
             'test_get_operation',
@@ -682,6 +1301,9 @@ class TestTasks(TestCase):
                         client_config=self.CLIENT_CONFIG
                     )
                 c.assert_called_with(
-                    operation_id=self.OPERATION_ID
+                    operation_id=self.OPERATION_ID,
+                    fields=tasks.OPERATION_FIELDS,
+                    exclude_default=True,
+                    cache=False
                 )
                 d.assert_not_called()
@@ -1,6 +1,68 @@
-from .client import Client, Credentials
-from .function_package import FunctionPackage
-from .network_instance import NetworkInstance
-from .network_operation import NetworkOperation
-from .network_package import NetworkPackage
-from .package_base import PackageBaseClass
+"""
+    mano_sdk
+    ~~~~~~~~
+    ETSI SOL client SDK. Names are imported from their modules on first
+    access (PEP 562), so importing one module does not load the others.
+"""
+import importlib
+
+_EXPORTS = {
+    'AsyncClient': 'async_client',
+    'CircuitBreaker': 'breaker',
+    'circuit_breaker_stats': 'breaker',
+    'BaseClient': 'client',
+    'Client': 'client',
+    'Credentials': 'client',
+    'CsarReport': 'csar',
+    'inspect_csar': 'csar',
+    'validate_csar': 'csar',
+    'with_deadline': 'deadline',
+    'AsyncFunctionPackage': 'function_package',
+    'FunctionPackage': 'function_package',
+    'OnboardResult': 'function_package',
+    'InMemoryHistogram': 'metrics',
+    'PrometheusTextfileExporter': 'metrics',
+    'RequestMetrics': 'metrics',
+    'NsdInfo': 'models',
+    'NsInstance': 'models',
+    'NsLcmOpOcc': 'models',
+    'VnfPkgInfo': 'models',
+    'AsyncNetworkInstance': 'network_instance',
+    'NetworkInstance': 'network_instance',
+    'AsyncNetworkOperation': 'network_operation',
+    'NetworkOperation': 'network_operation',
+    'AsyncNetworkPackage': 'network_package',
+    'NetworkPackage': 'network_package',
+    'PackageBaseClass': 'package_base',
+    'RateLimiter': 'ratelimit',
+    'AsyncResourceMixin': 'resource_base',
+    'ResourceBaseClass': 'resource_base',
+    'close_all_sessions': 'session',
+    'close_session': 'session',
+    'get_session': 'session',
+    'configure_tracing': 'tracing',
+    'start_span': 'tracing',
+    'RecordingTransport': 'transport',
+    'ReplayTransport': 'transport',
+    'Transport': 'transport'
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(
+            'module {} has no attribute {}'.format(repr(__name__), repr(name))
+        )
+    value = getattr(
+        importlib.import_module('.' + module_name, __name__),
+        name
+    )
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
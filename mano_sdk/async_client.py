@@ -0,0 +1,343 @@
+"""
+    mano_sdk.async_client
+    ~~~~~~~~
+    Asyncio client for ETSI SOL interfaces.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk.client import XML_CHUNK_SIZE, BaseClient, Credentials
+from mano_sdk.deadline import cap_timeout
+
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+async def _on_connection_create_start(session, context, params):
+    context.trace_request_ctx.connect_started = time.perf_counter()
+
+
+async def _on_connection_create_end(session, context, params):
+    timings = context.trace_request_ctx
+    timings.connect += time.perf_counter() - timings.connect_started
+
+
+async def _on_request_end(session, context, params):
+    context.trace_request_ctx.headers_received = time.perf_counter()
+
+
+def _timings_trace_config():
+    """
+        Trace config filling the `trace_request_ctx` of a request with
+        connection set-up time and arrival of response headers.
+    """
+    import aiohttp
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(
+        _on_connection_create_start
+    )
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+
+class AsyncClient(BaseClient):
+    """
+        AsyncClient
+        ~~~~~~~~~~~~~~
+        Asyncio counterpart of `Client`, `get/post/put/patch/delete`
+        return awaitables. Requests are built and responses parsed by
+        the same `BaseClient` code as the synchronous client.
+
+        `aiohttp` is imported on first request, so synchronous users do
+        not pay for it.
+
+        Transports (see `mano_sdk.transport`) wrap the requests session
+        of `Client` and are not supported: `transport` is rejected.
+    """
+
+    def __init__(
+            self,
+            credentials: Credentials,
+            endpoint_url: str,
+            logger: Any,
+            connection_limit: int = DEFAULT_CONNECTION_LIMIT,
+            transport: Any = None,
+            **options
+    ):
+        if transport is not None:
+            raise NonRecoverableError(
+                'AsyncClient does not support transport, record or replay '
+                'exchanges with Client.'
+            )
+        super().__init__(credentials, endpoint_url, logger, **options)
+        self.connection_limit = connection_limit
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        import aiohttp
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                trace_configs=[_timings_trace_config()]
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+            Closes pooled connections of the client.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _authenticate(self, auth: Any, headers: Dict[str, str]) -> None:
+        """
+            Applies the requests `auth` object on `headers`, as aiohttp
+            has no pluggable auth. OAuth2 tokens which are not fresh in
+            memory are read or fetched in an executor, their file lock
+            and token request would block the event loop.
+        """
+        if hasattr(auth, 'fresh_token') and auth.fresh_token() is None:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                auth.access_token
+            )
+        auth(SimpleNamespace(headers=headers))
+
+    async def _check_circuit_async(self) -> None:
+        """
+            `_check_circuit` in an executor: the breaker state file is
+            read under a lock shared with other processes.
+        """
+        if self.circuit_breaker is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._check_circuit
+            )
+
+    async def _record_outcome_async(
+            self,
+            status_code: Optional[int] = None
+    ) -> None:
+        if self.circuit_breaker is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self._record_outcome,
+                status_code
+            )
+
+    async def _rate_limit_delay_async(self) -> float:
+        """
+            Takes a token of the endpoint rate limit in an executor, the
+            bucket file lock and I/O would block the event loop.
+        """
+        if self.rate_limit is None:
+            return 0.0
+        delay = await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.rate_limit.reserve
+        )
+        return self._rate_limit_wait(delay)
+
+    async def _send(
+            self,
+            method: str,
+            path: str,
+            params: Optional[Any] = "",
+            data: Optional[str] = "",
+            content_type: Optional[str] = "application/json",
+            headers: Optional[Dict[str, str]] = None,
+            stream: bool = False
+    ) -> Tuple[Any, Optional[bytes]]:
+        """
+            Sends a request, retrying transient failures. Returns the
+            response and its body. With `stream` the body is left unread
+            and the caller must release the response.
+        """
+        import aiohttp
+        with self._request_span(method, path) as span:
+            request = self._prepare_request(
+                method=method,
+                path=path,
+                params=params,
+                data=data,
+                content_type=content_type,
+                headers=self._trace_headers(span, headers)
+            )
+            auth = request.pop('auth')
+            retry = self.retry_policy.start()
+            position = self._body_position(request['data'])
+            request_bytes = self._body_size(request['data'])
+            refreshed = False
+            while True:
+                await self._check_circuit_async()
+                delay = await self._rate_limit_delay_async()
+                if delay:
+                    await asyncio.sleep(delay)
+                await self._authenticate(auth, request['headers'])
+                connect_timeout, read_timeout = self._timeouts(
+                    method,
+                    path,
+                    request_bytes
+                )
+                timeout = aiohttp.ClientTimeout(
+                    total=cap_timeout(None),
+                    connect=connect_timeout,
+                    sock_read=read_timeout
+                )
+                timings = SimpleNamespace(connect=0.0, headers_received=None)
+                start = time.perf_counter()
+                try:
+                    response = await self._get_session().request(
+                        timeout=timeout,
+                        trace_request_ctx=timings,
+                        **request
+                    )
+                    content = None if stream else await response.read()
+                except (
+                    aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError
+                ) as e:
+                    self._record_metrics(
+                        method,
+                        path,
+                        None,
+                        timings.connect,
+                        None,
+                        time.perf_counter() - start,
+                        request_bytes
+                    )
+                    await self._record_outcome_async()
+                    if isinstance(e, asyncio.TimeoutError):
+                        delay = self._timeout_retry_delay(
+                            retry,
+                            method,
+                            position
+                        )
+                    else:
+                        delay = self._retry_delay(retry, method)
+                    if delay is None:
+                        self._connection_error(e)
+                else:
+                    self._record_metrics(
+                        method,
+                        path,
+                        response.status,
+                        timings.connect,
+                        timings.headers_received - start
+                        if timings.headers_received else None,
+                        time.perf_counter() - start,
+                        request_bytes,
+                        self._response_size(response.headers, content)
+                    )
+                    await self._record_outcome_async(response.status)
+                    if self._refresh_auth(auth, response.status, refreshed):
+                        refreshed = True
+                        delay = 0.0
+                    else:
+                        delay = self._retry_delay(
+                            retry,
+                            method,
+                            response.status,
+                            response.headers
+                        )
+                    if delay is None:
+                        self._end_span(span, response.status, retry)
+                        return response, content
+                    response.release()
+                await asyncio.sleep(delay)
+                self._rewind(request['data'], position)
+
+    async def _make_request(
+            self,
+            method: str,
+            path: str,
+            return_code: int,
+            params: Optional[Any] = "",
+            data: Optional[str] = "",
+            content_type: Optional[str] = "application/json",
+            cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        lookup = self._cache_lookup(method, path, params, cache)
+        if lookup.cached is not None:
+            return self._cached_response(lookup)
+        response, content = await self._send(
+            method=method,
+            path=path,
+            params=params,
+            data=data,
+            content_type=content_type,
+            headers=lookup.conditional.headers() if lookup.conditional
+            else None
+        )
+        return self._handle_response(
+            status_code=response.status,
+            reason=response.reason,
+            url=str(response.url),
+            headers=response.headers,
+            content=content,
+            return_code=return_code,
+            lookup=lookup
+        )
+
+    async def iter_items(
+            self,
+            path: str,
+            params: Optional[Any] = "",
+            content_type: str = "application/json",
+            return_code: int = 200
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+            Sends `GET` requests following SOL013 `Link: rel="next"`
+            paging and yields listed items one page at a time.
+
+            XML pages are decoded incrementally, yielding each child of
+            the root element as soon as it has been received.
+        """
+        while params is not None:
+            response, _ = await self._send(
+                method="GET",
+                path=path,
+                params=params,
+                data="",
+                content_type=content_type,
+                stream=True
+            )
+            try:
+                params = self._next_page_params(response.headers)
+                if (
+                    response.status == 200 and
+                    self._is_xml(response.headers.get('Content-Type'))
+                ):
+                    from mano_sdk.xml_stream import XmlItemParser
+                    parser = XmlItemParser()
+                    async for chunk in response.content.iter_chunked(
+                            XML_CHUNK_SIZE
+                    ):
+                        for item in parser.feed(chunk):
+                            yield item
+                    for item in parser.close():
+                        yield item
+                    continue
+                page = self._handle_response(
+                    status_code=response.status,
+                    reason=response.reason,
+                    url=str(response.url),
+                    headers=response.headers,
+                    content=await response.read(),
+                    return_code=return_code
+                )
+            finally:
+                response.release()
+            for item in self._page_items(page):
+                yield item
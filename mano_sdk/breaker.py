@@ -0,0 +1,279 @@
+"""
+    mano_sdk.breaker
+    ~~~~~~~~
+    Circuit breakers shared by processes of the same host.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from mano_sdk.ratelimit import DEFAULT_STATE_DIR
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+DEFAULT_FAILURE_STATUSES = (500, 502, 503, 504)
+STATE_FILE_PREFIX = 'breaker-'
+
+_circuit_breakers: Dict[Tuple[str, str], 'CircuitBreaker'] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def _initial_state(key: str) -> Dict[str, Any]:
+    return {
+        'endpoint_url': key,
+        'state': CLOSED,
+        'failures': 0,
+        'opened': 0,
+        'retry_at': 0.0,
+        'trials': 0,
+        'trial_started_at': 0.0
+    }
+
+
+def _current_state(state: Dict[str, Any], now: float) -> str:
+    if state['state'] == OPEN and now >= state['retry_at']:
+        state['state'] = HALF_OPEN
+        state['trials'] = 0
+    return state['state']
+
+
+def _stats(state: Dict[str, Any], now: float) -> Dict[str, Any]:
+    current = _current_state(dict(state), now)
+    return {
+        'state': current,
+        'failures': state['failures'],
+        'opened': state['opened'],
+        'retry_after': max(0.0, state['retry_at'] - now)
+        if current == OPEN else 0.0
+    }
+
+
+def _read_state(fd: int) -> Optional[Dict[str, Any]]:
+    content = b''
+    while True:
+        block = os.read(fd, 4096)
+        if not block:
+            break
+        content += block
+    try:
+        state = json.loads(content.decode('utf-8'))
+    except ValueError:
+        return None
+    return state if isinstance(state, dict) else None
+
+
+class CircuitBreaker:
+    """
+        Stops sending requests to an endpoint which keeps failing.
+
+        The breaker is `closed` while the endpoint answers. After
+        `failure_threshold` consecutive failures it opens and requests
+        fail fast for `recovery_timeout` seconds. It then turns
+        `half-open` and lets `half_open_max_calls` trial requests
+        through: a success closes it, a failure opens it again.
+
+        The state lives in a small file under `state_dir`, updated under
+        an exclusive `flock`, so the operations of all agent processes
+        sending requests to the endpoint count failures together. Where
+        `fcntl` is missing the state is only shared by threads of the
+        process.
+
+        :param str key: Breaker name, usually the endpoint url.
+        :param int failure_threshold: Consecutive failures opening the
+            breaker.
+        :param float recovery_timeout: Seconds the breaker stays open.
+        :param int half_open_max_calls: Concurrent trial requests while
+            half-open.
+        :param failure_statuses: Status codes counted as failures, along
+            with connection errors.
+        :param str state_dir: Directory of breaker files.
+    """
+
+    def __init__(
+            self,
+            key: str,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+            half_open_max_calls: int = 1,
+            failure_statuses: Iterable[int] = DEFAULT_FAILURE_STATUSES,
+            state_dir: str = DEFAULT_STATE_DIR
+    ):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_statuses = frozenset(failure_statuses)
+        self.state_dir = state_dir
+        self.path = os.path.join(
+            state_dir,
+            '{}{}'.format(
+                STATE_FILE_PREFIX,
+                hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+            )
+        )
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _shared_state(self) -> Iterator[Dict[str, Any]]:
+        """
+            Yields the state of the breaker, locked, and writes it back
+            when the block exits.
+        """
+        with self._lock:
+            os.makedirs(self.state_dir, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                state = _read_state(fd) or _initial_state(self.key)
+                before = dict(state)
+                yield state
+                if state != before:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.ftruncate(fd, 0)
+                    os.write(fd, json.dumps(state).encode('utf-8'))
+            finally:
+                # Closing the descriptor releases the lock.
+                os.close(fd)
+
+    @property
+    def state(self) -> str:
+        with self._shared_state() as state:
+            return _current_state(state, time.time())
+
+    def allow_request(self) -> bool:
+        """
+            Returns whether a request may be sent now, reserving a trial
+            slot when half-open.
+        """
+        with self._shared_state() as state:
+            now = time.time()
+            current = _current_state(state, now)
+            if current == CLOSED:
+                return True
+            if current == OPEN:
+                return False
+            # A trial which never reported back must not keep the
+            # breaker half-open forever.
+            if now - state['trial_started_at'] >= self.recovery_timeout:
+                state['trials'] = 0
+            if state['trials'] >= self.half_open_max_calls:
+                return False
+            state['trials'] += 1
+            state['trial_started_at'] = now
+            return True
+
+    def retry_after(self) -> float:
+        """
+            Seconds until the breaker lets a trial request through.
+        """
+        with self._shared_state() as state:
+            return _stats(state, time.time())['retry_after']
+
+    def is_failure(self, status_code: Optional[int]) -> bool:
+        return status_code is None or status_code in self.failure_statuses
+
+    def record(self, status_code: Optional[int] = None) -> Optional[str]:
+        """
+            Records the outcome of a request, a None `status_code`
+            meaning a connection error. Returns the new state when it
+            changed.
+        """
+        with self._shared_state() as state:
+            now = time.time()
+            current = _current_state(state, now)
+            if not self.is_failure(status_code):
+                state['failures'] = 0
+                if current == CLOSED:
+                    return None
+                state['state'] = CLOSED
+                return CLOSED
+            state['failures'] += 1
+            if current == HALF_OPEN or (
+                    current == CLOSED and
+                    state['failures'] >= self.failure_threshold):
+                state['state'] = OPEN
+                state['retry_at'] = now + self.recovery_timeout
+                state['opened'] += 1
+                return OPEN
+            return None
+
+    def reset(self) -> None:
+        with self._shared_state() as state:
+            state.update(_initial_state(self.key))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+            State and counters for monitoring.
+        """
+        with self._shared_state() as state:
+            return _stats(state, time.time())
+
+
+def get_circuit_breaker(
+        endpoint_url: str,
+        state_dir: str = DEFAULT_STATE_DIR,
+        **options
+) -> CircuitBreaker:
+    """
+        Returns the breaker of `endpoint_url`, creating it with `options`
+        on first use.
+    """
+    key = endpoint_url.rstrip('/')
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get((key, state_dir))
+        if breaker is None:
+            breaker = CircuitBreaker(key, state_dir=state_dir, **options)
+            _circuit_breakers[(key, state_dir)] = breaker
+        return breaker
+
+
+def circuit_breaker_stats(
+        state_dir: str = DEFAULT_STATE_DIR
+) -> Dict[str, Dict[str, Any]]:
+    """
+        State of the breaker of every endpoint, as shared by the agent
+        processes of the host, for monitoring.
+    """
+    stats = {}
+    try:
+        entries = [
+            entry for entry in os.scandir(state_dir)
+            if entry.name.startswith(STATE_FILE_PREFIX)
+        ]
+    except FileNotFoundError:
+        return stats
+    now = time.time()
+    for entry in entries:
+        try:
+            fd = os.open(entry.path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            state = _read_state(fd)
+        finally:
+            os.close(fd)
+        if state is not None:
+            stats[state['endpoint_url']] = _stats(state, now)
+    return stats
+
+
+def clear_circuit_breakers() -> None:
+    """
+        Forgets breakers of all endpoints. State files are kept.
+    """
+    with _circuit_breakers_lock:
+        _circuit_breakers.clear()
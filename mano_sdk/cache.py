@@ -0,0 +1,311 @@
+"""
+    mano_sdk.cache
+    ~~~~~~~~
+    Response caches shared by clients of the same endpoint.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+DEFAULT_CONDITIONAL_CACHE_SIZE = 256
+
+DEFAULT_RESPONSE_CACHE_SIZE = 512
+DEFAULT_RESPONSE_TTL = 5.0
+# States of every resource move on their own on the NFVO side, so TTLs
+# stay short; polls of those states skip the cache (`cache=False`).
+DEFAULT_RESPONSE_TTLS = {
+    "/sol/vnfpkgm/v1/vnf_packages": 10.0,
+    "/sol/nsd/v1/ns_descriptors": 10.0,
+    "/sol/nslcm/v1/ns_instances": 2.0,
+    "/sol/nslcm/v1/ns_lcm_op_occs": 2.0
+}
+
+_conditional_caches: Dict[Hashable, 'ConditionalCache'] = {}
+_conditional_caches_lock = threading.Lock()
+_response_caches: Dict[Hashable, 'ResponseCache'] = {}
+_response_caches_lock = threading.Lock()
+
+
+class CacheLookup:
+    """
+        Outcome of looking a request up in the client caches.
+    """
+    __slots__ = ('method', 'path', 'key', 'conditional', 'cached')
+
+    def __init__(self, method: str, path: str, key: Hashable):
+        self.method = method
+        self.path = path
+        self.key = key
+        self.conditional = None
+        self.cached = None
+
+
+class ConditionalEntry:
+    """
+        Body of a response together with its validators.
+
+        The raw body is kept rather than the parsed one, so callers
+        cannot alter cached data by mutating what they were returned.
+    """
+    __slots__ = ('content_type', 'content', 'etag', 'last_modified')
+
+    def __init__(
+            self,
+            content_type: Optional[str],
+            content: bytes,
+            etag: Optional[str],
+            last_modified: Optional[str]
+    ):
+        self.content_type = content_type
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def headers(self) -> Dict[str, str]:
+        """
+            Conditional request headers revalidating the entry.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ConditionalCache:
+    """
+        Size-bounded LRU of `ETag`/`Last-Modified` validated responses.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CONDITIONAL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[ConditionalEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(
+            self,
+            key: Hashable,
+            headers: Any,
+            content: bytes
+    ) -> None:
+        """
+            Remembers the response if it carries validators, forgets the
+            previous entry otherwise.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            if not etag and not last_modified:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = ConditionalEntry(
+                headers.get('Content-Type'),
+                content,
+                etag,
+                last_modified
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def get_conditional_cache(
+        scope: Tuple[Hashable, ...],
+        max_entries: int = DEFAULT_CONDITIONAL_CACHE_SIZE
+) -> ConditionalCache:
+    """
+        Returns the conditional cache shared by clients of `scope`
+        (endpoint and credentials), creating it on first use.
+    """
+    with _conditional_caches_lock:
+        cache = _conditional_caches.get(scope)
+        if cache is None:
+            cache = ConditionalCache(max_entries)
+            _conditional_caches[scope] = cache
+        return cache
+
+
+def clear_conditional_caches() -> None:
+    """
+        Forgets all conditionally cached responses.
+    """
+    with _conditional_caches_lock:
+        _conditional_caches.clear()
+
+
+class CachedResponse:
+    """
+        Body of a response cached until `expires_at`.
+    """
+    __slots__ = ('path', 'content_type', 'content', 'expires_at')
+
+    def __init__(
+            self,
+            path: str,
+            content_type: Optional[str],
+            content: bytes,
+            expires_at: float
+    ):
+        self.path = path
+        self.content_type = content_type
+        self.content = content
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+        Size-bounded LRU of `GET` responses, each kept for the TTL of its
+        resource type. Mutations invalidate the cached responses of the
+        mutated path, its parents and its children.
+
+        :param int max_entries: Maximum number of cached responses.
+        :param float default_ttl: Seconds a response stays valid when no
+            entry of `ttls` matches its path.
+        :param dict ttls: TTL per path prefix, the longest matching
+            prefix wins. A TTL of 0 disables caching for the prefix.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = DEFAULT_RESPONSE_CACHE_SIZE,
+            default_ttl: float = DEFAULT_RESPONSE_TTL,
+            ttls: Optional[Dict[str, float]] = None
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(DEFAULT_RESPONSE_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, path: str) -> float:
+        """
+            TTL of responses of `path`.
+        """
+        matched = None
+        for prefix in self.ttls:
+            if _is_same_or_child(path, prefix) and (
+                    matched is None or len(prefix) > len(matched)):
+                matched = prefix
+        return self.default_ttl if matched is None else self.ttls[matched]
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(
+            self,
+            key: Hashable,
+            path: str,
+            headers: Any,
+            content: bytes
+    ) -> None:
+        ttl = self.ttl(path)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = CachedResponse(
+                path,
+                headers.get('Content-Type'),
+                content,
+                time.monotonic() + ttl
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        """
+            Drops cached responses of `path`, of its parent collections
+            and of its sub-resources.
+        """
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if _is_same_or_child(entry.path, path) or
+                _is_same_or_child(path, entry.path)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+            Counters for tuning the cache.
+        """
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
+
+
+def _is_same_or_child(path: str, parent: str) -> bool:
+    parent = parent.rstrip('/')
+    return path == parent or path.startswith(parent + '/')
+
+
+def get_response_cache(
+        scope: Tuple[Hashable, ...],
+        **cache_options
+) -> ResponseCache:
+    """
+        Returns the response cache shared by clients of `scope`
+        (endpoint and credentials), creating it with `cache_options` on
+        first use.
+    """
+    with _response_caches_lock:
+        cache = _response_caches.get(scope)
+        if cache is None:
+            cache = ResponseCache(**cache_options)
+            _response_caches[scope] = cache
+        return cache
+
+
+def clear_response_caches() -> None:
+    """
+        Forgets all cached responses.
+    """
+    with _response_caches_lock:
+        _response_caches.clear()
@@ -1,10 +1,38 @@
-import json
-from typing import Any, Dict, Optional
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import (Any, Callable, Dict, Hashable, Iterable, Iterator, List,
+                    Optional, Tuple, Union)
+from urllib.parse import parse_qsl, urlsplit
 
 import requests
-import xmltodict
 from cloudify.exceptions import NonRecoverableError, RecoverableError
 from requests.auth import AuthBase, HTTPBasicAuth
+from requests.utils import parse_header_links
+
+from mano_sdk.breaker import CircuitBreaker, get_circuit_breaker
+from mano_sdk.cache import (DEFAULT_CONDITIONAL_CACHE_SIZE, CacheLookup,
+                            ConditionalCache, ResponseCache,
+                            get_conditional_cache, get_response_cache)
+from mano_sdk.codec import JsonCodec, get_codec
+from mano_sdk.compression import ACCEPT_ENCODING, compress_body
+from mano_sdk.deadline import cap_timeout, check_deadline, remaining
+from mano_sdk.metrics import RequestMetrics, template_path
+from mano_sdk.oauth import get_oauth2_auth
+from mano_sdk.ratelimit import RateLimiter, get_rate_limiter
+from mano_sdk.retry import RetryPolicy, RetryState
+from mano_sdk.session import (DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE,
+                              close_session, get_session, pop_connect_time)
+from mano_sdk.tracing import Span, start_span, tracing_enabled
+from mano_sdk.transport import Transport, get_transport
+
+XML_CHUNK_SIZE = 64 * 1024
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+# The NFVO answers an upload once it has stored and checked the whole
+# body: the read timeout grows by a second per this many bytes of body.
+UPLOAD_READ_RATE = 1024 * 1024
 
 
 class TokenAuth(AuthBase):
@@ -24,47 +52,218 @@ class Credentials:
     :param str username: The username part of the credentials.
     :param str password: The password part of the credentials.
     :param str token: The security token, valid only for session credentials.
+    :param dict oauth2: OAuth 2.0 client credentials grant settings:
+        `token_url`, `client_id`, `client_secret` and optionally `scope`,
+        `token_dir`, `refresh_margin`, see `mano_sdk.oauth`.
     """
 
-    def __init__(self, username=None, password=None, token=None):
+    def __init__(self, username=None, password=None, token=None, oauth2=None):
         self.username = username
         self.password = password
         self.token = token
+        self.oauth2 = oauth2
 
 
-class Client:
+class BaseClient(ABC):
     """
-        Client
+        BaseClient
         ~~~~~~~~~~~~~~
-        Client created for sending requests.
+        Request building and response parsing shared by `Client` and
+        `AsyncClient`. Subclasses only implement `_make_request` and
+        `iter_items`.
+
+        Transient failures are retried according to `retry_policy`, which
+        may be given as a `RetryPolicy` or as its keyword arguments.
+
+        `GET` responses carrying `ETag`/`Last-Modified` are kept in a
+        cache shared by clients of the same endpoint and credentials, and
+        revalidated with `If-None-Match`/`If-Modified-Since`; a `304`
+        is answered from the cache. Disable with `conditional_cache=0`.
+
+        `response_cache` opts into a TTL cache answering `GET` requests
+        without contacting the NFVO; give `True`, a `ResponseCache` or
+        its keyword arguments. Mutations invalidate it by path.
+
+        JSON is encoded and decoded by `json_codec`, by default the
+        fastest of orjson/ujson/json installed, see `mano_sdk.codec`.
+
+        Compressed responses (gzip, deflate and brotli when installed)
+        are accepted and decoded transparently. JSON/XML request bodies
+        longer than `compress_threshold` bytes are sent gzipped; the
+        default None never compresses, as not every NFVO accepts it.
+
+        `circuit_breaker` opts into a breaker shared by all processes of
+        the host sending to the endpoint, failing requests fast while the
+        NFVO is down; give
+        `True`, a `CircuitBreaker` or its keyword arguments.
+
+        `rate_limit` throttles requests with a token bucket shared by all
+        processes of the host sending to the endpoint; give a
+        `RateLimiter` or its `rate`/`burst`/`state_dir` arguments.
+
+        Each attempt is bounded by `connect_timeout` and `read_timeout`
+        (None waits forever), both capped by the deadline set with
+        `mano_sdk.deadline.deadline`, which retries also stop at.
+
+        Every attempt is reported as a `RequestMetrics` to each callable
+        of `metrics_hooks`, see `mano_sdk.metrics` for exporters.
+
+        When tracing is enabled, each request (with its retries) runs in
+        a child span of the current one and sends its W3C `traceparent`
+        to the NFVO, see `mano_sdk.tracing`.
     """
 
     def __init__(
             self,
             credentials: Credentials,
             endpoint_url: str,
-            logger: Any
+            logger: Any,
+            retry_policy: Union[RetryPolicy, Dict[str, Any], None] = None,
+            conditional_cache: int = DEFAULT_CONDITIONAL_CACHE_SIZE,
+            response_cache: Union[
+                ResponseCache, Dict[str, Any], bool, None] = None,
+            json_codec: Union[str, JsonCodec, None] = 'auto',
+            compress_threshold: Optional[int] = None,
+            circuit_breaker: Union[
+                CircuitBreaker, Dict[str, Any], bool, None] = None,
+            rate_limit: Union[RateLimiter, Dict[str, Any], None] = None,
+            connect_timeout: Optional[float] = DEFAULT_CONNECT_TIMEOUT,
+            read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+            metrics_hooks: Iterable[Callable[[RequestMetrics], Any]] = ()
     ):
         self.cred = credentials
         self.url = endpoint_url
         self.logger = logger
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        elif isinstance(retry_policy, dict):
+            retry_policy = RetryPolicy(**retry_policy)
+        self.retry_policy = retry_policy
+        self.conditional_cache_size = conditional_cache
+        if response_cache is True:
+            response_cache = {}
+        if isinstance(response_cache, dict):
+            response_cache = get_response_cache(
+                self._cache_scope(),
+                **response_cache
+            )
+        elif not isinstance(response_cache, ResponseCache):
+            response_cache = None
+        self.response_cache = response_cache
+        self.codec = get_codec(json_codec)
+        self.compress_threshold = compress_threshold
+        if circuit_breaker is True:
+            circuit_breaker = {}
+        if isinstance(circuit_breaker, dict):
+            circuit_breaker = get_circuit_breaker(
+                endpoint_url,
+                **circuit_breaker
+            )
+        elif not isinstance(circuit_breaker, CircuitBreaker):
+            circuit_breaker = None
+        self.circuit_breaker = circuit_breaker
+        if isinstance(rate_limit, dict):
+            rate_limit = get_rate_limiter(endpoint_url, **rate_limit)
+        self.rate_limit = rate_limit
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.metrics_hooks = list(metrics_hooks)
 
-    def _make_request(
+    def _cache_scope(self) -> Tuple[Hashable, ...]:
+        client_id = (self.cred.oauth2 or {}).get('client_id')
+        return (
+            self.url.rstrip('/'),
+            self.cred.username,
+            self.cred.token,
+            client_id
+        )
+
+    @property
+    def conditional_cache(self) -> Optional[ConditionalCache]:
+        """
+            Conditional GET cache of the endpoint, None when disabled.
+        """
+        if not self.conditional_cache_size:
+            return None
+        return get_conditional_cache(
+            self._cache_scope(),
+            self.conditional_cache_size
+        )
+
+    def _cache_lookup(
             self,
             method: str,
             path: str,
-            return_code: int,
-            params: Optional[Any] = "",
-            data: Optional[str] = "",
-            content_type: Optional[str] = "application/json"
+            params: Optional[Any],
+            cache: bool = True
+    ) -> CacheLookup:
+        """
+            Looks a request up in the response cache, unless `cache` is
+            False, then in the conditional cache.
+        """
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        lookup = CacheLookup(method, path, (path, params or None))
+        if method != "GET":
+            return lookup
+        if self.response_cache is not None and cache:
+            lookup.cached = self.response_cache.get(lookup.key)
+        conditional_cache = self.conditional_cache
+        if lookup.cached is None and conditional_cache is not None:
+            lookup.conditional = conditional_cache.get(lookup.key)
+        return lookup
+
+    def _update_caches(
+            self,
+            lookup: CacheLookup,
+            status_code: int,
+            headers: Any,
+            content: bytes
+    ) -> None:
+        """
+            Caches a successful `GET` response, or invalidates responses
+            made stale by a successful mutation.
+        """
+        if lookup.method != "GET":
+            if self.response_cache is not None:
+                self.response_cache.invalidate(lookup.path)
+            return
+        if status_code != requests.codes.ok:
+            return
+        conditional_cache = self.conditional_cache
+        if conditional_cache is not None:
+            conditional_cache.store(lookup.key, headers, content)
+        if self.response_cache is not None:
+            self.response_cache.store(
+                lookup.key,
+                lookup.path,
+                headers,
+                content
+            )
+
+    def _cached_response(
+            self,
+            lookup: CacheLookup
     ) -> Optional[Dict[str, Any]]:
-        request_auth = ""
-        headers = {'Content-type': content_type}
+        self.logger.debug(
+            'Response of {} served from cache.'.format(lookup.path)
+        )
+        return self._parse_response(
+            content_type=lookup.cached.content_type,
+            content=lookup.cached.content,
+            logger=self.logger,
+            codec=self.codec
+        )
+
+    def _get_auth(self) -> AuthBase:
+        request_auth = None
         if self.cred.username and self.cred.password:
             request_auth = HTTPBasicAuth(
                 self.cred.username,
                 self.cred.password
             )
+        if self.cred.oauth2:
+            request_auth = get_oauth2_auth(self.url, **self.cred.oauth2)
         if self.cred.token:
             request_auth = TokenAuth(
                 token=self.cred.token,
@@ -76,61 +275,468 @@ class Client:
                 .format(repr(self.url))
             )
             raise NonRecoverableError(
-                'Token or user/password not provided.'
-            )
-        try:
-            response = requests.request(
-                auth=request_auth,
-                method=method,
-                url=self.url + path,
-                headers=headers,
-                params=params,
-                data=data
+                'Token, OAuth2 client or user/password not provided.'
             )
-        except requests.exceptions.ConnectionError as e:
-            self.logger.error(
-                'ConnectionError for endpoint: {}'
+        return request_auth
+
+    def _prepare_request(
+            self,
+            method: str,
+            path: str,
+            params: Optional[Any] = "",
+            data: Optional[str] = "",
+            content_type: Optional[str] = "application/json",
+            headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+            Builds keyword arguments of a single request.
+        """
+        if isinstance(params, dict):
+            params = {
+                key: str(value) if isinstance(value, bool) else value
+                for key, value in params.items()
+            }
+        request_headers = {
+            'Content-type': content_type,
+            'Accept-Encoding': ACCEPT_ENCODING
+        }
+        data, compressed = compress_body(
+            data,
+            content_type,
+            self.compress_threshold
+        )
+        if compressed:
+            request_headers['Content-Encoding'] = 'gzip'
+        if headers:
+            request_headers.update(headers)
+        return {
+            'auth': self._get_auth(),
+            'method': method,
+            'url': self.url + path,
+            'headers': request_headers,
+            'params': params or None,
+            'data': data or None
+        }
+
+    def _connection_error(self, error: Exception) -> None:
+        self.logger.error(
+            'ConnectionError for endpoint: {}'
+            .format(repr(self.url))
+        )
+        raise RecoverableError(error)
+
+    def _check_circuit(self) -> None:
+        """
+            Fails fast while the circuit breaker of the endpoint is open.
+        """
+        if (
+            self.circuit_breaker is None or
+            self.circuit_breaker.allow_request()
+        ):
+            return
+        retry_after = self.circuit_breaker.retry_after()
+        self.logger.error(
+            'Circuit breaker open for endpoint: {}'.format(repr(self.url))
+        )
+        raise RecoverableError(
+            'Circuit breaker open for endpoint: {}, retry in {:.0f}s.'
+            .format(repr(self.url), retry_after),
+            retry_after=retry_after
+        )
+
+    def _refresh_auth(
+            self,
+            auth: AuthBase,
+            status_code: int,
+            refreshed: bool
+    ) -> bool:
+        """
+            Drops an OAuth2 token the NFVO rejected, so the request can
+            be sent once more with a new one.
+        """
+        if (
+            refreshed or
+            status_code != requests.codes.unauthorized or
+            not hasattr(auth, 'invalidate')
+        ):
+            return False
+        self.logger.debug(
+            'Token rejected by endpoint: {}, fetching a new one.'
+            .format(repr(self.url))
+        )
+        auth.invalidate()
+        return True
+
+    def _rate_limit_delay(self) -> float:
+        """
+            Takes a token of the endpoint rate limit, returns seconds to
+            wait before sending the request.
+        """
+        if self.rate_limit is None:
+            return 0.0
+        return self._rate_limit_wait(self.rate_limit.reserve())
+
+    def _rate_limit_wait(self, delay: float) -> float:
+        """
+            Checks `delay`, returned by the rate limit for a token,
+            against the deadline of the operation.
+        """
+        left = remaining()
+        if left is not None and delay >= left:
+            raise RecoverableError(
+                'Deadline exceeded waiting for rate limit of endpoint: {}.'
                 .format(repr(self.url))
             )
-            raise RecoverableError(e)
+        if delay:
+            self.logger.debug(
+                'Rate limit of endpoint: {} reached, waiting {:.3f}s.'
+                .format(repr(self.url), delay)
+            )
+        return delay
+
+    def _timeouts(
+            self,
+            method: str,
+            path: str,
+            request_bytes: Optional[int] = None
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+            Connect and read timeouts of the next attempt, capped by the
+            deadline. The read timeout is scaled with the size of the
+            request body. Raises once the deadline has run out.
+        """
+        check_deadline('{} {}'.format(method, path))
+        read_timeout = self.read_timeout
+        if read_timeout is not None and request_bytes:
+            read_timeout += request_bytes / UPLOAD_READ_RATE
+        return (
+            cap_timeout(self.connect_timeout),
+            cap_timeout(read_timeout)
+        )
+
+    @staticmethod
+    def _body_size(data: Any) -> Optional[int]:
+        if isinstance(data, (bytes, str)):
+            return len(data)
+        if hasattr(data, '__len__') and hasattr(data, 'tell'):
+            return len(data) - data.tell()
+        if hasattr(data, 'fileno') and hasattr(data, 'tell'):
+            try:
+                return os.fstat(data.fileno()).st_size - data.tell()
+            except OSError:
+                pass
+        if hasattr(data, 'seek') and hasattr(data, 'tell'):
+            position = data.tell()
+            size = data.seek(0, os.SEEK_END) - position
+            data.seek(position)
+            return size
+        return None
+
+    @staticmethod
+    def _response_size(
+            headers: Any,
+            content: Optional[bytes]
+    ) -> Optional[int]:
+        if content is not None:
+            return len(content)
+        length = headers.get('Content-Length')
+        return int(length) if length and length.isdigit() else None
+
+    def _record_metrics(
+            self,
+            method: str,
+            path: str,
+            status: Optional[int],
+            connect: Optional[float],
+            ttfb: Optional[float],
+            total: float,
+            request_bytes: Optional[int],
+            response_bytes: Optional[int] = None
+    ) -> None:
+        """
+            Reports an attempt to `metrics_hooks`. A failing hook is
+            logged, it never fails the request.
+        """
+        if not self.metrics_hooks:
+            return
+        metrics = RequestMetrics(
+            endpoint_url=self.url,
+            method=method,
+            path=template_path(path),
+            status=status,
+            connect=connect,
+            ttfb=ttfb,
+            total=total,
+            request_bytes=request_bytes,
+            response_bytes=response_bytes
+        )
+        for hook in self.metrics_hooks:
+            try:
+                hook(metrics)
+            except Exception as e:
+                self.logger.warning(
+                    'Metrics hook {} failed: {}'.format(repr(hook), e)
+                )
+
+    def _request_span(self, method: str, path: str) -> Any:
+        """
+            Context manager of the span of a request, yielding None when
+            tracing is disabled.
+        """
+        if not tracing_enabled():
+            return nullcontext()
+        route = template_path(path)
+        return start_span(
+            '{} {}'.format(method, route),
+            {
+                'http.method': method,
+                'http.route': route,
+                'server.address': self.url
+            }
+        )
+
+    @staticmethod
+    def _trace_headers(
+            span: Optional[Span],
+            headers: Optional[Dict[str, str]]
+    ) -> Optional[Dict[str, str]]:
+        if span is None:
+            return headers
+        return dict(headers or {}, traceparent=span.traceparent)
+
+    @staticmethod
+    def _end_span(
+            span: Optional[Span],
+            status_code: int,
+            retry: RetryState
+    ) -> None:
+        if span is not None:
+            span.set_attribute('http.status_code', status_code)
+            span.set_attribute('http.attempts', retry.attempt)
+
+    def _record_outcome(self, status_code: Optional[int] = None) -> None:
+        """
+            Reports a response, or a connection error when `status_code`
+            is None, to the circuit breaker.
+        """
+        if self.circuit_breaker is None:
+            return
+        state = self.circuit_breaker.record(status_code)
+        if state is not None:
+            self.logger.warning(
+                'Circuit breaker for endpoint: {} is now {}.'
+                .format(repr(self.url), state)
+            )
+
+    def _retry_delay(
+            self,
+            retry: RetryState,
+            method: str,
+            status_code: Optional[int] = None,
+            headers: Optional[Any] = None
+    ) -> Optional[float]:
+        """
+            Returns seconds to wait before retrying the request, or None
+            when its result is final.
+        """
+        if status_code is not None and status_code < 400:
+            return None
+        delay = retry.next_delay(method, status_code, headers)
+        left = remaining()
+        if delay is not None and left is not None and delay >= left:
+            self.logger.debug(
+                'Not retrying {} request to {}, deadline exceeded.'
+                .format(method, repr(self.url))
+            )
+            return None
+        if delay is not None:
+            self.logger.debug(
+                'Retrying {} request to {} in {:.3f}s ({}).'.format(
+                    method,
+                    repr(self.url),
+                    delay,
+                    status_code or 'connection error'
+                )
+            )
+        return delay
+
+    def _timeout_retry_delay(
+            self,
+            retry: RetryState,
+            method: str,
+            position: Optional[int]
+    ) -> Optional[float]:
+        """
+            Like `_retry_delay`, after the NFVO did not answer in time. A
+            streamed body, e.g. package content, may have reached the
+            NFVO already: it is not sent again.
+        """
+        if position is not None:
+            self.logger.debug(
+                'Not retrying {} request to {}, its body may have been '
+                'received.'.format(method, repr(self.url))
+            )
+            return None
+        return self._retry_delay(retry, method)
 
-        try:
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
+    @staticmethod
+    def _rewind(data: Any, position: Optional[int]) -> None:
+        """
+            Moves file-like request body back to where the previous
+            attempt started reading it.
+        """
+        if position is not None:
+            data.seek(position)
+
+    @staticmethod
+    def _body_position(data: Any) -> Optional[int]:
+        if hasattr(data, 'seek') and hasattr(data, 'tell'):
+            return data.tell()
+        return None
+
+    def _handle_response(
+            self,
+            status_code: int,
+            reason: str,
+            url: str,
+            headers: Any,
+            content: bytes,
+            return_code: int,
+            lookup: Optional[CacheLookup] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+            Validates status code and parses the received body.
+        """
+        if (
+            status_code == requests.codes.not_modified and
+            lookup is not None and
+            lookup.conditional is not None
+        ):
+            self.logger.debug(
+                'Resource {} not modified, using cached response.'
+                .format(url)
+            )
+            if self.response_cache is not None:
+                self.response_cache.store(
+                    lookup.key,
+                    lookup.path,
+                    {'Content-Type': lookup.conditional.content_type},
+                    lookup.conditional.content
+                )
+            return self._parse_response(
+                content_type=lookup.conditional.content_type,
+                content=lookup.conditional.content,
+                logger=self.logger,
+                codec=self.codec
+            )
+        if status_code in self.retry_policy.retry_statuses:
+            raise RecoverableError(
+                'NFVO overloaded, status code {} for url: {}'.format(
+                    status_code,
+                    url
+                ),
+                retry_after=self.retry_policy.parse_retry_after(
+                    headers.get('Retry-After')
+                )
+            )
+        if status_code >= 400:
+            error_kind = 'Client' if status_code < 500 else 'Server'
             raise NonRecoverableError(
-                'HTTPError occurred {}. Reason: {}'.format(e, response.text)
+                'HTTPError occurred {} {} Error: {} for url: {}. '
+                'Reason: {}'.format(
+                    status_code,
+                    error_kind,
+                    reason,
+                    url,
+                    content.decode('utf-8', errors='replace')
+                )
             )
-        if response.status_code == requests.codes.no_content:
+        if lookup is not None:
+            self._update_caches(lookup, status_code, headers, content)
+        if status_code == requests.codes.no_content:
             return None
-        if response.status_code != return_code:
+        if status_code != return_code:
             self.logger.warn(
                 'Status_code {} different than expected {}'.format(
-                    response.status_code,
+                    status_code,
                     return_code
                 )
             )
         else:
             self.logger.debug(
                 'Response code {} defined as successful.'
-                .format(response.status_code)
+                .format(status_code)
             )
 
         parsed_response = self._parse_response(
-            response=response,
-            logger=self.logger
+            content_type=headers.get('Content-Type'),
+            content=content,
+            logger=self.logger,
+            codec=self.codec
         )
         return parsed_response
 
+    @staticmethod
+    def _next_page_params(headers: Any) -> Optional[Dict[str, Any]]:
+        """
+            Returns query parameters of the page linked with
+            `Link: rel="next"`, or None on the last page.
+        """
+        link_header = headers.get('Link')
+        if not link_header:
+            return None
+        for link in parse_header_links(link_header):
+            if link.get('rel') == 'next':
+                return dict(parse_qsl(urlsplit(link['url']).query))
+        return None
+
+    @staticmethod
+    def _page_items(page: Any) -> List[Any]:
+        if page is None:
+            return []
+        if isinstance(page, list):
+            return page
+        return [page]
+
+    @abstractmethod
+    def _make_request(
+            self,
+            method: str,
+            path: str,
+            return_code: int,
+            params: Optional[Any] = "",
+            data: Optional[str] = "",
+            content_type: Optional[str] = "application/json",
+            cache: bool = True
+    ) -> Any:
+        """
+            Sends a request and returns its parsed body.
+        """
+
+    @abstractmethod
+    def iter_items(
+            self,
+            path: str,
+            params: Optional[Any] = "",
+            content_type: str = "application/json",
+            return_code: int = 200
+    ) -> Any:
+        """
+            Yields items of every page of a collection.
+        """
+
     def get(
             self,
             path: str,
             data: Optional[str],
             params: Optional[Any] = "",
             content_type: str = "application/json",
-            return_code: int = 200
+            return_code: int = 200,
+            cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
-            Sends `GET` request.
+            Sends `GET` request. With `cache` False the response cache is
+            not read, for polls, but still gets the fresh response.
         """
         return self._make_request(
             method="GET",
@@ -138,7 +744,8 @@ class Client:
             return_code=return_code,
             params=params,
             data=data,
-            content_type=content_type
+            content_type=content_type,
+            cache=cache
         )
 
     def post(
@@ -219,28 +826,283 @@ class Client:
             content_type=""
         )
 
+    @staticmethod
+    def _is_xml(content_type: Optional[str]) -> bool:
+        response_content_type = (content_type or '').lower()
+        return (
+            response_content_type.startswith('text/xml') or
+            response_content_type.startswith('application/xml')
+        )
+
     @staticmethod
     def _parse_response(
-            response: requests.Response,
-            logger: Any
+            content_type: Optional[str],
+            content: bytes,
+            logger: Any,
+            codec: Optional[JsonCodec] = None
     ) -> Optional[Dict[str, Any]]:
         """
-            Parses received xml or json response.
+            Parses received xml or json response. JSON is decoded from
+            the raw bytes by `codec`.
         """
         json_response = {}
-        if response.headers.get('Content-Type'):
-            response_content_type = response.headers['Content-Type'].lower()
+        if content_type:
+            response_content_type = content_type.lower()
             if (
                 response_content_type.startswith("application/json") or
                 response_content_type.startswith("text/json")
             ):
-                json_response = response.json()
-            elif (
-                response_content_type.startswith('text/xml') or
-                response_content_type.startswith('application/xml')
-            ):
-                json_response = json.loads(
-                    json.dumps(xmltodict.parse(response.text))
+                json_response = (codec or JsonCodec()).loads(content)
+            elif BaseClient._is_xml(response_content_type):
+                import xmltodict
+                json_response = xmltodict.parse(
+                    content,
+                    dict_constructor=dict
                 )
                 logger.debug('XML response transformed to dict.')
         return json_response
+
+
+class Client(BaseClient):
+    """
+        Client
+        ~~~~~~~~~~~~~~
+        Client created for sending requests.
+
+        Requests go through a keep-alive session shared by all clients
+        of the same `endpoint_url` and credentials, see
+        `mano_sdk.session`.
+
+        `transport` sends them over the session; give a `Transport` or
+        `mode` (`record`/`replay`), `cassette` and `reproduce_latency`
+        to record exchanges or replay them offline, see
+        `mano_sdk.transport`.
+    """
+
+    def __init__(
+            self,
+            credentials: Credentials,
+            endpoint_url: str,
+            logger: Any,
+            pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+            transport: Union[Transport, Dict[str, Any], None] = None,
+            **options
+    ):
+        super().__init__(credentials, endpoint_url, logger, **options)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        if isinstance(transport, dict):
+            transport = get_transport(**transport)
+        self.transport = transport or Transport()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+            Pooled session of the endpoint, shared by clients with the
+            same credentials.
+        """
+        return get_session(
+            self.url,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            scope=self._cache_scope()
+        )
+
+    def close(self) -> None:
+        """
+            Closes pooled connections of the endpoint. They are shared,
+            so other clients of the endpoint reconnect on their next call.
+        """
+        close_session(self.url)
+
+    def _send(
+            self,
+            method: str,
+            path: str,
+            params: Optional[Any] = "",
+            data: Optional[str] = "",
+            content_type: Optional[str] = "application/json",
+            headers: Optional[Dict[str, str]] = None,
+            stream: bool = False
+    ) -> requests.Response:
+        """
+            Sends a request, retrying transient failures. With `stream`
+            the body is left unread for the caller.
+        """
+        with self._request_span(method, path) as span:
+            request = self._prepare_request(
+                method=method,
+                path=path,
+                params=params,
+                data=data,
+                content_type=content_type,
+                headers=self._trace_headers(span, headers)
+            )
+            retry = self.retry_policy.start()
+            position = self._body_position(request['data'])
+            request_bytes = self._body_size(request['data'])
+            refreshed = False
+            while True:
+                self._check_circuit()
+                delay = self._rate_limit_delay()
+                if delay:
+                    time.sleep(delay)
+                timeouts = self._timeouts(method, path, request_bytes)
+                pop_connect_time()
+                start = time.perf_counter()
+                try:
+                    response = self.transport.request(
+                        self.session,
+                        stream=stream,
+                        timeout=timeouts,
+                        **request
+                    )
+                except (
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout
+                ) as e:
+                    self._record_metrics(
+                        method,
+                        path,
+                        None,
+                        pop_connect_time(),
+                        None,
+                        time.perf_counter() - start,
+                        request_bytes
+                    )
+                    self._record_outcome()
+                    if isinstance(e, requests.exceptions.ReadTimeout):
+                        delay = self._timeout_retry_delay(
+                            retry,
+                            method,
+                            position
+                        )
+                    else:
+                        delay = self._retry_delay(retry, method)
+                    if delay is None:
+                        self._connection_error(e)
+                else:
+                    self._record_metrics(
+                        method,
+                        path,
+                        response.status_code,
+                        pop_connect_time(),
+                        response.elapsed.total_seconds(),
+                        time.perf_counter() - start,
+                        request_bytes,
+                        self._response_size(
+                            response.headers,
+                            None if stream else response.content
+                        )
+                    )
+                    self._record_outcome(response.status_code)
+                    if self._refresh_auth(
+                            request['auth'],
+                            response.status_code,
+                            refreshed
+                    ):
+                        refreshed = True
+                        delay = 0.0
+                    else:
+                        delay = self._retry_delay(
+                            retry,
+                            method,
+                            response.status_code,
+                            response.headers
+                        )
+                    if delay is None:
+                        self._end_span(span, response.status_code, retry)
+                        return response
+                    response.close()
+                time.sleep(delay)
+                self._rewind(request['data'], position)
+
+    def _make_request(
+            self,
+            method: str,
+            path: str,
+            return_code: int,
+            params: Optional[Any] = "",
+            data: Optional[str] = "",
+            content_type: Optional[str] = "application/json",
+            cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        lookup = self._cache_lookup(method, path, params, cache)
+        if lookup.cached is not None:
+            return self._cached_response(lookup)
+        response = self._send(
+            method=method,
+            path=path,
+            params=params,
+            data=data,
+            content_type=content_type,
+            headers=lookup.conditional.headers() if lookup.conditional
+            else None
+        )
+        return self._handle_response(
+            status_code=response.status_code,
+            reason=response.reason,
+            url=response.url,
+            headers=response.headers,
+            content=response.content,
+            return_code=return_code,
+            lookup=lookup
+        )
+
+    def iter_items(
+            self,
+            path: str,
+            params: Optional[Any] = "",
+            content_type: str = "application/json",
+            return_code: int = 200
+    ) -> Iterator[Dict[str, Any]]:
+        """
+            Sends `GET` requests following SOL013 `Link: rel="next"`
+            paging and yields listed items one page at a time.
+
+            XML pages are decoded incrementally, yielding each child of
+            the root element as soon as it has been received.
+        """
+        while params is not None:
+            response = self._send(
+                method="GET",
+                path=path,
+                params=params,
+                data="",
+                content_type=content_type,
+                stream=True
+            )
+            with response:
+                params = self._next_page_params(response.headers)
+                if (
+                    response.status_code == requests.codes.ok and
+                    self._is_xml(response.headers.get('Content-Type'))
+                ):
+                    yield from self._iter_xml_items(response)
+                    continue
+                page = self._handle_response(
+                    status_code=response.status_code,
+                    reason=response.reason,
+                    url=response.url,
+                    headers=response.headers,
+                    content=response.content,
+                    return_code=return_code
+                )
+            yield from self._page_items(page)
+
+    @staticmethod
+    def _iter_xml_items(
+            response: requests.Response
+    ) -> Iterator[Dict[str, Any]]:
+        from mano_sdk.xml_stream import XmlItemParser
+        parser = XmlItemParser()
+        for chunk in response.iter_content(XML_CHUNK_SIZE):
+            yield from parser.feed(chunk)
+        yield from parser.close()
@@ -0,0 +1,94 @@
+"""
+    mano_sdk.codec
+    ~~~~~~~~
+    JSON codecs used for request bodies and responses.
+"""
+import json
+from typing import Any, Dict, Optional, Union
+
+from cloudify.exceptions import NonRecoverableError
+
+
+class JsonCodec:
+    """
+        Standard library codec, always available.
+    """
+    name = 'json'
+
+    def dumps(self, obj: Any) -> Union[str, bytes]:
+        return json.dumps(obj)
+
+    def loads(self, content: bytes) -> Any:
+        return json.loads(content)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+        `orjson` codec, encodes straight to UTF-8 bytes.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, content: bytes) -> Any:
+        return self._orjson.loads(content)
+
+
+class UjsonCodec(JsonCodec):
+    """
+        `ujson` codec.
+    """
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> str:
+        return self._ujson.dumps(obj, ensure_ascii=False)
+
+    def loads(self, content: bytes) -> Any:
+        return self._ujson.loads(content)
+
+
+CODECS = {
+    codec.name: codec for codec in [OrjsonCodec, UjsonCodec, JsonCodec]
+}
+# Preference order when the codec is picked automatically.
+AUTO_CODECS = ['orjson', 'ujson', 'json']
+
+_codecs: Dict[str, Optional[JsonCodec]] = {}
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = 'auto') -> JsonCodec:
+    """
+        Returns a codec by name. `auto` (or None) picks the fastest
+        installed one, falling back to the standard library.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    names = AUTO_CODECS if codec in (None, 'auto') else [codec]
+    for name in names:
+        instance = _load_codec(name)
+        if instance is not None:
+            return instance
+    raise NonRecoverableError(
+        'JSON codec {} is not available.'.format(repr(codec))
+    )
+
+
+def _load_codec(name: str) -> Optional[JsonCodec]:
+    if name not in _codecs:
+        if name not in CODECS:
+            return None
+        try:
+            _codecs[name] = CODECS[name]()
+        except ImportError:
+            _codecs[name] = None
+    return _codecs[name]
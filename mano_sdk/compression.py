@@ -0,0 +1,56 @@
+"""
+    mano_sdk.compression
+    ~~~~~~~~
+    HTTP content coding of requests and responses.
+"""
+import gzip
+from typing import Any, Optional, Tuple
+
+# Zip packages are already compressed, only text bodies are worth it.
+COMPRESSIBLE_CONTENT_TYPES = ('application/json', 'text/json',
+                              'application/xml', 'text/xml')
+GZIP_LEVEL = 6
+
+
+def _brotli_available() -> bool:
+    # requests (urllib3) and aiohttp decode `br` with either package.
+    for module in ('brotli', 'brotlicffi'):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        return True
+    return False
+
+
+def accept_encoding() -> str:
+    """
+        Value of `Accept-Encoding` listing codings the HTTP libraries
+        can decode here. Responses are decoded by them transparently.
+    """
+    if _brotli_available():
+        return 'gzip, deflate, br'
+    return 'gzip, deflate'
+
+
+ACCEPT_ENCODING = accept_encoding()
+
+
+def compress_body(
+        data: Any,
+        content_type: Optional[str],
+        threshold: Optional[int]
+) -> Tuple[Any, bool]:
+    """
+        Gzips a JSON or XML request body longer than `threshold` bytes.
+        Returns the body to send and whether it was compressed. Streams
+        and bodies of other types are returned unchanged.
+    """
+    if threshold is None or not data:
+        return data, False
+    if not (content_type or '').lower().startswith(COMPRESSIBLE_CONTENT_TYPES):
+        return data, False
+    body = data.encode('utf-8') if isinstance(data, str) else data
+    if not isinstance(body, bytes) or len(body) <= threshold:
+        return data, False
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), True
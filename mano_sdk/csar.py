@@ -0,0 +1,299 @@
+"""
+    mano_sdk.csar
+    ~~~~~~~~
+    Local validation of SOL004 CSAR packages before upload.
+"""
+import hashlib
+import posixpath
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from cloudify.exceptions import NonRecoverableError
+
+TOSCA_META = 'TOSCA-Metadata/TOSCA.meta'
+TOSCA_META_KEYS = (
+    'TOSCA-Meta-File-Version',
+    'CSAR-Version',
+    'Created-By',
+    'Entry-Definitions'
+)
+# Manifest metadata required by SOL004, by package kind.
+MANIFEST_METADATA = {
+    'vnf': (
+        'vnf_provider_id',
+        'vnf_product_name',
+        'vnf_release_date_time',
+        'vnf_package_version'
+    ),
+    'nsd': (
+        'nsd_designer',
+        'nsd_invariant_id',
+        'nsd_name',
+        'nsd_release_date_time',
+        'nsd_file_structure_version'
+    )
+}
+HASH_ALGORITHMS = {
+    'SHA-256': 'sha256',
+    'SHA-384': 'sha384',
+    'SHA-512': 'sha512'
+}
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+class CsarReport:
+    """
+        Outcome of `inspect_csar`.
+
+        :param str entry_definitions: Path of the main descriptor.
+        :param str manifest: Path of the manifest, None without one.
+        :param dict metadata: Metadata of the manifest.
+        :param int verified: Number of artifacts whose digest matched.
+        :param list errors: Problems found, empty for a valid package.
+    """
+    __slots__ = ('path', 'entry_definitions', 'manifest', 'metadata',
+                 'verified', 'errors')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entry_definitions = None
+        self.manifest = None
+        self.metadata: Dict[str, str] = {}
+        self.verified = 0
+        self.errors: List[str] = []
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def __repr__(self):
+        return '<CsarReport {} {} errors>'.format(
+            self.path,
+            len(self.errors)
+        )
+
+
+def parse_tosca_meta(content: str) -> Dict[str, str]:
+    """
+        Keys of a `TOSCA.meta` file (first block only).
+    """
+    meta = {}
+    for line in content.splitlines():
+        if not line.strip():
+            if meta:
+                break
+            continue
+        key, separator, value = line.partition(':')
+        if separator:
+            meta[key.strip()] = value.strip()
+    return meta
+
+
+def entry_definitions(package: zipfile.ZipFile) -> Optional[str]:
+    """
+        Path of the main descriptor of an open CSAR: `Entry-Definitions`
+        of `TOSCA.meta`, or the only YAML file at the root.
+    """
+    if TOSCA_META in package.namelist():
+        return parse_tosca_meta(
+            package.read(TOSCA_META).decode('utf-8', errors='replace')
+        ).get('Entry-Definitions')
+    root_yaml = [
+        name for name in package.namelist()
+        if '/' not in name and name.endswith(('.yaml', '.yml'))
+    ]
+    return root_yaml[0] if len(root_yaml) == 1 else None
+
+
+def parse_manifest(
+        content: str
+) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
+    """
+        Metadata and artifact entries (`Source`, `Algorithm`, `Hash`)
+        of a SOL004 manifest. Signatures and non-MANO artifact sets are
+        skipped.
+    """
+    metadata = {}
+    artifacts = []
+    section = None
+    in_signature = False
+    for raw_line in content.splitlines():
+        line = raw_line.strip()
+        if line.startswith('-----BEGIN'):
+            in_signature = True
+            continue
+        if in_signature:
+            in_signature = not line.startswith('-----END')
+            continue
+        if not line or line.startswith('#'):
+            continue
+        key, separator, value = line.partition(':')
+        key, value = key.strip(), value.strip()
+        if not separator:
+            continue
+        if not raw_line[0].isspace() and not value:
+            # Block header, e.g. `metadata:`, `non_mano_artifact_sets:`.
+            section = key
+            continue
+        if raw_line[0].isspace():
+            if section == 'metadata':
+                metadata[key] = value
+        elif key == 'Source':
+            section = None
+            artifacts.append({'Source': value})
+        elif key in ('Algorithm', 'Hash') and artifacts and \
+                section is None:
+            artifacts[-1][key] = value
+    return metadata, artifacts
+
+
+def _manifest_path(
+        package: zipfile.ZipFile,
+        meta: Dict[str, str],
+        definitions: Optional[str]
+) -> Optional[str]:
+    if meta.get('ETSI-Entry-Manifest'):
+        return meta['ETSI-Entry-Manifest']
+    if definitions and '/' not in definitions:
+        candidate = posixpath.splitext(definitions)[0] + '.mf'
+        if candidate in package.namelist():
+            return candidate
+    manifests = [
+        name for name in package.namelist()
+        if '/' not in name and name.endswith('.mf')
+    ]
+    return manifests[0] if len(manifests) == 1 else None
+
+
+def entry_digest(
+        package: zipfile.ZipFile,
+        name: str,
+        algorithm: str,
+        block_size: int = READ_BLOCK_SIZE
+) -> str:
+    """
+        Hex digest of entry `name`, decompressed and hashed one block at
+        a time, so memory use does not depend on the entry size.
+    """
+    digest = hashlib.new(algorithm)
+    with package.open(name) as entry:
+        for block in iter(lambda: entry.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _check_artifacts(
+        package: zipfile.ZipFile,
+        artifacts: List[Dict[str, str]],
+        report: CsarReport
+) -> None:
+    names = set(package.namelist())
+    for artifact in artifacts:
+        source = artifact['Source']
+        if '://' in source:
+            # External artifact, fetched by the NFVO.
+            continue
+        if source not in names:
+            report.errors.append(
+                'Manifest lists {} which is not in the package.'
+                .format(source)
+            )
+            continue
+        if 'Hash' not in artifact:
+            continue
+        algorithm = HASH_ALGORITHMS.get(
+            artifact.get('Algorithm', '').upper()
+        )
+        if algorithm is None:
+            report.errors.append(
+                'Unsupported digest algorithm {} of {}.'.format(
+                    repr(artifact.get('Algorithm')),
+                    source
+                )
+            )
+            continue
+        if entry_digest(package, source, algorithm) != \
+                artifact['Hash'].lower():
+            report.errors.append(
+                'Digest of {} does not match the manifest.'.format(source)
+            )
+            continue
+        report.verified += 1
+
+
+def inspect_csar(path: str, kind: Optional[str] = None) -> CsarReport:
+    """
+        Checks the CSAR at `path`: `TOSCA.meta` keys, presence of the
+        entry definitions and manifest, manifest metadata of `kind`
+        (`vnf` or `nsd`) and the digest of every artifact it lists.
+        All problems are collected in the returned report.
+    """
+    report = CsarReport(path)
+    try:
+        package = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError) as e:
+        report.errors.append('Not a valid CSAR zip: {}'.format(e))
+        return report
+    with package:
+        names = set(package.namelist())
+        meta: Dict[str, Any] = {}
+        if TOSCA_META in names:
+            meta = parse_tosca_meta(
+                package.read(TOSCA_META).decode('utf-8', errors='replace')
+            )
+            for key in TOSCA_META_KEYS:
+                if not meta.get(key):
+                    report.errors.append(
+                        '{} has no {}.'.format(TOSCA_META, key)
+                    )
+        report.entry_definitions = entry_definitions(package)
+        if report.entry_definitions is None:
+            if TOSCA_META not in names:
+                report.errors.append(
+                    'No {} and no single YAML file at the package root.'
+                    .format(TOSCA_META)
+                )
+        elif report.entry_definitions not in names:
+            report.errors.append(
+                'Entry definitions {} are not in the package.'.format(
+                    report.entry_definitions
+                )
+            )
+        report.manifest = _manifest_path(
+            package,
+            meta,
+            report.entry_definitions
+        )
+        if report.manifest is None or report.manifest not in names:
+            report.errors.append('Package has no manifest file.')
+            report.manifest = None
+            return report
+        report.metadata, artifacts = parse_manifest(
+            package.read(report.manifest).decode('utf-8', errors='replace')
+        )
+        for key in MANIFEST_METADATA.get(kind, ()):
+            if not report.metadata.get(key):
+                report.errors.append(
+                    'Manifest metadata has no {}.'.format(key)
+                )
+        _check_artifacts(package, artifacts, report)
+    return report
+
+
+def validate_csar(path: str, kind: Optional[str] = None) -> CsarReport:
+    """
+        Runs `inspect_csar` and raises `NonRecoverableError` listing the
+        problems of an invalid package. Files which are not zip archives
+        by name (e.g. a plain descriptor) are not checked.
+    """
+    if not path.lower().endswith(('.zip', '.csar')):
+        return CsarReport(path)
+    report = inspect_csar(path, kind)
+    if not report.valid:
+        raise NonRecoverableError(
+            'Package {} is invalid: {}'.format(
+                repr(path),
+                ' '.join(report.errors)
+            )
+        )
+    return report
@@ -0,0 +1,88 @@
+"""
+    mano_sdk.deadline
+    ~~~~~~~~
+    End-to-end time budget shared by nested calls and retries.
+"""
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+
+from cloudify.exceptions import RecoverableError
+
+_deadline: ContextVar[Optional[float]] = ContextVar(
+    'mano_sdk_deadline',
+    default=None
+)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+        Limits everything sent by `mano_sdk` inside the block to
+        `seconds` in total: request timeouts are capped by what is left
+        and nothing is sent or retried once it has run out. A nested
+        deadline may only shorten the outer one. None sets no limit.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def with_deadline(
+        seconds: Optional[float]
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+        Decorator running the function inside `deadline(seconds)`.
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with deadline(seconds):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def remaining() -> Optional[float]:
+    """
+        Seconds left of the current deadline, None without one.
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def check_deadline(action: str) -> Optional[float]:
+    """
+        Raises when the deadline has run out before `action`, returns
+        seconds left otherwise.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise RecoverableError(
+            'Deadline exceeded before {}.'.format(action)
+        )
+    return left
+
+
+def cap_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+        Shortens `timeout` to the time left of the deadline.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.001)
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,261 @@
+"""
+    mano_sdk.dedup
+    ~~~~~~~~
+    Content-addressed deduplication of uploaded packages.
+"""
+import hashlib
+import os
+import posixpath
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from mano_sdk.csar import entry_definitions
+from mano_sdk.ratelimit import DEFAULT_STATE_DIR
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+HASH_BLOCK_SIZE = 1024 * 1024
+# Key of `userDefinedData` holding the SHA-256 of uploaded content, for
+# NFVOs which do not report a checksum (e.g. for NSDs).
+CHECKSUM_KEY = 'contentSha256'
+# Key of `userDefinedData` listing the deployments using a package, so it
+# is disabled and deleted only by the last of them.
+USERS_KEY = 'usedByDeployments'
+# Stands in `USERS_KEY` for the unknown deployment which uploaded a
+# package without listing itself; it never releases the package.
+UNTRACKED_USER = 'untracked'
+# SOL001 descriptor properties identifying a package, by SOL005 attribute.
+VNF_IDENTITY = (
+    ('vnfdId', 'descriptor_id'),
+    ('vnfProvider', 'provider'),
+    ('vnfdVersion', 'descriptor_version')
+)
+NSD_IDENTITY = (
+    ('nsdId', 'descriptor_id'),
+    ('nsdDesigner', 'designer'),
+    ('nsdVersion', 'version')
+)
+
+
+def file_sha256(path: str, block_size: int = HASH_BLOCK_SIZE) -> str:
+    """
+        SHA-256 hex digest of `path`, read `block_size` bytes at a time.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as package_file:
+        for block in iter(lambda: package_file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_files(
+        paths: Sequence[str],
+        max_workers: int = 4,
+        block_size: int = HASH_BLOCK_SIZE
+) -> Dict[str, str]:
+    """
+        SHA-256 of each of `paths`, hashed `max_workers` files at a time
+        (hashlib releases the GIL on large blocks).
+    """
+    if len(paths) <= 1:
+        return {path: file_sha256(path, block_size) for path in paths}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        digests = executor.map(
+            lambda path: file_sha256(path, block_size),
+            paths
+        )
+        return dict(zip(paths, digests))
+
+
+@contextmanager
+def package_users_lock(
+        key: str,
+        state_dir: str = DEFAULT_STATE_DIR
+) -> Iterator[None]:
+    """
+        Holds an exclusive `flock` on a file under `state_dir` named
+        after `key`, usually the endpoint url, while the users
+        (`USERS_KEY`) of its packages are read, changed and written
+        back. The NFVO offers no atomic update of the list, so this
+        keeps agent processes of the host from losing each other's
+        changes, or deleting a package another deployment just started
+        reusing. Where `fcntl` is missing nothing is locked.
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    fd = os.open(
+        os.path.join(
+            state_dir,
+            'users-{}'.format(
+                hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+            )
+        ),
+        os.O_RDWR | os.O_CREAT,
+        0o600
+    )
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock.
+        os.close(fd)
+
+
+def _scalar(value: Any) -> Optional[str]:
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return str(value)
+    return None
+
+
+def _properties(nodes: Any, read: Any) -> Iterable[tuple]:
+    """
+        `(name, read(value))` of each property of `nodes`, node templates
+        or node types of a parsed SOL001 descriptor.
+    """
+    if not isinstance(nodes, dict):
+        return
+    for node in nodes.values():
+        if isinstance(node, dict) and isinstance(node.get('properties'), dict):
+            for name, value in node['properties'].items():
+                value = _scalar(read(value))
+                if value is not None:
+                    yield name, value
+
+
+def _read_descriptors(package: zipfile.ZipFile, entry: str) -> List[Any]:
+    """
+        Parsed `entry` of `package` followed by the descriptors it
+        imports from the package.
+    """
+    import yaml
+    descriptors = []
+    pending = [entry]
+    seen = set()
+    names = set(package.namelist())
+    while pending:
+        name = pending.pop(0)
+        if name in seen or name not in names:
+            continue
+        seen.add(name)
+        try:
+            descriptor = yaml.safe_load(package.read(name))
+        except yaml.YAMLError:
+            continue
+        if not isinstance(descriptor, dict):
+            continue
+        descriptors.append(descriptor)
+        for imported in descriptor.get('imports') or []:
+            if isinstance(imported, dict):
+                imported = imported.get('file')
+            if isinstance(imported, str) and '://' not in imported:
+                pending.append(posixpath.normpath(posixpath.join(
+                    posixpath.dirname(name),
+                    imported
+                )))
+    return descriptors
+
+
+def package_identity(
+        path: str,
+        identity: Sequence[tuple] = VNF_IDENTITY
+) -> Dict[str, str]:
+    """
+        Descriptor identity (e.g. `vnfdId`, `vnfProvider`, `vnfdVersion`)
+        read from the entry definitions of the CSAR at `path`, and the
+        descriptors they import: the SOL001 property of a node template,
+        or else the default of a node type property. Missing values, or
+        packages which are not a CSAR, give an incomplete identity.
+    """
+    try:
+        with zipfile.ZipFile(path) as package:
+            entry = entry_definitions(package)
+            if entry is None:
+                return {}
+            descriptors = _read_descriptors(package, entry)
+    except (zipfile.BadZipFile, KeyError, OSError):
+        return {}
+    templates = {}
+    defaults = {}
+    for descriptor in descriptors:
+        topology = descriptor.get('topology_template')
+        if isinstance(topology, dict):
+            for name, value in _properties(
+                    topology.get('node_templates'),
+                    lambda value: value
+            ):
+                templates.setdefault(name, value)
+        for name, value in _properties(
+                descriptor.get('node_types'),
+                lambda value: value.get('default')
+                if isinstance(value, dict) else None
+        ):
+            defaults.setdefault(name, value)
+    found = {}
+    for attribute, prop in identity:
+        value = templates.get(prop, defaults.get(prop))
+        if value is not None:
+            found[attribute] = value
+    return found
+
+
+def _package_checksums(package: Any) -> Iterable[str]:
+    checksum = package.get('checksum')
+    if isinstance(checksum, dict) and str(
+            checksum.get('algorithm', 'SHA-256')
+    ).upper().replace('-', '') == 'SHA256':
+        yield str(checksum.get('hash', '')).lower()
+    user_defined_data = package.get('userDefinedData')
+    if isinstance(user_defined_data, dict) and \
+            user_defined_data.get(CHECKSUM_KEY):
+        yield str(user_defined_data[CHECKSUM_KEY]).lower()
+
+
+def duplicate_match(
+        package: Any,
+        checksum: Optional[str] = None,
+        identity: Optional[Dict[str, str]] = None,
+        exclude_id: Optional[str] = None
+) -> Optional[str]:
+    """
+        How `package` holds the same content, see `find_duplicate`:
+        `checksum`, `identity` or None. `checksum` is in lower case.
+    """
+    if package.get('id') == exclude_id:
+        return None
+    if checksum and checksum in _package_checksums(package):
+        return 'checksum'
+    if identity and all(
+            package.get(attribute) == value
+            for attribute, value in identity.items()
+    ):
+        return 'identity'
+    return None
+
+
+def find_duplicate(
+        packages: Iterable[Any],
+        checksum: Optional[str] = None,
+        identity: Optional[Dict[str, str]] = None,
+        exclude_id: Optional[str] = None
+) -> Optional[Any]:
+    """
+        First of `packages` holding the same content: whose checksum
+        (or `CHECKSUM_KEY` tag) is `checksum`, or otherwise whose
+        descriptor has all attributes of `identity`. An incomplete
+        identity matches nothing. `exclude_id` is skipped, e.g. the
+        package just created for the upload.
+    """
+    checksum = checksum.lower() if checksum else None
+    by_identity = None
+    for package in packages:
+        match = duplicate_match(package, checksum, identity, exclude_id)
+        if match == 'checksum':
+            return package
+        if match == 'identity' and by_identity is None:
+            by_identity = package
+    return by_identity
@@ -3,19 +3,74 @@
     ~~~~~~~~
     ETSI SOL Virtual Network Function interface.
 """
-import json
+import contextvars
 import os
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-from mano_sdk.package_base import PackageBaseClass
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk.csar import validate_csar
+from mano_sdk.dedup import (CHECKSUM_KEY, VNF_IDENTITY, find_duplicate,
+                            hash_files)
+from mano_sdk.models import VnfPkgInfo
+from mano_sdk.package_base import (ONBOARDING_POLL_INTERVAL,
+                                   ONBOARDING_TIMEOUT, AsyncPackageMixin,
+                                   PackageBaseClass)
+from mano_sdk.query import Selector, build_query_params
+from mano_sdk.resource_base import AsyncResourceMixin
+from mano_sdk.upload import Progress, upload_file
 
 SOL_FUNCTION_PACKAGE_PATH = "/sol/vnfpkgm/v1/vnf_packages"
 
 
+class OnboardResult:
+    """
+        Outcome of onboarding one package with `bulk_onboard`.
+
+        :param dict spec: The spec given for the package.
+        :param str package_id: Id of the created package, None when
+            creation failed.
+        :param package: Package details once onboarded (and enabled).
+        :param str stage: Last stage reached: `create`, `upload`,
+            `onboarding`, `enable` or `done`.
+        :param Exception error: Error which stopped the package, None
+            when it was onboarded.
+        :param str checksum: SHA-256 of the file, with `deduplicate`.
+        :param bool reused: Whether an onboarded package with the same
+            content was reused instead of uploading the file.
+    """
+    __slots__ = ('spec', 'package_id', 'package', 'stage', 'error',
+                 'checksum', 'reused')
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self.package_id = None
+        self.package = None
+        self.stage = 'create'
+        self.error = None
+        self.checksum = None
+        self.reused = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.stage == 'done'
+
+    def __repr__(self):
+        return '<OnboardResult {} {} {}>'.format(
+            self.spec.get('file_name'),
+            self.package_id,
+            self.stage if self.error is None else repr(self.error)
+        )
+
+
 class FunctionPackage(PackageBaseClass):
     """
         ETSI SOL Virtual Network Function interface
     """
+    model_class = VnfPkgInfo
+    package_kind = 'Function package'
+    identity_attributes = VNF_IDENTITY
 
     def create(
             self,
@@ -31,22 +86,21 @@ class FunctionPackage(PackageBaseClass):
             data.update({
                 "tags": tags
             })
-        json_data = json.dumps(data) if data else ""
-        return self.client.post(
-            path=path,
-            data=json_data,
-            params="",
-            content_type=content_type
+        json_data = self.client.codec.dumps(data) if data else ""
+        return self._to_models(
+            self.client.post(
+                path=path,
+                data=json_data,
+                params="",
+                content_type=content_type
+            )
         )
 
-    def upload(
+    def _upload_args(
             self,
             function_id: str,
             file_name: str
     ) -> Dict[str, Any]:
-        """
-            Uploads function package content using `function_id`.
-        """
         script_dir = os.path.dirname(__file__)
         rel_path = file_name
         file_path = os.path.join(script_dir, rel_path)
@@ -58,15 +112,89 @@ class FunctionPackage(PackageBaseClass):
             SOL_FUNCTION_PACKAGE_PATH,
             function_id
         )
-        with open(file_path, 'rb') as data:
+        return {
+            'file_path': file_path,
+            'path': path,
+            'content_type': content_type
+        }
+
+    def upload(
+            self,
+            function_id: str,
+            file_name: str,
+            chunk_size: Optional[int] = None,
+            progress: Optional[Progress] = None,
+            validate: bool = False
+    ) -> Dict[str, Any]:
+        """
+            Uploads function package content using `function_id`.
+
+            The file is streamed, with `progress(sent, total)` called as
+            it is read. With `chunk_size` it is sent in resumable chunks
+            of that many bytes, see `mano_sdk.upload.upload_file`. With
+            `validate` a CSAR is checked locally first, see
+            `mano_sdk.csar.validate_csar`.
+        """
+        upload_args = self._upload_args(function_id, file_name)
+        if validate:
+            validate_csar(upload_args['file_path'], 'vnf')
+        if chunk_size is not None or progress is not None:
+            return upload_file(
+                self.client,
+                upload_args['path'],
+                upload_args['file_path'],
+                upload_args['content_type'],
+                return_code=202,
+                chunk_size=chunk_size,
+                progress=progress
+            )
+        with open(upload_args['file_path'], 'rb') as data:
             return self.client.put(
-                path=path,
+                path=upload_args['path'],
                 data=data,
                 params="",
-                content_type=content_type,
+                content_type=upload_args['content_type'],
                 return_code=202
             )
 
+    def upload_from_uri(
+            self,
+            function_id: str,
+            uri: str,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            auth_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+            Makes the NFVO fetch function package (VNF) content from
+            `uri` itself (SOL005 `upload_from_uri`), so the content does
+            not go through the caller. `username` and `password` are
+            those of the artifact repository, sent with `auth_type`
+            (`BASIC` by default when they are given).
+        """
+        path = "{}/{}/package_content/upload_from_uri".format(
+            SOL_FUNCTION_PACKAGE_PATH,
+            function_id
+        )
+        data = {
+            "addressInformation": uri
+        }
+        if username:
+            data.update({
+                "authType": auth_type or "BASIC",
+                "userName": username,
+                "password": password
+            })
+        elif auth_type:
+            data["authType"] = auth_type
+        return self.client.post(
+            path=path,
+            data=self.client.codec.dumps(data),
+            params="",
+            content_type="application/json",
+            return_code=202
+        )
+
     def update(
             self,
             package_id: str,
@@ -84,7 +212,31 @@ class FunctionPackage(PackageBaseClass):
         }
         return self.client.patch(
             path=path,
-            data=json.dumps(data),
+            data=self.client.codec.dumps(data),
+            params="",
+            content_type="application/json",
+            return_code=200
+        )
+
+    def update_user_defined_data(
+            self,
+            package_id: str,
+            user_defined_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+            Merges `user_defined_data` into user defined data of
+            function package (VNF).
+        """
+        path = "{}/{}".format(
+            SOL_FUNCTION_PACKAGE_PATH,
+            package_id
+        )
+        data = {
+            "userDefinedData": user_defined_data
+        }
+        return self.client.patch(
+            path=path,
+            data=self.client.codec.dumps(data),
             params="",
             content_type="application/json",
             return_code=200
@@ -107,35 +259,383 @@ class FunctionPackage(PackageBaseClass):
         )
 
     def list(
-            self
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
     ) -> Dict[str, Any]:
         """
             Lists all function packages (VNFs).
+
+            Accepts SOL013 filter and attribute selectors, see
+            `mano_sdk.query.build_query_params`.
         """
         path = SOL_FUNCTION_PACKAGE_PATH
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
+        )
+
+    def iter_packages(
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+            Iterates over all function packages (VNFs), fetching them
+            one page at a time.
+
+            Accepts SOL013 filter and attribute selectors, see
+            `mano_sdk.query.build_query_params`.
+        """
+        return self._iter_models(
+            self.client.iter_items(
+                path=SOL_FUNCTION_PACKAGE_PATH,
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
         )
 
     def get(
             self,
-            package_id: str
+            package_id: str,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False,
+            cache: bool = True
     ) -> Dict[str, Any]:
         """
             Gets the details of function package (VFN).
+
+            Accepts SOL013 attribute selectors, see
+            `mano_sdk.query.build_query_params`; `cache=False`
+            skips the response cache.
         """
         path = "{}/{}".format(
             SOL_FUNCTION_PACKAGE_PATH,
             package_id
         )
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    fields=fields,
+                    exclude_fields=exclude_fields,
+                    exclude_default=exclude_default,
+                    all_fields=all_fields
+                ),
+                content_type="application/json",
+                return_code=200,
+                cache=cache
+            )
         )
+
+    def _iter_onboarded(self) -> Iterator[Any]:
+        return self.iter_packages(
+            filter="(eq,onboardingState,ONBOARDED)",
+            fields=["checksum", "userDefinedData"],
+            exclude_default=True
+        )
+
+    def _package_paths(self, results: List[OnboardResult]) -> List[str]:
+        return [
+            self._upload_args('', result.spec['file_name'])['file_path']
+            for result in results
+        ]
+
+    @staticmethod
+    def _match_onboarded(
+            results: List[OnboardResult],
+            checksums: Dict[str, str],
+            paths: List[str],
+            onboarded: List[Any]
+    ) -> None:
+        """
+            Sets the checksum of each result, and marks those whose
+            content is already `onboarded` as reused.
+        """
+        for result, path in zip(results, paths):
+            result.checksum = checksums[path]
+            existing = find_duplicate(onboarded, result.checksum)
+            if existing is not None:
+                result.package_id = existing['id']
+                result.reused = True
+
+    def _onboard_steps(
+            self,
+            result: OnboardResult,
+            poll_interval: float,
+            timeout: float
+    ) -> Iterator[Tuple[Callable, tuple]]:
+        """
+            Onboards `result` as a generator of the calls to make, each
+            with its arguments. The outcome of each call is sent back,
+            or its error thrown in, by `_onboard` of the sync or async
+            flavor.
+        """
+        spec = result.spec
+        if result.reused:
+            result.package = yield self.get, (result.package_id,)
+            result.stage = 'done'
+            return
+        created = yield self.create, (spec.get('tags'), "application/json")
+        result.package_id = created.get('id')
+        result.stage = 'upload'
+        yield self.upload, (result.package_id, spec['file_name'])
+        result.stage = 'onboarding'
+        package = yield self.wait_onboarded, (
+            result.package_id,
+            poll_interval,
+            timeout
+        )
+        if result.checksum is not None:
+            # Best effort, NFVOs may refuse the change.
+            try:
+                yield self.update_user_defined_data, (
+                    result.package_id,
+                    {CHECKSUM_KEY: result.checksum}
+                )
+            except NonRecoverableError as e:
+                self.client.logger.warning(
+                    'Checksum of package {} not recorded: {}'.format(
+                        result.package_id,
+                        e
+                    )
+                )
+        result.stage = 'enable'
+        operational_state = spec.get('operational_state', 'ENABLED')
+        if operational_state and \
+                package.get('operationalState') != operational_state:
+            yield self.update, (result.package_id, operational_state)
+        result.package = yield self.get, (result.package_id,)
+        result.stage = 'done'
+
+    def _onboard(
+            self,
+            result: OnboardResult,
+            poll_interval: float,
+            timeout: float
+    ) -> None:
+        steps = self._onboard_steps(result, poll_interval, timeout)
+        resume, outcome = steps.send, None
+        while True:
+            try:
+                call, args = resume(outcome)
+            except StopIteration:
+                return
+            try:
+                resume, outcome = steps.send, call(*args)
+            except Exception as e:
+                resume, outcome = steps.throw, e
+
+    def _onboarded_result(
+            self,
+            result: OnboardResult,
+            error: Optional[Exception] = None
+    ) -> OnboardResult:
+        """
+            Records and logs the end of onboarding of `result`.
+        """
+        if error is not None:
+            result.error = error
+            self.client.logger.error(
+                'Onboarding of {} failed at {}: {}'.format(
+                    repr(result.spec.get('file_name')),
+                    result.stage,
+                    error
+                )
+            )
+        else:
+            self.client.logger.info(
+                'Onboarded {} as function package {}.'.format(
+                    repr(result.spec['file_name']),
+                    repr(result.package_id)
+                )
+            )
+        return result
+
+    def _onboard_result(
+            self,
+            result: OnboardResult,
+            poll_interval: float,
+            timeout: float
+    ) -> OnboardResult:
+        try:
+            self._onboard(result, poll_interval, timeout)
+        except Exception as e:
+            return self._onboarded_result(result, e)
+        return self._onboarded_result(result)
+
+    def bulk_onboard(
+            self,
+            specs: List[Dict[str, Any]],
+            max_workers: int = 4,
+            poll_interval: float = ONBOARDING_POLL_INTERVAL,
+            timeout: float = ONBOARDING_TIMEOUT,
+            deduplicate: bool = False
+    ) -> List[OnboardResult]:
+        """
+            Onboards many function packages (VNFs), at most `max_workers`
+            at a time: each is created, uploaded, polled until onboarded
+            and set to its operational state.
+
+            With `deduplicate` the files are hashed in parallel first,
+            and a package already onboarded with the same SHA-256 is
+            reused instead; uploaded ones are tagged with their checksum
+            (see `mano_sdk.dedup`).
+
+            Each spec is a dict with `file_name`, optional `tags` and
+            optional `operational_state` (`ENABLED` by default, None to
+            leave it as the NFVO set it). A failing package does not
+            stop the others; results are in the order of `specs`, with
+            the error and stage reached of failed ones. Workers share
+            the pooled connections of the endpoint, see `pool_maxsize`.
+        """
+        results = [OnboardResult(spec) for spec in specs]
+        if deduplicate:
+            paths = self._package_paths(results)
+            self._match_onboarded(
+                results,
+                hash_files(paths, max_workers),
+                paths,
+                list(self._iter_onboarded())
+            )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                # Deadline and trace span follow each package.
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._onboard_result,
+                    result,
+                    poll_interval,
+                    timeout
+                )
+                for result in results
+            ]
+        return [future.result() for future in futures]
+
+
+class AsyncFunctionPackage(
+        AsyncResourceMixin,
+        AsyncPackageMixin,
+        FunctionPackage
+):
+    """
+        Asyncio ETSI SOL Virtual Network Function interface
+    """
+
+    async def upload(
+            self,
+            function_id: str,
+            file_name: str,
+            validate: bool = False
+    ) -> Dict[str, Any]:
+        """
+            Uploads function package content using `function_id`.
+        """
+        upload_args = self._upload_args(function_id, file_name)
+        if validate:
+            validate_csar(upload_args['file_path'], 'vnf')
+        with open(upload_args['file_path'], 'rb') as data:
+            return await self.client.put(
+                path=upload_args['path'],
+                data=data,
+                params="",
+                content_type=upload_args['content_type'],
+                return_code=202
+            )
+
+    async def _onboard(
+            self,
+            result: OnboardResult,
+            poll_interval: float,
+            timeout: float
+    ) -> None:
+        steps = self._onboard_steps(result, poll_interval, timeout)
+        resume, outcome = steps.send, None
+        while True:
+            try:
+                call, args = resume(outcome)
+            except StopIteration:
+                return
+            try:
+                resume, outcome = steps.send, await call(*args)
+            except Exception as e:
+                resume, outcome = steps.throw, e
+
+    async def _onboard_result(
+            self,
+            result: OnboardResult,
+            poll_interval: float,
+            timeout: float,
+            semaphore: Any
+    ) -> OnboardResult:
+        async with semaphore:
+            try:
+                await self._onboard(result, poll_interval, timeout)
+            except Exception as e:
+                return self._onboarded_result(result, e)
+        return self._onboarded_result(result)
+
+    async def bulk_onboard(
+            self,
+            specs: List[Dict[str, Any]],
+            max_workers: int = 4,
+            poll_interval: float = ONBOARDING_POLL_INTERVAL,
+            timeout: float = ONBOARDING_TIMEOUT,
+            deduplicate: bool = False
+    ) -> List[OnboardResult]:
+        """
+            Onboards many function packages (VNFs) concurrently, at most
+            `max_workers` at a time, see `FunctionPackage.bulk_onboard`.
+        """
+        import asyncio
+        results = [OnboardResult(spec) for spec in specs]
+        if deduplicate:
+            paths = self._package_paths(results)
+            self._match_onboarded(
+                results,
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    hash_files,
+                    paths,
+                    max_workers
+                ),
+                paths,
+                [package async for package in self._iter_onboarded()]
+            )
+        semaphore = asyncio.Semaphore(max_workers)
+        return list(await asyncio.gather(*[
+            self._onboard_result(
+                result,
+                poll_interval,
+                timeout,
+                semaphore
+            )
+            for result in results
+        ]))
@@ -0,0 +1,375 @@
+"""
+    mano_sdk.metrics
+    ~~~~~~~~
+    Per-request metrics hooks and exporters.
+"""
+import atexit
+import bisect
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Collections whose next path segment is a resource id.
+SOL_COLLECTIONS = frozenset([
+    'vnf_packages',
+    'ns_descriptors',
+    'pnf_descriptors',
+    'ns_instances',
+    'ns_lcm_op_occs',
+    'vnf_instances',
+    'vnf_lcm_op_occs',
+    'subscriptions'
+])
+ID_PATTERN = re.compile(
+    r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|\d+)$',
+    re.IGNORECASE
+)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0)
+LATENCIES = ('connect', 'ttfb', 'total')
+METRICS_FILE = 'mano_sdk.prom'
+# Name, type and help of the exported metrics.
+FAMILIES = (
+    ('mano_sdk_requests_total', 'counter', 'Requests sent to the NFVO.'),
+    ('mano_sdk_bytes_total', 'counter',
+     'Body bytes exchanged with the NFVO.'),
+    ('mano_sdk_request_seconds', 'histogram',
+     'Request latency by phase (connect, ttfb, total).')
+)
+
+Number = Union[int, float]
+
+_exporters: Dict[str, 'PrometheusTextfileExporter'] = {}
+_exporters_lock = threading.Lock()
+
+
+def template_path(path: str) -> str:
+    """
+        Replaces resource ids of a SOL path with `{id}`, e.g.
+        `/sol/nslcm/v1/ns_instances/{id}/instantiate`.
+    """
+    segments = path.split('/')
+    for index in range(1, len(segments)):
+        if segments[index] and (
+                segments[index - 1] in SOL_COLLECTIONS or
+                ID_PATTERN.match(segments[index])):
+            segments[index] = '{id}'
+    return '/'.join(segments)
+
+
+class RequestMetrics:
+    """
+        Measurements of a single request attempt.
+
+        :param str method: HTTP method.
+        :param str path: Templated path, see `template_path`.
+        :param int status: Status code, None on connection errors.
+        :param float connect: Seconds spent opening the connection, 0
+            when a pooled one was reused.
+        :param float ttfb: Seconds until response headers arrived.
+        :param float total: Seconds until the body was read, or until
+            headers arrived for streamed responses.
+        :param int request_bytes: Size of the request body.
+        :param int response_bytes: Size of the (decoded) response body,
+            None when streamed without `Content-Length`.
+    """
+    __slots__ = ('endpoint_url', 'method', 'path', 'status', 'connect',
+                 'ttfb', 'total', 'request_bytes', 'response_bytes')
+
+    def __init__(
+            self,
+            endpoint_url: str,
+            method: str,
+            path: str,
+            status: Optional[int],
+            connect: Optional[float],
+            ttfb: Optional[float],
+            total: float,
+            request_bytes: Optional[int],
+            response_bytes: Optional[int]
+    ):
+        self.endpoint_url = endpoint_url
+        self.method = method
+        self.path = path
+        self.status = status
+        self.connect = connect
+        self.ttfb = ttfb
+        self.total = total
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+
+    def __repr__(self):
+        return '<RequestMetrics {} {} {} {:.3f}s>'.format(
+            self.method,
+            self.path,
+            self.status,
+            self.total
+        )
+
+
+class Histogram:
+    """
+        Cumulative histogram of observed values.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+            `(le, count)` pairs, the last one being `+Inf`.
+        """
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets + (None,), self.counts):
+            total += count
+            pairs.append(('+Inf' if bound is None else repr(bound), total))
+        return pairs
+
+
+class InMemoryHistogram:
+    """
+        Hook keeping every `RequestMetrics` and a histogram of each
+        latency per method and path. Meant for tests and benchmarks.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.records: List[RequestMetrics] = []
+        self.histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            self.records.append(metrics)
+            for latency in LATENCIES:
+                value = getattr(metrics, latency)
+                if value is None:
+                    continue
+                key = (metrics.method, metrics.path, latency)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(self.buckets)
+                self.histograms[key].observe(value)
+
+    def histogram(
+            self,
+            method: str,
+            path: str,
+            latency: str = 'total'
+    ) -> Optional[Histogram]:
+        return self.histograms.get((method, path, latency))
+
+    def count(self, method: Optional[str] = None,
+              path: Optional[str] = None,
+              status: Optional[int] = None) -> int:
+        return len([
+            metrics for metrics in self.records
+            if (method is None or metrics.method == method) and
+            (path is None or metrics.path == path) and
+            (status is None or metrics.status == status)
+        ])
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+            self.histograms.clear()
+
+
+def _labels(labels: Dict[str, Any]) -> str:
+    return ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+        )
+        for name, value in labels.items()
+    )
+
+
+class PrometheusTextfileExporter:
+    """
+        Hook aggregating requests into Prometheus metrics written to
+        `path` in the text exposition format, e.g. for the node exporter
+        textfile collector. At most every `flush_interval` seconds and
+        when the process exits, what was counted since the last flush is
+        added to the file under a lock, which is then replaced
+        atomically: processes of the host share one file and one set of
+        series, whose counters survive restarts.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            const_labels: Optional[Dict[str, str]] = None,
+            buckets: Iterable[float] = DEFAULT_BUCKETS,
+            flush_interval: float = 5.0
+    ):
+        self.path = path
+        self.const_labels = dict(const_labels or {})
+        self.buckets = tuple(buckets)
+        self.flush_interval = flush_interval
+        self._requests: Dict[Tuple[str, str, str], int] = OrderedDict()
+        self._bytes: Dict[Tuple[str, str, str], int] = OrderedDict()
+        self._latencies: Dict[Tuple[str, str, str], Histogram] = \
+            OrderedDict()
+        self._flushed: Dict[str, Number] = {}
+        self._flushed_at = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def __call__(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            status = str(metrics.status or 'error')
+            key = (metrics.method, metrics.path, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            for direction, size in (('request', metrics.request_bytes),
+                                    ('response', metrics.response_bytes)):
+                if size:
+                    key = (metrics.method, metrics.path, direction)
+                    self._bytes[key] = self._bytes.get(key, 0) + size
+            for latency in LATENCIES:
+                value = getattr(metrics, latency)
+                if value is None:
+                    continue
+                key = (metrics.method, metrics.path, latency)
+                if key not in self._latencies:
+                    self._latencies[key] = Histogram(self.buckets)
+                self._latencies[key].observe(value)
+            due = time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def samples(self) -> Dict[str, Number]:
+        """
+            Value of each series, e.g. `mano_sdk_requests_total{...}`,
+            counted by this exporter.
+        """
+        samples: Dict[str, Number] = OrderedDict()
+        with self._lock:
+            for (method, path, status), count in self._requests.items():
+                samples['mano_sdk_requests_total{{{}}}'.format(
+                    self._label_values(method=method, path=path,
+                                       status=status)
+                )] = count
+            for (method, path, direction), size in self._bytes.items():
+                samples['mano_sdk_bytes_total{{{}}}'.format(
+                    self._label_values(method=method, path=path,
+                                       direction=direction)
+                )] = size
+            for (method, path, phase), histogram in self._latencies.items():
+                labels = self._label_values(method=method, path=path,
+                                            phase=phase)
+                for le, count in histogram.cumulative():
+                    samples['mano_sdk_request_seconds_bucket{{{},le="{}"}}'
+                            .format(labels, le)] = count
+                samples['mano_sdk_request_seconds_sum{{{}}}'.format(
+                    labels
+                )] = histogram.sum
+                samples['mano_sdk_request_seconds_count{{{}}}'.format(
+                    labels
+                )] = histogram.count
+        return samples
+
+    def render(self) -> str:
+        """
+            Metrics in the Prometheus text exposition format.
+        """
+        return render_samples(self.samples())
+
+    def _label_values(self, **labels) -> str:
+        return _labels(dict(self.const_labels, **labels))
+
+    def flush(self) -> None:
+        """
+            Adds what was counted since the last flush to the metrics
+            file now.
+        """
+        with self._flush_lock:
+            samples = self.samples()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    with open(self.path) as metrics_file:
+                        merged = parse_samples(metrics_file.read())
+                except FileNotFoundError:
+                    merged = OrderedDict()
+                for series, value in samples.items():
+                    merged[series] = merged.get(series, 0) + value - \
+                        self._flushed.get(series, 0)
+                temp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+                with open(temp_path, 'w') as metrics_file:
+                    metrics_file.write(render_samples(merged))
+                os.replace(temp_path, self.path)
+            finally:
+                # Closing the descriptor releases the lock.
+                os.close(fd)
+            self._flushed = samples
+            self._flushed_at = time.monotonic()
+
+
+def parse_samples(content: str) -> Dict[str, Number]:
+    """
+        Value of each series of a text exposition file.
+    """
+    samples: Dict[str, Number] = OrderedDict()
+    for line in content.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        series, _, value = line.rpartition(' ')
+        try:
+            samples[series] = int(value)
+        except ValueError:
+            samples[series] = float(value)
+    return samples
+
+
+def render_samples(samples: Dict[str, Number]) -> str:
+    """
+        Text exposition of `samples`, grouped by metric family.
+    """
+    lines = []
+    for family, metric_type, description in FAMILIES:
+        lines.extend([
+            '# HELP {} {}'.format(family, description),
+            '# TYPE {} {}'.format(family, metric_type)
+        ])
+        for series, value in samples.items():
+            name = series.partition('{')[0]
+            if name == family or name.startswith(family + '_') and \
+                    metric_type == 'histogram':
+                lines.append('{} {!r}'.format(series, value))
+    return '\n'.join(lines) + '\n'
+
+
+def get_prometheus_exporter(path: str, **options) -> \
+        PrometheusTextfileExporter:
+    """
+        Returns the exporter writing `path`, creating it on first use.
+    """
+    with _exporters_lock:
+        exporter = _exporters.get(path)
+        if exporter is None:
+            exporter = PrometheusTextfileExporter(path, **options)
+            _exporters[path] = exporter
+        return exporter
@@ -0,0 +1,253 @@
+"""
+    mano_sdk.models
+    ~~~~~~~~
+    Slotted models of SOL005 objects.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+
+class Model:
+    """
+        Base of SOL object models.
+
+        Attributes listed in `_fields` (attribute name, SOL key) are
+        stored in slots when the object is built. Other keys stay in a
+        dict, nested ones being decoded by `Nested` only when accessed.
+        `raw` gives back the object as a dict, like the SDK returned it
+        before models; keys the object came without are left out of it,
+        explicit nulls are kept.
+    """
+    __slots__ = ('_extra', '_decoded', '_absent')
+    _fields: Tuple[Tuple[str, str], ...] = ()
+    _attributes: Dict[str, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._attributes = {key: attribute for attribute, key in cls._fields}
+
+    def __init__(self, data: Dict[str, Any]):
+        absent = ()
+        for attribute, key in self._fields:
+            if key in data:
+                setattr(self, attribute, data[key])
+            else:
+                setattr(self, attribute, None)
+                absent += (key,)
+        # Built anew rather than popped from a copy, which would keep
+        # the table sized for every key.
+        extra = {
+            key: value for key, value in data.items()
+            if key not in self._attributes
+        }
+        self._extra = extra or None
+        self._decoded = None
+        # Keys of `_fields` missing from `data`, usually none.
+        self._absent = absent or None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        absent = self._absent or ()
+        data = {
+            key: getattr(self, attribute)
+            for attribute, key in self._fields
+            if key not in absent
+        }
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+            Value of a SOL key, e.g. one without attribute.
+        """
+        attribute = self._attributes.get(key)
+        if attribute is None:
+            return (self._extra or {}).get(key, default)
+        if self._absent and key in self._absent:
+            return default
+        return getattr(self, attribute)
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return type(self) is type(other) and self.raw == other.raw
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, getattr(self, 'id', ''))
+
+
+class Nested:
+    """
+        Attribute decoding the SOL key `key` with `factory` on first
+        access and keeping the result.
+    """
+
+    def __init__(self, key: str, factory: Optional[Callable] = None):
+        self.key = key
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        decoded = instance._decoded
+        if decoded is not None and self.name in decoded:
+            return decoded[self.name]
+        value = (instance._extra or {}).get(self.key)
+        if value is not None and self.factory is not None:
+            value = self.factory(value)
+        if decoded is None:
+            decoded = instance._decoded = {}
+        decoded[self.name] = value
+        return value
+
+
+def _many(model: Type[Model]) -> Callable[[List[Dict[str, Any]]], List]:
+    def decode(items):
+        return [model(item) for item in items]
+    return decode
+
+
+class Checksum(Model):
+    __slots__ = ('algorithm', 'hash')
+    _fields = (('algorithm', 'algorithm'), ('hash', 'hash'))
+
+
+class ProblemDetails(Model):
+    __slots__ = ('type', 'title', 'status', 'detail', 'instance')
+    _fields = (('type', 'type'), ('title', 'title'), ('status', 'status'),
+               ('detail', 'detail'), ('instance', 'instance'))
+
+
+class VnfPackageSoftwareImageInfo(Model):
+    __slots__ = ('id', 'name', 'provider', 'version', 'container_format',
+                 'disk_format', 'size', 'image_path')
+    _fields = (('id', 'id'), ('name', 'name'), ('provider', 'provider'),
+               ('version', 'version'),
+               ('container_format', 'containerFormat'),
+               ('disk_format', 'diskFormat'), ('size', 'size'),
+               ('image_path', 'imagePath'))
+    checksum = Nested('checksum', Checksum)
+
+
+class VnfPackageArtifactInfo(Model):
+    __slots__ = ('artifact_path', 'artifact_uri', 'is_manifest')
+    _fields = (('artifact_path', 'artifactPath'),
+               ('artifact_uri', 'artifactURI'),
+               ('is_manifest', 'isManifest'))
+    checksum = Nested('checksum', Checksum)
+
+
+class VnfPkgInfo(Model):
+    """
+        Information of an individual VNF package (SOL005 VnfPkgInfo).
+    """
+    __slots__ = ('id', 'vnfd_id', 'vnf_provider', 'vnf_product_name',
+                 'vnf_software_version', 'vnfd_version', 'onboarding_state',
+                 'operational_state', 'usage_state')
+    _fields = (('id', 'id'), ('vnfd_id', 'vnfdId'),
+               ('vnf_provider', 'vnfProvider'),
+               ('vnf_product_name', 'vnfProductName'),
+               ('vnf_software_version', 'vnfSoftwareVersion'),
+               ('vnfd_version', 'vnfdVersion'),
+               ('onboarding_state', 'onboardingState'),
+               ('operational_state', 'operationalState'),
+               ('usage_state', 'usageState'))
+    checksum = Nested('checksum', Checksum)
+    software_images = Nested(
+        'softwareImages',
+        _many(VnfPackageSoftwareImageInfo)
+    )
+    additional_artifacts = Nested(
+        'additionalArtifacts',
+        _many(VnfPackageArtifactInfo)
+    )
+    onboarding_failure_details = Nested(
+        'onboardingFailureDetails',
+        ProblemDetails
+    )
+    user_defined_data = Nested('userDefinedData')
+    links = Nested('_links')
+
+
+class NsdInfo(Model):
+    """
+        Information of an individual NS descriptor (SOL005 NsdInfo).
+    """
+    __slots__ = ('id', 'nsd_id', 'nsd_name', 'nsd_version', 'nsd_designer',
+                 'nsd_invariant_id', 'nsd_onboarding_state',
+                 'nsd_operational_state', 'nsd_usage_state')
+    _fields = (('id', 'id'), ('nsd_id', 'nsdId'), ('nsd_name', 'nsdName'),
+               ('nsd_version', 'nsdVersion'),
+               ('nsd_designer', 'nsdDesigner'),
+               ('nsd_invariant_id', 'nsdInvariantId'),
+               ('nsd_onboarding_state', 'nsdOnboardingState'),
+               ('nsd_operational_state', 'nsdOperationalState'),
+               ('nsd_usage_state', 'nsdUsageState'))
+    vnf_pkg_ids = Nested('vnfPkgIds')
+    pnfd_info_ids = Nested('pnfdInfoIds')
+    nested_nsd_info_ids = Nested('nestedNsdInfoIds')
+    onboarding_failure_details = Nested(
+        'onboardingFailureDetails',
+        ProblemDetails
+    )
+    user_defined_data = Nested('userDefinedData')
+    links = Nested('_links')
+
+
+class NsInstance(Model):
+    """
+        Information of an individual NS instance (SOL005 NsInstance).
+    """
+    __slots__ = ('id', 'ns_instance_name', 'ns_instance_description',
+                 'nsd_id', 'nsd_info_id', 'flavour_id', 'ns_state')
+    _fields = (('id', 'id'), ('ns_instance_name', 'nsInstanceName'),
+               ('ns_instance_description', 'nsInstanceDescription'),
+               ('nsd_id', 'nsdId'), ('nsd_info_id', 'nsdInfoId'),
+               ('flavour_id', 'flavourId'), ('ns_state', 'nsState'))
+    vnf_instance = Nested('vnfInstance')
+    pnf_info = Nested('pnfInfo')
+    virtual_link_info = Nested('virtualLinkInfo')
+    nested_ns_instance_id = Nested('nestedNsInstanceId')
+    ns_scale_status = Nested('nsScaleStatus')
+    links = Nested('_links')
+
+
+class NsLcmOpOcc(Model):
+    """
+        NS lifecycle management operation occurrence (SOL005 NsLcmOpOcc).
+    """
+    __slots__ = ('id', 'operation_state', 'state_entered_time',
+                 'ns_instance_id', 'lcm_operation_type', 'start_time',
+                 'is_automatic_invocation', 'is_cancel_pending',
+                 'cancel_mode')
+    _fields = (('id', 'id'), ('operation_state', 'operationState'),
+               ('state_entered_time', 'statusEnteredTime'),
+               ('ns_instance_id', 'nsInstanceId'),
+               ('lcm_operation_type', 'lcmOperationType'),
+               ('start_time', 'startTime'),
+               ('is_automatic_invocation', 'isAutomaticInvocation'),
+               ('is_cancel_pending', 'isCancelPending'),
+               ('cancel_mode', 'cancelMode'))
+    error = Nested('error', ProblemDetails)
+    operation_params = Nested('operationParams')
+    resource_changes = Nested('resourceChanges')
+    links = Nested('_links')
+
+
+def to_models(
+        model: Type[Model],
+        data: Union[Dict[str, Any], List[Dict[str, Any]], None]
+) -> Union[Model, List[Model], None]:
+    """
+        Wraps a SOL object, or a list of them, into `model`. Anything
+        else (e.g. an empty body) is returned as is.
+    """
+    if isinstance(data, list):
+        return [model(item) if isinstance(item, dict) else item
+                for item in data]
+    if isinstance(data, dict) and data:
+        return model(data)
+    return data
@@ -3,38 +3,20 @@
     ~~~~~~~~
     ETSI SOL Network Instance interface.
 """
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
-from mano_sdk.client import Client, Credentials
+from mano_sdk.models import NsInstance
+from mano_sdk.query import Selector, build_query_params
+from mano_sdk.resource_base import AsyncResourceMixin, ResourceBaseClass
 
 SOL_NETWORK_INSTANCE_PATH = "/sol/nslcm/v1/ns_instances"
 
 
-class NetworkInstance:
+class NetworkInstance(ResourceBaseClass):
     """
         ETSI SOL Network Instance interface
     """
-
-    def __init__(
-            self,
-            endpoint_url: str,
-            logger: Any,
-            username=None,
-            password=None,
-            token=None
-    ):
-
-        self.cred = Credentials(
-            username=username,
-            password=password,
-            token=token
-        )
-        self.client = Client(
-            credentials=self.cred,
-            endpoint_url=endpoint_url,
-            logger=logger
-        )
+    model_class = NsInstance
 
     def create(
             self,
@@ -58,11 +40,13 @@ class NetworkInstance:
                 "tags": tags
             })
         path = SOL_NETWORK_INSTANCE_PATH
-        return self.client.post(
-            path=path,
-            data=json.dumps(data),
-            params="",
-            content_type=content_type
+        return self._to_models(
+            self.client.post(
+                path=path,
+                data=self.client.codec.dumps(data),
+                params="",
+                content_type=content_type
+            )
         )
 
     def instantiate(
@@ -78,7 +62,7 @@ class NetworkInstance:
             data = {
                 "additionalParamsForNs": additional_params
             }
-            data = json.dumps(data)
+            data = self.client.codec.dumps(data)
         else:
             data = ""
         params = {
@@ -120,7 +104,7 @@ class NetworkInstance:
 
         return self.client.post(
             path=path,
-            data=json.dumps(body),
+            data=self.client.codec.dumps(body),
             params="",
             content_type="application/json"
         )
@@ -161,33 +145,102 @@ class NetworkInstance:
         )
 
     def list(
-            self
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
     ) -> Dict[str, Any]:
         """
            Lists all network instances.
+
+           Accepts SOL013 filter and attribute selectors, see
+           `mano_sdk.query.build_query_params`.
         """
         path = SOL_NETWORK_INSTANCE_PATH
-        return self.client.get(
-            path=path,
-            data="",
-            params=""
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                )
+            )
+        )
+
+    def iter_instances(
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+           Iterates over all network instances, fetching them one
+           page at a time.
+
+           Accepts SOL013 filter and attribute selectors, see
+           `mano_sdk.query.build_query_params`.
+        """
+        return self._iter_models(
+            self.client.iter_items(
+                path=SOL_NETWORK_INSTANCE_PATH,
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
         )
 
     def get(
             self,
-            ns_instance_id: str
+            ns_instance_id: str,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False,
+            cache: bool = True
     ) -> Dict[str, Any]:
         """
            Gets the details of a network instance.
+
+           Accepts SOL013 attribute selectors, see
+           `mano_sdk.query.build_query_params`; `cache=False`
+           skips the response cache.
         """
         path = "{}/{}".format(
             SOL_NETWORK_INSTANCE_PATH,
             ns_instance_id
         )
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    fields=fields,
+                    exclude_fields=exclude_fields,
+                    exclude_default=exclude_default,
+                    all_fields=all_fields
+                ),
+                content_type="application/json",
+                return_code=200,
+                cache=cache
+            )
         )
+
+
+class AsyncNetworkInstance(AsyncResourceMixin, NetworkInstance):
+    """
+        Asyncio ETSI SOL Network Instance interface
+    """
@@ -3,68 +3,120 @@
     ~~~~~~~~
     ETSI SOL Network Operation interface.
 """
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
 
-from mano_sdk.client import Client, Credentials
+from mano_sdk.models import NsLcmOpOcc
+from mano_sdk.query import Selector, build_query_params
+from mano_sdk.resource_base import AsyncResourceMixin, ResourceBaseClass
 
 SOL_NETWORK_OPERATION_PATH = "/sol/nslcm/v1/ns_lcm_op_occs"
 
 
-class NetworkOperation:
+class NetworkOperation(ResourceBaseClass):
     """
         ETSI SOL Network Operation interface.
     """
-
-    def __init__(
-            self,
-            endpoint_url: str,
-            logger: Any,
-            username=None,
-            password=None,
-            token=None
-    ):
-
-        self.cred = Credentials(
-            username=username,
-            password=password,
-            token=token
-        )
-        self.client = Client(
-            credentials=self.cred,
-            endpoint_url=endpoint_url,
-            logger=logger
-        )
+    model_class = NsLcmOpOcc
 
     def get(
             self,
-            operation_id: str
+            operation_id: str,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False,
+            cache: bool = True
     ) -> Dict[str, Any]:
         """
            Get the details of network operation.
+
+           Accepts SOL013 attribute selectors, see
+           `mano_sdk.query.build_query_params`; `cache=False`
+           skips the response cache.
         """
         path = "{}/{}".format(
             SOL_NETWORK_OPERATION_PATH,
             operation_id
         )
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    fields=fields,
+                    exclude_fields=exclude_fields,
+                    exclude_default=exclude_default,
+                    all_fields=all_fields
+                ),
+                content_type="application/json",
+                return_code=200,
+                cache=cache
+            )
         )
 
     def list(
-            self
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
     ) -> Dict[str, Any]:
         """
             Lists all network operations.
+
+            Accepts SOL013 filter and attribute selectors, see
+            `mano_sdk.query.build_query_params`.
         """
         path = SOL_NETWORK_OPERATION_PATH
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
+        )
+
+    def iter_operations(
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+            Iterates over all network operations, fetching them one
+            page at a time.
+
+            Accepts SOL013 filter and attribute selectors, see
+            `mano_sdk.query.build_query_params`.
+        """
+        return self._iter_models(
+            self.client.iter_items(
+                path=SOL_NETWORK_OPERATION_PATH,
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
         )
+
+
+class AsyncNetworkOperation(AsyncResourceMixin, NetworkOperation):
+    """
+        Asyncio ETSI SOL Network Operation interface.
+    """
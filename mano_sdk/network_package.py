@@ -3,11 +3,16 @@
     ~~~~~~~~
    ETSI SOL Network Service Descriptor interface.
 """
-import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
-from mano_sdk.package_base import PackageBaseClass
+from mano_sdk.csar import validate_csar
+from mano_sdk.dedup import NSD_IDENTITY
+from mano_sdk.models import NsdInfo
+from mano_sdk.package_base import AsyncPackageMixin, PackageBaseClass
+from mano_sdk.query import Selector, build_query_params
+from mano_sdk.resource_base import AsyncResourceMixin
+from mano_sdk.upload import Progress, upload_file
 
 SOL_NETWORK_PACKAGE_PATH = "/sol/nsd/v1/ns_descriptors"
 
@@ -16,6 +21,10 @@ class NetworkPackage(PackageBaseClass):
     """
         ETSI SOL Network Service Descriptor interface.
     """
+    model_class = NsdInfo
+    onboarding_state = 'nsdOnboardingState'
+    package_kind = 'Network package'
+    identity_attributes = NSD_IDENTITY
 
     def create(
             self,
@@ -31,22 +40,21 @@ class NetworkPackage(PackageBaseClass):
             data = ({
                 "tags": tags
             })
-            json_data = json.dumps(data)
-        return self.client.post(
-            path=path,
-            data=json_data,
-            params="",
-            content_type=content_type
+            json_data = self.client.codec.dumps(data)
+        return self._to_models(
+            self.client.post(
+                path=path,
+                data=json_data,
+                params="",
+                content_type=content_type
+            )
         )
 
-    def upload(
+    def _upload_args(
             self,
             nsd_id: str,
             file_name: str
     ) -> Dict[str, Any]:
-        """
-            Uploads network package (NSD) content using `nsd_id`.
-        """
         script_dir = os.path.dirname(__file__)
         rel_path = file_name
         file_path = os.path.join(script_dir, rel_path)
@@ -55,15 +63,90 @@ class NetworkPackage(PackageBaseClass):
         else:
             content_type = "plain/text"
         path = SOL_NETWORK_PACKAGE_PATH + "/" + nsd_id + "/nsd_content"
-        with open(file_path, 'rb') as data:
+        return {
+            'file_path': file_path,
+            'path': path,
+            'content_type': content_type
+        }
+
+    def upload(
+            self,
+            nsd_id: str,
+            file_name: str,
+            chunk_size: Optional[int] = None,
+            progress: Optional[Progress] = None,
+            validate: bool = False
+    ) -> Dict[str, Any]:
+        """
+            Uploads network package (NSD) content using `nsd_id`.
+
+            The file is streamed, with `progress(sent, total)` called as
+            it is read. With `chunk_size` it is sent in resumable chunks
+            of that many bytes, see `mano_sdk.upload.upload_file`. With
+            `validate` a CSAR is checked locally first, see
+            `mano_sdk.csar.validate_csar`.
+        """
+        upload_args = self._upload_args(nsd_id, file_name)
+        if validate:
+            validate_csar(upload_args['file_path'], 'nsd')
+        if chunk_size is not None or progress is not None:
+            return upload_file(
+                self.client,
+                upload_args['path'],
+                upload_args['file_path'],
+                upload_args['content_type'],
+                return_code=200,
+                chunk_size=chunk_size,
+                progress=progress
+            )
+        with open(upload_args['file_path'], 'rb') as data:
             return self.client.put(
-                path=path,
+                path=upload_args['path'],
                 data=data,
                 params="",
-                content_type=content_type,
+                content_type=upload_args['content_type'],
                 return_code=200
             )
 
+    def upload_from_uri(
+            self,
+            nsd_id: str,
+            uri: str,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            auth_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+            Makes the NFVO fetch network package (NSD) content from `uri`
+            itself, so the content does not go through the caller.
+            SOL005 defines `upload_from_uri` for VNF packages only; the
+            same request is sent to `nsd_content/upload_from_uri` for
+            NFVOs supporting it for NSDs too. See
+            `FunctionPackage.upload_from_uri` for the credentials.
+        """
+        path = "{}/{}/nsd_content/upload_from_uri".format(
+            SOL_NETWORK_PACKAGE_PATH,
+            nsd_id
+        )
+        data = {
+            "addressInformation": uri
+        }
+        if username:
+            data.update({
+                "authType": auth_type or "BASIC",
+                "userName": username,
+                "password": password
+            })
+        elif auth_type:
+            data["authType"] = auth_type
+        return self.client.post(
+            path=path,
+            data=self.client.codec.dumps(data),
+            params="",
+            content_type="application/json",
+            return_code=202
+        )
+
     def update(
             self,
             nsd_id: str,
@@ -81,7 +164,31 @@ class NetworkPackage(PackageBaseClass):
         }
         return self.client.patch(
             path=path,
-            data=json.dumps(data),
+            data=self.client.codec.dumps(data),
+            params="",
+            content_type="application/json",
+            return_code=200
+        )
+
+    def update_user_defined_data(
+            self,
+            nsd_id: str,
+            user_defined_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+            Merges `user_defined_data` into user defined data of
+            network package (NSD).
+        """
+        path = "{}/{}".format(
+            SOL_NETWORK_PACKAGE_PATH,
+            nsd_id
+        )
+        data = {
+            "userDefinedData": user_defined_data
+        }
+        return self.client.patch(
+            path=path,
+            data=self.client.codec.dumps(data),
             params="",
             content_type="application/json",
             return_code=200
@@ -104,35 +211,136 @@ class NetworkPackage(PackageBaseClass):
         )
 
     def list(
-            self
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
     ) -> Dict[str, Any]:
         """
             Lists all network packages (NSDs).
+
+            Accepts SOL013 filter and attribute selectors, see
+            `mano_sdk.query.build_query_params`.
         """
         path = SOL_NETWORK_PACKAGE_PATH
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
+        )
+
+    def iter_packages(
+            self,
+            filter: Selector = None,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+            Iterates over all network packages (NSDs), fetching them
+            one page at a time.
+
+            Accepts SOL013 filter and attribute selectors, see
+            `mano_sdk.query.build_query_params`.
+        """
+        return self._iter_models(
+            self.client.iter_items(
+                path=SOL_NETWORK_PACKAGE_PATH,
+                params=build_query_params(
+                    filter,
+                    fields,
+                    exclude_fields,
+                    exclude_default,
+                    all_fields
+                ),
+                content_type="application/json",
+                return_code=200
+            )
         )
 
     def get(
             self,
-            nsd_id: str
+            nsd_id: str,
+            fields: Selector = None,
+            exclude_fields: Selector = None,
+            exclude_default: bool = False,
+            all_fields: bool = False,
+            cache: bool = True
     ) -> Dict[str, Any]:
         """
             Gets the details of network package (NSD).
+
+            Accepts SOL013 attribute selectors, see
+            `mano_sdk.query.build_query_params`; `cache=False`
+            skips the response cache.
         """
         path = "{}/{}".format(
             SOL_NETWORK_PACKAGE_PATH,
             nsd_id
         )
-        return self.client.get(
-            path=path,
-            data="",
-            params="",
-            content_type="application/json",
-            return_code=200
+        return self._to_models(
+            self.client.get(
+                path=path,
+                data="",
+                params=build_query_params(
+                    fields=fields,
+                    exclude_fields=exclude_fields,
+                    exclude_default=exclude_default,
+                    all_fields=all_fields
+                ),
+                content_type="application/json",
+                return_code=200,
+                cache=cache
+            )
+        )
+
+    def _iter_onboarded(self) -> Iterator[Any]:
+        return self.iter_packages(
+            filter="(eq,nsdOnboardingState,ONBOARDED)",
+            fields=["userDefinedData"],
+            exclude_default=True
         )
+
+
+class AsyncNetworkPackage(
+        AsyncResourceMixin,
+        AsyncPackageMixin,
+        NetworkPackage
+):
+    """
+        Asyncio ETSI SOL Network Service Descriptor interface.
+    """
+
+    async def upload(
+            self,
+            nsd_id: str,
+            file_name: str,
+            validate: bool = False
+    ) -> Dict[str, Any]:
+        """
+            Uploads network package (NSD) content using `nsd_id`.
+        """
+        upload_args = self._upload_args(nsd_id, file_name)
+        if validate:
+            validate_csar(upload_args['file_path'], 'nsd')
+        with open(upload_args['file_path'], 'rb') as data:
+            return await self.client.put(
+                path=upload_args['path'],
+                data=data,
+                params="",
+                content_type=upload_args['content_type'],
+                return_code=200
+            )
@@ -0,0 +1,265 @@
+"""
+    mano_sdk.oauth
+    ~~~~~~~~
+    SOL013 OAuth 2.0 client credentials grant with a shared token cache.
+"""
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from cloudify.exceptions import NonRecoverableError, RecoverableError
+from requests.auth import AuthBase, HTTPBasicAuth
+
+from mano_sdk.deadline import cap_timeout
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DEFAULT_TOKEN_DIR = os.path.join(tempfile.gettempdir(), 'mano-sdk', 'tokens')
+# Lifetime assumed when the token response has no `expires_in`.
+DEFAULT_TOKEN_LIFETIME = 300
+DEFAULT_REFRESH_MARGIN = 60.0
+TOKEN_TIMEOUT = 30
+
+_auths: Dict[tuple, 'OAuth2ClientCredentials'] = {}
+_auths_lock = threading.Lock()
+
+
+class OAuth2ClientCredentials(AuthBase):
+    """
+        Authenticates requests with a bearer token obtained from
+        `token_url` with the client credentials grant.
+
+        Tokens are cached in memory and in a file under `token_dir` keyed
+        by endpoint and client id, so all agent processes of the host
+        share them. A token is refreshed `refresh_margin` seconds before
+        it expires; concurrent refreshes are serialized with a file lock,
+        so only one process fetches while the others reuse its token.
+        `token_dir` must belong to the current user and is made private
+        to it; token files other users could have written are ignored.
+    """
+
+    def __init__(
+            self,
+            endpoint_url: str,
+            token_url: str,
+            client_id: str,
+            client_secret: str,
+            scope: Optional[str] = None,
+            token_dir: str = DEFAULT_TOKEN_DIR,
+            refresh_margin: float = DEFAULT_REFRESH_MARGIN
+    ):
+        self.endpoint_url = endpoint_url.rstrip('/')
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.token_dir = token_dir
+        self.refresh_margin = refresh_margin
+        self.path = os.path.join(
+            token_dir,
+            hashlib.sha256(
+                '{} {}'.format(self.endpoint_url, client_id).encode('utf-8')
+            ).hexdigest()
+        )
+        self._token: Optional[Dict[str, Any]] = None
+        self._rejected: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        request.headers['Authorization'] = 'Bearer {}'.format(
+            self.access_token()
+        )
+        return request
+
+    def _is_fresh(self, token: Optional[Dict[str, Any]]) -> bool:
+        return token is not None and (
+            token['access_token'] != self._rejected and
+            token['expires_at'] - self.refresh_margin > time.time()
+        )
+
+    def fresh_token(self) -> Optional[str]:
+        """
+            Returns the token held in memory if it is still fresh, None
+            when `access_token` would have to read or fetch one.
+        """
+        with self._lock:
+            if not self._is_fresh(self._token):
+                return None
+            return self._token['access_token']
+
+    def access_token(self) -> str:
+        """
+            Returns a token valid for at least `refresh_margin` seconds.
+        """
+        with self._lock:
+            if not self._is_fresh(self._token):
+                self._token = self._load_or_fetch()
+            return self._token['access_token']
+
+    def invalidate(self) -> None:
+        """
+            Forgets the token, e.g. after the NFVO rejected it. The token
+            file is left alone: the next refresh replaces it under the
+            lock, unless another process already did.
+        """
+        with self._lock:
+            if self._token is not None:
+                self._rejected = self._token['access_token']
+            self._token = None
+
+    def _check_token_dir(self) -> None:
+        """
+            Creates `token_dir` and makes sure only the current user can
+            read or replace the tokens it holds.
+        """
+        os.makedirs(self.token_dir, mode=0o700, exist_ok=True)
+        status = os.lstat(self.token_dir)
+        if not stat.S_ISDIR(status.st_mode) or (
+                hasattr(os, 'geteuid') and status.st_uid != os.geteuid()):
+            raise NonRecoverableError(
+                'Token directory {} is not a directory owned by the '
+                'current user.'.format(repr(self.token_dir))
+            )
+        if stat.S_IMODE(status.st_mode) != 0o700:
+            os.chmod(self.token_dir, 0o700)
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        flags = os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0)
+        try:
+            fd = os.open(self.path, flags)
+        except OSError:
+            return None
+        with os.fdopen(fd) as token_file:
+            status = os.fstat(fd)
+            if stat.S_IMODE(status.st_mode) & 0o077 or (
+                    hasattr(os, 'geteuid') and
+                    status.st_uid != os.geteuid()):
+                return None
+            try:
+                token = json.load(token_file)
+            except ValueError:
+                return None
+        if not isinstance(token, dict) or 'access_token' not in token:
+            return None
+        return token
+
+    def _write(self, token: Dict[str, Any]) -> None:
+        temp_path = '{}.{}'.format(self.path, os.getpid())
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as token_file:
+            json.dump(token, token_file)
+        os.replace(temp_path, self.path)
+
+    def _load_or_fetch(self) -> Dict[str, Any]:
+        self._check_token_dir()
+        token = self._read()
+        if self._is_fresh(token):
+            return token
+        fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            # Another process may have refreshed it while we waited.
+            token = self._read()
+            if not self._is_fresh(token):
+                token = self._fetch()
+                self._write(token)
+            return token
+        finally:
+            os.close(fd)
+
+    def _fetch(self) -> Dict[str, Any]:
+        data = {'grant_type': 'client_credentials'}
+        if self.scope:
+            data['scope'] = self.scope
+        requested_at = time.time()
+        try:
+            response = requests.post(
+                self.token_url,
+                data=data,
+                auth=HTTPBasicAuth(self.client_id, self.client_secret),
+                headers={'Accept': 'application/json'},
+                timeout=cap_timeout(TOKEN_TIMEOUT)
+            )
+        except requests.exceptions.RequestException as e:
+            raise RecoverableError(
+                'Token request to {} failed: {}'.format(
+                    repr(self.token_url),
+                    e
+                )
+            )
+        if response.status_code >= 500:
+            raise RecoverableError(
+                'Token endpoint {} failed with status code {}.'.format(
+                    repr(self.token_url),
+                    response.status_code
+                )
+            )
+        if response.status_code != requests.codes.ok:
+            raise NonRecoverableError(
+                'Token request to {} rejected with status code {}: {}'
+                .format(
+                    repr(self.token_url),
+                    response.status_code,
+                    response.text
+                )
+            )
+        try:
+            body = response.json()
+            return {
+                'access_token': body['access_token'],
+                'expires_at': requested_at + float(
+                    body.get('expires_in') or DEFAULT_TOKEN_LIFETIME
+                )
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise NonRecoverableError(
+                'Invalid token response from {}: {}: {}'.format(
+                    repr(self.token_url),
+                    type(e).__name__,
+                    e
+                )
+            )
+
+
+def get_oauth2_auth(
+        endpoint_url: str,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        **options
+) -> OAuth2ClientCredentials:
+    """
+        Returns the token provider shared by clients of `endpoint_url`
+        and `client_id`, creating it on first use.
+    """
+    key = (endpoint_url.rstrip('/'), token_url, client_id, client_secret)
+    with _auths_lock:
+        auth = _auths.get(key)
+        if auth is None:
+            auth = OAuth2ClientCredentials(
+                endpoint_url,
+                token_url,
+                client_id,
+                client_secret,
+                **options
+            )
+            _auths[key] = auth
+        return auth
+
+
+def clear_oauth2_auths() -> None:
+    """
+        Forgets in-memory tokens. Token files are kept.
+    """
+    with _auths_lock:
+        _auths.clear()
@@ -1,27 +1,32 @@
-from .client import Client, Credentials
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
 
+from cloudify.exceptions import NonRecoverableError, RecoverableError
 
-class PackageBaseClass:
+from .deadline import check_deadline
+from .dedup import duplicate_match, find_duplicate
+from .resource_base import ResourceBaseClass
 
-    def __init__(
-            self,
-            endpoint_url,
-            logger,
-            username=None,
-            password=None,
-            token=None
-    ):
-
-        self.cred = Credentials(
-            username=username,
-            password=password,
-            token=token
-        )
-        self.client = Client(
-            credentials=self.cred,
-            endpoint_url=endpoint_url,
-            logger=logger
-        )
+ONBOARDING_POLL_INTERVAL = 5.0
+ONBOARDING_TIMEOUT = 1800.0
+# Complex attributes read while polling onboarding.
+ONBOARDING_FIELDS = [
+    "onboardingFailureDetails"
+]
+# Onboarding states of a package whose content was already sent, or
+# is being fetched by the NFVO.
+ONBOARDING_PENDING_STATES = [
+    "UPLOADING",
+    "PROCESSING"
+]
+
+
+class PackageBaseClass(ResourceBaseClass):
+    # Attribute holding the onboarding state, and name in messages.
+    onboarding_state = 'onboardingState'
+    package_kind = 'Package'
+    # Descriptor attributes identifying the content, see mano_sdk.dedup.
+    identity_attributes = ()
 
     def create(self, tags, content_type):
         """Creates a resource."""
@@ -46,3 +51,169 @@ class PackageBaseClass:
     def get(self, package_id):
         """Gets a resource."""
         raise NotImplementedError()
+
+    def _iter_onboarded(self) -> Iterator[Any]:
+        """Iterates over onboarded packages."""
+        raise NotImplementedError()
+
+    def _duplicate_query(
+            self,
+            checksum: Optional[str],
+            identity: Optional[Dict[str, str]]
+    ) -> Optional[Tuple[Optional[str], Optional[Dict[str, str]]]]:
+        """
+            Returns the `checksum` and `identity` to match onboarded
+            packages with, or None when nothing can match: an identity
+            without all `identity_attributes` is ignored.
+        """
+        if identity is not None and \
+                len(identity) < len(self.identity_attributes):
+            identity = None
+        if not checksum and not identity:
+            return None
+        return checksum.lower() if checksum else None, identity
+
+    def find_onboarded(
+            self,
+            checksum: Optional[str] = None,
+            identity: Optional[Dict[str, str]] = None,
+            exclude_id: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+            Onboarded package holding the same content, matched by
+            SHA-256 `checksum` or by descriptor `identity` (see
+            `mano_sdk.dedup`), or None.
+        """
+        query = self._duplicate_query(checksum, identity)
+        if query is None:
+            return None
+        return find_duplicate(
+            self._iter_onboarded(),
+            *query,
+            exclude_id=exclude_id
+        )
+
+    def check_onboarding(self, package_id: str, package: Any) -> str:
+        """
+            Returns the onboarding state of `package`, a response of
+            `get`, and raises when onboarding failed.
+        """
+        state = package.get(self.onboarding_state)
+        if state == 'ERROR':
+            raise NonRecoverableError(
+                '{} {} failed onboarding: {}'.format(
+                    self.package_kind,
+                    repr(package_id),
+                    package.get('onboardingFailureDetails')
+                )
+            )
+        return state
+
+    def _onboarded(
+            self,
+            package_id: str,
+            package: Any,
+            expires_at: float
+    ) -> Optional[float]:
+        """
+            Returns None once `package` is onboarded, otherwise seconds to
+            wait before polling it again.
+        """
+        state = self.check_onboarding(package_id, package)
+        if state == 'ONBOARDED':
+            return None
+        wait = expires_at - time.monotonic()
+        if wait <= 0:
+            raise RecoverableError(
+                '{} {} still {} after onboarding timeout.'.format(
+                    self.package_kind,
+                    repr(package_id),
+                    state
+                )
+            )
+        left = check_deadline(
+            'polling onboarding of {}'.format(repr(package_id))
+        )
+        return min(wait, left if left is not None else wait)
+
+    def wait_onboarded(
+            self,
+            package_id: str,
+            poll_interval: float = ONBOARDING_POLL_INTERVAL,
+            timeout: float = ONBOARDING_TIMEOUT
+    ) -> Any:
+        """
+            Polls the package until it is onboarded and returns it.
+            Raises when onboarding fails or takes longer than `timeout`
+            seconds.
+        """
+        expires_at = time.monotonic() + timeout
+        while True:
+            package = self.get(
+                package_id,
+                fields=ONBOARDING_FIELDS,
+                exclude_default=True,
+                cache=False
+            )
+            wait = self._onboarded(package_id, package, expires_at)
+            if wait is None:
+                return package
+            time.sleep(min(poll_interval, wait))
+
+
+class AsyncPackageMixin:
+    """
+        Asynchronous versions of `PackageBaseClass` helpers.
+    """
+
+    async def find_onboarded(
+            self,
+            checksum: Optional[str] = None,
+            identity: Optional[Dict[str, str]] = None,
+            exclude_id: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+            Onboarded package holding the same content, see
+            `PackageBaseClass.find_onboarded`. Listing stops at the
+            first package with the same checksum.
+        """
+        query = self._duplicate_query(checksum, identity)
+        if query is None:
+            return None
+        by_identity = None
+        packages = self._iter_onboarded()
+        try:
+            async for package in packages:
+                match = duplicate_match(package, *query, exclude_id)
+                if match == 'checksum':
+                    return package
+                if match == 'identity' and by_identity is None:
+                    by_identity = package
+        finally:
+            await packages.aclose()
+        return by_identity
+
+    async def wait_onboarded(
+            self,
+            package_id: str,
+            poll_interval: float = ONBOARDING_POLL_INTERVAL,
+            timeout: float = ONBOARDING_TIMEOUT
+    ) -> Any:
+        """
+            Polls the package until it is onboarded and returns it.
+            Raises when onboarding fails or takes longer than `timeout`
+            seconds.
+        """
+        import asyncio
+        expires_at = time.monotonic() + timeout
+        while True:
+            package = await self.get(
+                package_id,
+                fields=ONBOARDING_FIELDS,
+                exclude_default=True,
+                cache=False
+            )
+            wait = self._onboarded(package_id, package, expires_at)
+            if wait is None:
+                return package
+            await asyncio.sleep(min(poll_interval, wait))
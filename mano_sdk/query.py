@@ -0,0 +1,65 @@
+"""
+    mano_sdk.query
+    ~~~~~~~~
+    ETSI SOL013 attribute-based filtering and attribute selectors.
+"""
+from typing import Dict, Iterable, Optional, Union
+
+from cloudify.exceptions import NonRecoverableError
+
+Selector = Union[str, Iterable[str], None]
+
+
+def _join(value: Selector, separator: str) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value or None
+    return separator.join(value) or None
+
+
+def build_query_params(
+        filter: Selector = None,
+        fields: Selector = None,
+        exclude_fields: Selector = None,
+        exclude_default: bool = False,
+        all_fields: bool = False
+) -> Union[str, Dict[str, str]]:
+    """
+        Builds query parameters of a SOL013 list/get request.
+
+        :param filter: Filter expression(s), e.g.
+            `(eq,operationalState,ENABLED)`. Several expressions are
+            joined with `;`, i.e. all of them must match.
+        :param fields: Complex attributes to include in addition to the
+            default ones.
+        :param exclude_fields: Complex attributes to exclude.
+        :param bool exclude_default: Exclude attributes the NFVO marks as
+            excluded by default. May be combined with `fields`.
+        :param bool all_fields: Include all attributes. Cannot be combined
+            with other attribute selectors.
+
+        Returns `""` when nothing is selected, so requests stay unchanged.
+    """
+    params = {}
+    filter = _join(filter, ';')
+    fields = _join(fields, ',')
+    exclude_fields = _join(exclude_fields, ',')
+    if all_fields and (fields or exclude_fields or exclude_default):
+        raise NonRecoverableError(
+            'all_fields cannot be combined with other attribute selectors.'
+        )
+    if exclude_fields and (fields or exclude_default):
+        raise NonRecoverableError(
+            'exclude_fields cannot be combined with fields or '
+            'exclude_default.'
+        )
+    if filter:
+        params['filter'] = filter
+    if all_fields:
+        params['all_fields'] = ''
+    if fields:
+        params['fields'] = fields
+    if exclude_fields:
+        params['exclude_fields'] = exclude_fields
+    if exclude_default:
+        params['exclude_default'] = ''
+    return params or ""
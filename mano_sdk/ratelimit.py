@@ -0,0 +1,128 @@
+"""
+    mano_sdk.ratelimit
+    ~~~~~~~~
+    Token bucket rate limiter shared by processes of the same host.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+DEFAULT_STATE_DIR = os.path.join(tempfile.gettempdir(), 'mano-sdk')
+
+_rate_limiters: Dict[str, 'RateLimiter'] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+class RateLimiter:
+    """
+        Token bucket holding up to `burst` tokens, refilled with `rate`
+        tokens per second. Every request takes a token.
+
+        The bucket lives in a small file under `state_dir`, updated under
+        an exclusive `flock`, so all agent processes sending requests to
+        the endpoint draw from the same bucket. Where `fcntl` is missing
+        the bucket is only shared by threads of the process.
+
+        A request is never refused: the bucket goes into debt and the
+        caller is told how long to wait for its turn, which keeps
+        concurrent callers in order.
+
+        :param str key: Bucket name, usually the endpoint url.
+        :param float rate: Requests per second.
+        :param float burst: Requests which may be sent at once after an
+            idle period, defaults to `rate`.
+        :param str state_dir: Directory of bucket files.
+    """
+
+    def __init__(
+            self,
+            key: str,
+            rate: float,
+            burst: Optional[float] = None,
+            state_dir: str = DEFAULT_STATE_DIR
+    ):
+        if rate <= 0:
+            raise ValueError('rate must be positive.')
+        self.key = key
+        self.rate = float(rate)
+        self.burst = float(burst or rate)
+        self.state_dir = state_dir
+        self.path = os.path.join(
+            state_dir,
+            'bucket-{}'.format(
+                hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+            )
+        )
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+            Takes a token and returns seconds to wait before using it.
+        """
+        with self._lock:
+            os.makedirs(self.state_dir, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                now = time.time()
+                tokens = self._refill(os.read(fd, 64), now) - 1
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, '{!r} {!r}'.format(tokens, now).encode('ascii'))
+            finally:
+                # Closing the descriptor releases the lock.
+                os.close(fd)
+        return max(0.0, -tokens / self.rate)
+
+    def _refill(self, state: bytes, now: float) -> float:
+        try:
+            tokens, updated_at = (float(value) for value in state.split())
+        except ValueError:
+            return self.burst
+        # Clocks going backwards must not hand out extra tokens.
+        elapsed = max(0.0, now - updated_at)
+        return min(self.burst, tokens + elapsed * self.rate)
+
+    def acquire(self) -> float:
+        """
+            Waits for a token, returns seconds waited.
+        """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+def get_rate_limiter(
+        endpoint_url: str,
+        rate: float,
+        burst: Optional[float] = None,
+        state_dir: str = DEFAULT_STATE_DIR
+) -> RateLimiter:
+    """
+        Returns the limiter of `endpoint_url`, creating it on first use.
+    """
+    key = endpoint_url.rstrip('/')
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(key, rate, burst, state_dir)
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def clear_rate_limiters() -> None:
+    """
+        Forgets limiters of all endpoints. Bucket files are kept.
+    """
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
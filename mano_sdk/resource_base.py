@@ -0,0 +1,94 @@
+from .client import Client, Credentials
+from .models import to_models
+
+
+class _AsyncClientClass:
+    """
+        Resolves to `AsyncClient` on access, so synchronous users never
+        import asyncio and aiohttp machinery.
+    """
+
+    def __get__(self, instance, owner):
+        from .async_client import AsyncClient
+        return AsyncClient
+
+
+class ResourceBaseClass:
+    """
+        Common base of ETSI SOL interfaces.
+
+        Extra keyword arguments are passed to `client_class`, e.g.
+        `pool_maxsize`.
+
+        With `models`, SOL objects are returned as `model_class`
+        instances (see `mano_sdk.models`) instead of dicts.
+    """
+    client_class = Client
+    model_class = None
+
+    def __init__(
+            self,
+            endpoint_url,
+            logger,
+            username=None,
+            password=None,
+            token=None,
+            oauth2=None,
+            models=False,
+            **client_options
+    ):
+
+        self.cred = Credentials(
+            username=username,
+            password=password,
+            token=token,
+            oauth2=oauth2
+        )
+        self.client = self.client_class(
+            credentials=self.cred,
+            endpoint_url=endpoint_url,
+            logger=logger,
+            **client_options
+        )
+        self.models = models and self.model_class is not None
+
+    def _to_models(self, result):
+        if not self.models:
+            return result
+        return to_models(self.model_class, result)
+
+    def _iter_models(self, items):
+        if not self.models:
+            return items
+        return (self.model_class(item) for item in items)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes pooled connections of the endpoint."""
+        return self.client.close()
+
+
+class AsyncResourceMixin:
+    """
+        Turns an ETSI SOL interface into its asyncio version: requests
+        go through `AsyncClient`, so methods return awaitables.
+    """
+    client_class = _AsyncClientClass()
+
+    async def _to_models(self, result):
+        return super()._to_models(await result)
+
+    async def _iter_models(self, items):
+        async for item in items:
+            yield self.model_class(item) if self.models else item
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,146 @@
+"""
+    mano_sdk.retry
+    ~~~~~~~~
+    Retry policy for transient NFVO failures.
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+# The request was refused before being processed, so it is safe to send
+# it again whatever its method is.
+DEFAULT_REFUSED_STATUSES = (429, 503)
+DEFAULT_IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+class RetryPolicy:
+    """
+        Decides whether and when a failed request is sent again.
+
+        :param int max_attempts: Total number of attempts, 1 disables
+            retries.
+        :param float backoff_factor: Base delay in seconds, doubled on
+            each retry.
+        :param float backoff_max: Upper bound of a single delay.
+        :param bool jitter: Randomize delays ("full jitter") so parallel
+            operations do not retry in lockstep.
+        :param float retry_budget: Total seconds a request may spend
+            waiting between attempts.
+        :param retry_statuses: Status codes retried for idempotent methods.
+        :param refused_statuses: Status codes retried for any method.
+        :param idempotent_methods: Methods which are safe to send again.
+        :param bool respect_retry_after: Honor the `Retry-After` header.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 4,
+            backoff_factor: float = 0.05,
+            backoff_max: float = 2.0,
+            jitter: bool = True,
+            retry_budget: float = 10.0,
+            retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+            refused_statuses: Iterable[int] = DEFAULT_REFUSED_STATUSES,
+            idempotent_methods: Iterable[str] = DEFAULT_IDEMPOTENT_METHODS,
+            respect_retry_after: bool = True
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_budget = retry_budget
+        self.retry_statuses = frozenset(retry_statuses)
+        self.refused_statuses = frozenset(refused_statuses)
+        self.idempotent_methods = frozenset(
+            method.upper() for method in idempotent_methods
+        )
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(
+            self,
+            method: str,
+            status_code: Optional[int] = None
+    ) -> bool:
+        """
+            Checks if a request may be retried. `status_code` is None
+            for connection errors.
+        """
+        if status_code in self.refused_statuses:
+            return True
+        if method.upper() not in self.idempotent_methods:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def backoff(self, retry_number: int) -> float:
+        """
+            Delay before retry number `retry_number` (counted from 0).
+        """
+        delay = min(
+            self.backoff_max,
+            self.backoff_factor * (2 ** retry_number)
+        )
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+            Parses `Retry-After` given as seconds or as HTTP date.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def start(self) -> 'RetryState':
+        """
+            Starts tracking retries of a single request.
+        """
+        return RetryState(self)
+
+
+class RetryState:
+    """
+        Attempts and waiting time used so far by a single request.
+    """
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempt = 1
+        self.waited = 0.0
+
+    def next_delay(
+            self,
+            method: str,
+            status_code: Optional[int] = None,
+            headers: Optional[Any] = None
+    ) -> Optional[float]:
+        """
+            Returns seconds to wait before the next attempt, or None when
+            the request must not be retried.
+        """
+        policy = self.policy
+        if self.attempt >= policy.max_attempts:
+            return None
+        if not policy.is_retryable(method, status_code):
+            return None
+        delay = policy.backoff(self.attempt - 1)
+        if policy.respect_retry_after and headers is not None:
+            retry_after = policy.parse_retry_after(headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = retry_after
+        if self.waited + delay > policy.retry_budget:
+            return None
+        self.attempt += 1
+        self.waited += delay
+        return delay
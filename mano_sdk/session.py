@@ -0,0 +1,137 @@
+"""
+    mano_sdk.session
+    ~~~~~~~~
+    Keep-alive HTTP sessions pooled per endpoint and credentials.
+"""
+import atexit
+import threading
+import time
+from typing import Dict, Hashable, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+_sessions: Dict[Tuple[str, Hashable], requests.Session] = {}
+_sessions_lock = threading.Lock()
+_connect_times = threading.local()
+
+
+def _add_connect_time(seconds: float) -> None:
+    _connect_times.total = getattr(_connect_times, 'total', 0.0) + seconds
+
+
+def pop_connect_time() -> float:
+    """
+        Seconds the current thread spent opening connections (TCP and
+        TLS handshakes) since the previous call. 0 for reused ones.
+    """
+    seconds = getattr(_connect_times, 'total', 0.0)
+    _connect_times.total = 0.0
+    return seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+        Adapter timing connection set-up, see `pop_connect_time`.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+
+def _session_key(endpoint_url: str) -> str:
+    return endpoint_url.rstrip('/')
+
+
+def get_session(
+        endpoint_url: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        scope: Hashable = None
+) -> requests.Session:
+    """
+        Returns the keep-alive session shared by every client of
+        `endpoint_url` with the same `scope`, creating it on first use.
+        Clients give their credentials as `scope`, so cookies and other
+        auth state the NFVO sets are not shared across credentials.
+
+        Pool sizes only apply when the session is created, the first
+        client of an endpoint decides them.
+    """
+    key = (_session_key(endpoint_url), scope)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = TimedHTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+        return session
+
+
+def close_session(endpoint_url: str) -> None:
+    """
+        Closes pooled connections of `endpoint_url`, whatever their
+        scope. The next request to the endpoint opens a new session.
+    """
+    endpoint = _session_key(endpoint_url)
+    with _sessions_lock:
+        sessions = [
+            _sessions.pop(key) for key in list(_sessions)
+            if key[0] == endpoint
+        ]
+    for session in sessions:
+        session.close()
+
+
+def close_all_sessions() -> None:
+    """
+        Closes pooled connections of every endpoint.
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_all_sessions)
@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk import async_client, breaker, client
+from mano_sdk import function_package as fp
+from mano_sdk import metrics
+from mano_sdk import network_operation as no
+from mano_sdk import oauth, ratelimit
+
+
+class TestAsyncClient(IsolatedAsyncioTestCase):
+    USERNAME = "xxx"
+    PASSWORD = "yyy"
+    LOGGER = logging.getLogger()
+    FUNCTION_ID = "fc-034567decf2122745"
+    OPERATION_ID = "dp-00f03c1129c6c8bf8"
+
+    async def asyncSetUp(self) -> None:
+        self.requests = []
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self._handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.endpoint_url = str(self.server.make_url('')).rstrip('/')
+        self.cred = client.Credentials(
+            username=self.USERNAME,
+            password=self.PASSWORD
+        )
+        self.client = async_client.AsyncClient(
+            credentials=self.cred,
+            endpoint_url=self.endpoint_url,
+            logger=self.LOGGER
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def _handler(self, request):
+        self.requests.append(request)
+        if request.path == '/missing':
+            return web.Response(status=404, text='not found')
+        if request.path == '/empty':
+            return web.Response(status=204)
+        if request.path == '/pages':
+            marker = int(request.query.get('nextpage_opaque_marker', 0))
+            headers = {}
+            if marker < 2:
+                headers['Link'] = '<{}?nextpage_opaque_marker={}>; ' \
+                    'rel="next"'.format(request.path, marker + 1)
+            return web.json_response(
+                [{'id': str(marker * 2)}, {'id': str(marker * 2 + 1)}],
+                headers=headers
+            )
+        if request.path == '/xml_pages':
+            return web.Response(
+                text='<items><item><id>1</id></item>'
+                     '<item><id>2</id></item></items>',
+                content_type='application/xml'
+            )
+        if request.path == '/gzip':
+            response = web.json_response({
+                'encoding': request.headers.get('Content-Encoding'),
+                'accept': request.headers.get('Accept-Encoding'),
+                'body': await request.json()
+            })
+            response.enable_compression(web.ContentCoding.gzip)
+            return response
+        if request.path == fp.SOL_FUNCTION_PACKAGE_PATH:
+            return web.json_response([{'id': '1'}, {'id': '2'}])
+        if request.path == '/xml':
+            return web.Response(
+                text='<root><id>1</id></root>',
+                content_type='text/xml'
+            )
+        return web.json_response(
+            {'id': request.path.rsplit('/', 1)[-1]},
+            status=201 if request.method == 'POST' else 200
+        )
+
+    async def test_get(self):
+        response = await self.client.get('/path', "", {'dryRun': False})
+        self.assertEqual(response, {'id': 'path'})
+        self.assertEqual(self.requests[0].query['dryRun'], 'False')
+        self.assertTrue(
+            self.requests[0].headers['Authorization'].startswith('Basic ')
+        )
+
+    async def test_token(self):
+        self.cred.token = "zzz"
+        await self.client.post('/path', '{"tags": {}}')
+        self.assertEqual(
+            self.requests[0].headers['Authorization'],
+            'access_token zzz'
+        )
+
+    async def test_oauth2_token_fetched_off_loop(self):
+        token_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(token_dir.cleanup)
+        self.addCleanup(oauth.clear_oauth2_auths)
+        self.cred.oauth2 = {
+            'token_url': self.endpoint_url + '/token',
+            'client_id': 'cloudify',
+            'client_secret': 'secret',
+            'token_dir': token_dir.name
+        }
+        threads = []
+
+        def fetch():
+            threads.append(threading.current_thread())
+            return {'access_token': 'token1', 'expires_at': time.time() + 300}
+
+        with mock.patch.object(
+                oauth.OAuth2ClientCredentials,
+                '_fetch',
+                side_effect=fetch
+        ):
+            await self.client.get('/path', "")
+            await self.client.get('/path', "")
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertEqual(
+            self.requests[1].headers['Authorization'],
+            'Bearer token1'
+        )
+
+    async def test_shared_state_off_loop(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.addCleanup(breaker.clear_circuit_breakers)
+        self.addCleanup(ratelimit.clear_rate_limiters)
+        shared_client = async_client.AsyncClient(
+            credentials=self.cred,
+            endpoint_url=self.endpoint_url,
+            logger=self.LOGGER,
+            rate_limit={'rate': 100, 'state_dir': state_dir.name},
+            circuit_breaker={'state_dir': state_dir.name}
+        )
+        self.addAsyncCleanup(shared_client.close)
+        threads = []
+
+        def locked(func):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return func(*args, **kwargs)
+            return wrapper
+
+        with mock.patch.object(
+                ratelimit.RateLimiter,
+                'reserve',
+                locked(ratelimit.RateLimiter.reserve)
+        ), mock.patch.object(
+            breaker.CircuitBreaker,
+            '_shared_state',
+            locked(breaker.CircuitBreaker._shared_state)
+        ):
+            await shared_client.get('/path', "")
+        # Token taken, circuit checked and outcome recorded.
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.main_thread(), threads)
+
+    async def test_metrics(self):
+        histogram = metrics.InMemoryHistogram()
+        self.client.metrics_hooks.append(histogram)
+        await self.client.get('/path', "")
+        await self.client.get('/path', "")
+        first, second = histogram.records
+        self.assertEqual((first.method, first.status), ('GET', 200))
+        self.assertGreater(first.connect, 0)
+        self.assertEqual(second.connect, 0)
+        self.assertLessEqual(first.ttfb, first.total)
+        self.assertEqual(first.response_bytes, len(b'{"id": "path"}'))
+
+    async def test_compression(self):
+        self.client.compress_threshold = 10
+        body = {'additionalParamsForNs': {'key': 'value' * 10}}
+        response = await self.client.post(
+            '/gzip',
+            self.client.codec.dumps(body),
+            return_code=200
+        )
+        self.assertEqual(response['encoding'], 'gzip')
+        self.assertIn('gzip', response['accept'])
+        self.assertEqual(response['body'], body)
+
+    async def test_xml_response(self):
+        response = await self.client.get('/xml', "")
+        self.assertEqual(response, {'root': {'id': '1'}})
+
+    async def test_empty_response_code(self):
+        self.assertIsNone(await self.client.delete('/empty'))
+
+    async def test_http_error(self):
+        with self.assertRaises(NonRecoverableError):
+            await self.client.get('/missing', "")
+
+    async def test_transport_rejected(self):
+        with self.assertRaisesRegex(NonRecoverableError, 'transport'):
+            async_client.AsyncClient(
+                credentials=self.cred,
+                endpoint_url=self.endpoint_url,
+                logger=self.LOGGER,
+                transport={'mode': 'replay', 'cassette': 'exchanges.jsonl'}
+            )
+
+    async def test_no_credentials(self):
+        self.client.cred = client.Credentials()
+        with self.assertRaises(NonRecoverableError):
+            await self.client.get('/path', "")
+
+    async def test_concurrent_requests(self):
+        responses = await asyncio.gather(*[
+            self.client.get('/{}'.format(index), "")
+            for index in range(50)
+        ])
+        self.assertEqual(
+            [response['id'] for response in responses],
+            [str(index) for index in range(50)]
+        )
+
+    async def test_iter_items(self):
+        items = [item['id'] async for item in self.client.iter_items('/pages')]
+        self.assertEqual(items, [str(index) for index in range(6)])
+        self.assertEqual(len(self.requests), 3)
+
+    async def test_iter_items_xml(self):
+        items = [item async for item in self.client.iter_items('/xml_pages')]
+        self.assertEqual(items, [{'id': '1'}, {'id': '2'}])
+
+    async def test_async_resources(self):
+        async with fp.AsyncFunctionPackage(
+                endpoint_url=self.endpoint_url,
+                logger=self.LOGGER,
+                username=self.USERNAME,
+                password=self.PASSWORD
+        ) as function_package:
+            response = await function_package.get(self.FUNCTION_ID)
+        self.assertEqual(response, {'id': self.FUNCTION_ID})
+        async with no.AsyncNetworkOperation(
+                endpoint_url=self.endpoint_url,
+                logger=self.LOGGER,
+                username=self.USERNAME,
+                password=self.PASSWORD
+        ) as network_operation:
+            response = await network_operation.get(self.OPERATION_ID)
+        self.assertEqual(response, {'id': self.OPERATION_ID})
+        self.assertEqual(
+            self.requests[-1].path,
+            "{}/{}".format(no.SOL_NETWORK_OPERATION_PATH, self.OPERATION_ID)
+        )
+
+    async def test_async_models(self):
+        async with fp.AsyncFunctionPackage(
+                endpoint_url=self.endpoint_url,
+                logger=self.LOGGER,
+                username=self.USERNAME,
+                password=self.PASSWORD,
+                models=True
+        ) as function_package:
+            package = await function_package.get(self.FUNCTION_ID)
+            self.assertEqual(package.id, self.FUNCTION_ID)
+            ids = [package.id async for package in
+                   function_package.iter_packages()]
+        self.assertEqual(ids, ['1', '2'])
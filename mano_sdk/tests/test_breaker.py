@@ -0,0 +1,172 @@
+import logging
+import multiprocessing
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import requests
+import requests_mock
+from cloudify.exceptions import RecoverableError
+
+from mano_sdk import breaker
+from mano_sdk import client as client
+
+
+def _record_failure(state_dir):
+    return breaker.CircuitBreaker(
+        'https://nfvo',
+        failure_threshold=2,
+        state_dir=state_dir
+    ).record()
+
+
+class TestCircuitBreaker(TestCase):
+
+    def setUp(self) -> None:
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+        self.now = 100.0
+        patcher = mock.patch(
+            'mano_sdk.breaker.time.time',
+            lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = breaker.CircuitBreaker(
+            'https://nfvo',
+            failure_threshold=2,
+            recovery_timeout=10.0,
+            state_dir=self.state_dir
+        )
+
+    def test_opens_after_threshold(self):
+        self.assertIsNone(self.breaker.record())
+        self.assertEqual(self.breaker.state, breaker.CLOSED)
+        self.assertEqual(self.breaker.record(503), breaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.retry_after(), 10.0)
+
+    def test_success_resets_failures(self):
+        self.breaker.record()
+        self.breaker.record(404)
+        self.breaker.record()
+        self.assertEqual(self.breaker.state, breaker.CLOSED)
+
+    def test_half_open(self):
+        self.breaker.record()
+        self.breaker.record()
+        self.now += 10.0
+        self.assertEqual(self.breaker.state, breaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.record(200), breaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_half_open_failure_reopens(self):
+        self.breaker.record()
+        self.breaker.record()
+        self.now += 10.0
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.record(), breaker.OPEN)
+        self.assertEqual(
+            self.breaker.stats(),
+            {'state': breaker.OPEN, 'failures': 3, 'opened': 2,
+             'retry_after': 10.0}
+        )
+
+    def test_shared_by_endpoint(self):
+        self.addCleanup(breaker.clear_circuit_breakers)
+        shared = breaker.get_circuit_breaker(
+            'https://nfvo/',
+            state_dir=self.state_dir
+        )
+        self.assertIs(
+            breaker.get_circuit_breaker(
+                'https://nfvo',
+                state_dir=self.state_dir
+            ),
+            shared
+        )
+        shared.record()
+        self.assertEqual(
+            breaker.circuit_breaker_stats(self.state_dir),
+            {'https://nfvo': {'state': breaker.CLOSED, 'failures': 1,
+                              'opened': 0, 'retry_after': 0.0}}
+        )
+
+    def test_state_shared_by_breakers(self):
+        other = breaker.CircuitBreaker(
+            'https://nfvo',
+            failure_threshold=2,
+            state_dir=self.state_dir
+        )
+        self.breaker.record()
+        self.assertEqual(other.record(), breaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_state_shared_by_processes(self):
+        with multiprocessing.get_context('spawn').Pool(2) as pool:
+            results = [
+                pool.apply_async(_record_failure, (self.state_dir,))
+                for _ in range(2)
+            ]
+            outcomes = sorted(
+                [result.get(60) for result in results],
+                key=str
+            )
+        self.assertEqual(outcomes, [None, breaker.OPEN])
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(
+            breaker.circuit_breaker_stats(self.state_dir)[
+                'https://nfvo']['state'],
+            breaker.OPEN
+        )
+
+
+class TestClientCircuitBreaker(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    TOKEN = "zzz"
+    LOGGER = logging.getLogger()
+
+    def setUp(self) -> None:
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+        self.addCleanup(breaker.clear_circuit_breakers)
+        self.client = client.Client(
+            credentials=client.Credentials(token=self.TOKEN),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            retry_policy={'max_attempts': 1},
+            circuit_breaker={
+                'failure_threshold': 2,
+                'state_dir': self.state_dir
+            }
+        )
+
+    def test_fails_fast_when_open(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                exc=requests.exceptions.ConnectionError
+            )
+            for _ in range(2):
+                with self.assertRaises(RecoverableError):
+                    self.client.get('/path', "")
+            with self.assertRaisesRegex(RecoverableError, 'Circuit breaker'):
+                self.client.get('/path', "")
+            self.assertEqual(m.call_count, 2)
+        self.assertEqual(
+            breaker.circuit_breaker_stats(self.state_dir)[
+                self.ENDPOINT_URL]['state'],
+            breaker.OPEN
+        )
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(
+            client.Client(
+                credentials=client.Credentials(token=self.TOKEN),
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER
+            ).circuit_breaker
+        )
@@ -0,0 +1,281 @@
+import logging
+import time
+from unittest import TestCase, mock
+
+import requests_mock
+
+from mano_sdk import cache
+from mano_sdk import client as client
+
+
+class TestConditionalCache(TestCase):
+
+    def test_store_requires_validators(self):
+        conditional_cache = cache.ConditionalCache()
+        conditional_cache.store('key', {}, b'{}')
+        self.assertIsNone(conditional_cache.get('key'))
+        conditional_cache.store('key', {'ETag': '"v1"'}, b'{}')
+        self.assertEqual(
+            conditional_cache.get('key').headers(),
+            {'If-None-Match': '"v1"'}
+        )
+        conditional_cache.store('key', {}, b'{}')
+        self.assertIsNone(conditional_cache.get('key'))
+
+    def test_lru_eviction(self):
+        conditional_cache = cache.ConditionalCache(max_entries=2)
+        for key in ['a', 'b']:
+            conditional_cache.store(key, {'ETag': key}, b'{}')
+        conditional_cache.get('a')
+        conditional_cache.store('c', {'ETag': 'c'}, b'{}')
+        self.assertIsNotNone(conditional_cache.get('a'))
+        self.assertIsNone(conditional_cache.get('b'))
+        self.assertEqual(len(conditional_cache), 2)
+
+
+class TestClientConditionalCache(TestCase):
+    USERNAME = "xxx"
+    PASSWORD = "yyy"
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    BODY = {"id": "fc-034567decf2122745", "operationalState": "ENABLED"}
+
+    def setUp(self) -> None:
+        cache.clear_conditional_caches()
+        self.client = client.Client(
+            credentials=client.Credentials(
+                username=self.USERNAME,
+                password=self.PASSWORD
+            ),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+
+    def tearDown(self) -> None:
+        cache.clear_conditional_caches()
+
+    def test_not_modified_served_from_cache(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + '/path', [
+                {
+                    'json': self.BODY,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'ETag': '"v1"',
+                        'Last-Modified': 'Wed, 11 Jan 2023 07:16:29 GMT'
+                    }
+                },
+                {'status_code': 304}
+            ])
+            first = self.client.get('/path', '')
+            first['operationalState'] = 'DISABLED'
+            self.assertEqual(self.client.get('/path', ''), self.BODY)
+            self.assertNotIn('If-None-Match', m.request_history[0].headers)
+            self.assertEqual(
+                m.request_history[1].headers['If-None-Match'],
+                '"v1"'
+            )
+            self.assertEqual(
+                m.request_history[1].headers['If-Modified-Since'],
+                'Wed, 11 Jan 2023 07:16:29 GMT'
+            )
+
+    def test_shared_between_clients(self):
+        other_client = client.Client(
+            credentials=self.client.cred,
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        self.assertIs(
+            self.client.conditional_cache,
+            other_client.conditional_cache
+        )
+
+    def test_disabled(self):
+        self.client.conditional_cache_size = 0
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                json=self.BODY,
+                headers={'Content-Type': 'application/json', 'ETag': '"v1"'}
+            )
+            self.client.get('/path', '')
+            self.client.get('/path', '')
+            self.assertNotIn('If-None-Match', m.request_history[1].headers)
+
+    def test_mutation_not_cached(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'PATCH',
+                self.ENDPOINT_URL + '/path',
+                json=self.BODY,
+                headers={'Content-Type': 'application/json', 'ETag': '"v1"'}
+            )
+            self.client.patch('/path', '{}')
+        self.assertEqual(len(self.client.conditional_cache), 0)
+
+
+class TestResponseCache(TestCase):
+    PACKAGES_PATH = "/sol/vnfpkgm/v1/vnf_packages"
+    PACKAGE_PATH = "/sol/vnfpkgm/v1/vnf_packages/fc-034567decf2122745"
+
+    def test_ttl_per_resource_type(self):
+        response_cache = cache.ResponseCache(
+            default_ttl=5,
+            ttls={self.PACKAGES_PATH: 30, self.PACKAGE_PATH: 1}
+        )
+        self.assertEqual(response_cache.ttl(self.PACKAGES_PATH), 30)
+        self.assertEqual(response_cache.ttl(self.PACKAGE_PATH), 1)
+        self.assertEqual(
+            response_cache.ttl(self.PACKAGE_PATH + "/package_content"),
+            1
+        )
+        self.assertEqual(response_cache.ttl("/sol/nsd/v1/ns_descriptors"), 5)
+
+    def test_expiration(self):
+        response_cache = cache.ResponseCache(default_ttl=30, ttls={})
+        response_cache.store('key', self.PACKAGE_PATH, {}, b'{}')
+        self.assertIsNotNone(response_cache.get('key'))
+        with mock.patch('time.monotonic', return_value=time.monotonic() + 60):
+            self.assertIsNone(response_cache.get('key'))
+        self.assertEqual(response_cache.stats()['expirations'], 1)
+
+    def test_zero_ttl_not_cached(self):
+        response_cache = cache.ResponseCache(ttls={self.PACKAGES_PATH: 0})
+        response_cache.store('key', self.PACKAGE_PATH, {}, b'{}')
+        self.assertEqual(len(response_cache), 0)
+
+    def test_eviction(self):
+        response_cache = cache.ResponseCache(
+            max_entries=1,
+            ttls={self.PACKAGES_PATH: 30}
+        )
+        response_cache.store('a', self.PACKAGES_PATH, {}, b'[]')
+        response_cache.store('b', self.PACKAGE_PATH, {}, b'{}')
+        self.assertIsNone(response_cache.get('a'))
+        self.assertIsNotNone(response_cache.get('b'))
+        self.assertEqual(
+            response_cache.stats(),
+            {
+                'size': 1,
+                'hits': 1,
+                'misses': 1,
+                'evictions': 1,
+                'expirations': 0,
+                'invalidations': 0
+            }
+        )
+
+    def test_invalidate(self):
+        response_cache = cache.ResponseCache(ttls={self.PACKAGES_PATH: 30})
+        response_cache.store('list', self.PACKAGES_PATH, {}, b'[]')
+        response_cache.store('get', self.PACKAGE_PATH, {}, b'{}')
+        response_cache.store('other', self.PACKAGE_PATH + "0", {}, b'{}')
+        response_cache.invalidate(self.PACKAGE_PATH + "/package_content")
+        self.assertIsNone(response_cache.get('list'))
+        self.assertIsNone(response_cache.get('get'))
+        self.assertIsNotNone(response_cache.get('other'))
+
+
+class TestClientResponseCache(TestCase):
+    USERNAME = "xxx"
+    PASSWORD = "yyy"
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    PACKAGES_PATH = "/sol/vnfpkgm/v1/vnf_packages"
+    PACKAGE_PATH = "/sol/vnfpkgm/v1/vnf_packages/fc-034567decf2122745"
+    HEADERS = {'Content-Type': 'application/json'}
+
+    def setUp(self) -> None:
+        cache.clear_response_caches()
+        self.client = client.Client(
+            credentials=client.Credentials(
+                username=self.USERNAME,
+                password=self.PASSWORD
+            ),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            response_cache={'ttls': {self.PACKAGES_PATH: 30}}
+        )
+
+    def tearDown(self) -> None:
+        cache.clear_response_caches()
+
+    def test_polls_skip_cache(self):
+        cache.clear_response_caches()
+        default_client = client.Client(
+            credentials=self.client.cred,
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            response_cache=True
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + self.PACKAGE_PATH, [
+                {'json': {'onboardingState': 'PROCESSING'},
+                 'headers': self.HEADERS},
+                {'json': {'onboardingState': 'ONBOARDED'},
+                 'headers': self.HEADERS}
+            ])
+            default_client.get(self.PACKAGE_PATH, '')
+            self.assertEqual(
+                default_client.get(self.PACKAGE_PATH, ''),
+                {'onboardingState': 'PROCESSING'}
+            )
+            self.assertEqual(
+                default_client.get(self.PACKAGE_PATH, '', cache=False),
+                {'onboardingState': 'ONBOARDED'}
+            )
+            # The poll refreshed the cached response.
+            self.assertEqual(
+                default_client.get(self.PACKAGE_PATH, ''),
+                {'onboardingState': 'ONBOARDED'}
+            )
+            self.assertEqual(m.call_count, 2)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(
+            client.Client(
+                credentials=self.client.cred,
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER
+            ).response_cache
+        )
+
+    def test_read_served_from_cache(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + self.PACKAGE_PATH,
+                json={'operationalState': 'DISABLED'},
+                headers=self.HEADERS
+            )
+            self.client.get(self.PACKAGE_PATH, '')
+            self.assertEqual(
+                self.client.get(self.PACKAGE_PATH, ''),
+                {'operationalState': 'DISABLED'}
+            )
+            self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.client.response_cache.stats()['hits'], 1)
+
+    def test_mutation_invalidates(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + self.PACKAGE_PATH, [
+                {'json': {'operationalState': 'DISABLED'},
+                 'headers': self.HEADERS},
+                {'json': {'operationalState': 'ENABLED'},
+                 'headers': self.HEADERS}
+            ])
+            m.register_uri(
+                'PATCH',
+                self.ENDPOINT_URL + self.PACKAGE_PATH,
+                json={'operationalState': 'ENABLED'},
+                headers=self.HEADERS
+            )
+            self.client.get(self.PACKAGE_PATH, '')
+            self.client.patch(self.PACKAGE_PATH, '{}')
+            self.assertEqual(
+                self.client.get(self.PACKAGE_PATH, ''),
+                {'operationalState': 'ENABLED'}
+            )
+            self.assertEqual(m.call_count, 3)
@@ -2,6 +2,7 @@ import logging
 import os
 from unittest import TestCase, mock
 
+import requests
 import requests_mock
 from cloudify.exceptions import NonRecoverableError
 
@@ -28,6 +29,22 @@ class TestClient(TestCase):
             logger=self.LOGGER
         )
 
+    @staticmethod
+    def _response(status_code, content=b'{}'):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers['Content-Type'] = 'application/json'
+        response._content = content
+        return response
+
+    def test_base_client_is_abstract(self):
+        with self.assertRaises(TypeError):
+            client.BaseClient(
+                credentials=self.cred,
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER
+            )
+
     def test_no_credentials(self):
         self.cred = client.Credentials()
         self.client = client.Client(
@@ -37,8 +54,8 @@ class TestClient(TestCase):
         )
 
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             with self.assertRaises(NonRecoverableError):
                 self.client.get('/path', {}, {})
@@ -54,43 +71,43 @@ class TestClient(TestCase):
         )
 
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             self.client.get('/path', {}, {})
 
     def test_get(self):
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             self.client.get('/path', {}, {})
 
     def test_post(self):
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             self.client.post('/path', {}, {})
 
     def test_patch(self):
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             self.client.patch('/path', {}, {}, 'application/zip')
 
     def test_put(self):
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             self.client.put('/path', {}, {})
 
     def test_delete(self):
         with mock.patch(
-                'requests.request',
-                mock.MagicMock(status_code=200)
+                'requests.Session.request',
+                mock.MagicMock(return_value=self._response(200))
         ):
             self.client.delete('/path', {})
 
@@ -107,7 +124,38 @@ class TestClient(TestCase):
                     text=f.read(),
                     headers={"Content-Type": "text/xml"}
                 )
-                self.client.get('', {}, {})
+                response = self.client.get('', {}, {})
+            self.assertIs(type(response['results']['hits']), dict)
+            self.assertEqual(
+                len(response['results']['hits']['hit']),
+                9
+            )
+
+    def test_iter_items_xml(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                [
+                    {
+                        'content': b'<items><item><id>1</id></item>'
+                                   b'<item><id>2</id></item></items>',
+                        'headers': {
+                            'Content-Type': 'application/xml',
+                            'Link': '</path?nextpage_opaque_marker=abc>; '
+                                    'rel="next"'
+                        }
+                    },
+                    {
+                        'content': b'<items><item><id>3</id></item></items>',
+                        'headers': {'Content-Type': 'application/xml'}
+                    }
+                ]
+            )
+            self.assertEqual(
+                list(self.client.iter_items('/path')),
+                [{'id': '1'}, {'id': '2'}, {'id': '3'}]
+            )
 
     def test_empty_response_code(self):
         with requests_mock.Mocker() as m:
@@ -117,3 +165,49 @@ class TestClient(TestCase):
                 status_code=204
             )
             self.assertIsNone(self.client.get('', {}, {}))
+
+    def test_iter_items_follows_next_link(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                [
+                    {
+                        'json': [{'id': '1'}, {'id': '2'}],
+                        'headers': {
+                            'Content-Type': 'application/json',
+                            'Link': '<{}/path?nextpage_opaque_marker=abc>; '
+                                    'rel="next"'.format(self.ENDPOINT_URL)
+                        }
+                    },
+                    {
+                        'json': [{'id': '3'}],
+                        'headers': {'Content-Type': 'application/json'}
+                    }
+                ]
+            )
+            items = list(self.client.iter_items('/path'))
+            self.assertEqual(
+                [item['id'] for item in items],
+                ['1', '2', '3']
+            )
+            self.assertEqual(
+                m.request_history[1].qs,
+                {'nextpage_opaque_marker': ['abc']}
+            )
+
+    def test_iter_items_stops_early(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                json=[{'id': '1'}, {'id': '2'}],
+                headers={
+                    'Content-Type': 'application/json',
+                    'Link': '</path?nextpage_opaque_marker=abc>; rel="next"'
+                }
+            )
+            items = self.client.iter_items('/path')
+            self.assertEqual(next(items), {'id': '1'})
+            items.close()
+            self.assertEqual(m.call_count, 1)
@@ -0,0 +1,58 @@
+import json
+import logging
+from unittest import TestCase, mock
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk import client as client
+from mano_sdk import codec
+
+
+class TestCodec(TestCase):
+    DATA = {"additionalParamsForNs": {"vpc_cidr_block": "10.100.0.0/16"}}
+
+    def test_auto_prefers_installed_fast_codec(self):
+        with mock.patch.dict(codec._codecs, {'orjson': None, 'ujson': None}):
+            self.assertIsInstance(codec.get_codec('auto'), codec.JsonCodec)
+            self.assertEqual(codec.get_codec('auto').name, 'json')
+        self.assertIn(codec.get_codec().name, codec.AUTO_CODECS)
+
+    def test_round_trip(self):
+        for name in codec.AUTO_CODECS:
+            instance = codec._load_codec(name)
+            if instance is None:
+                continue
+            encoded = instance.dumps(self.DATA)
+            if isinstance(encoded, str):
+                encoded = encoded.encode('utf-8')
+            self.assertEqual(instance.loads(encoded), self.DATA)
+            self.assertEqual(json.loads(encoded), self.DATA)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(NonRecoverableError):
+            codec.get_codec('simplejson')
+
+    def test_codec_instance(self):
+        instance = codec.JsonCodec()
+        self.assertIs(codec.get_codec(instance), instance)
+
+    def test_client_codec(self):
+        json_client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url="https://test_aws.amazonaws.com",
+            logger=logging.getLogger(),
+            json_codec='json'
+        )
+        self.assertEqual(
+            json_client.codec.dumps(self.DATA),
+            json.dumps(self.DATA)
+        )
+        self.assertEqual(
+            json_client._parse_response(
+                'application/json',
+                b'{"id": "1"}',
+                logging.getLogger(),
+                json_client.codec
+            ),
+            {"id": "1"}
+        )
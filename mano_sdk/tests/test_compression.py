@@ -0,0 +1,90 @@
+import gzip
+import io
+import json
+import logging
+from unittest import TestCase, mock
+
+import requests_mock
+
+from mano_sdk import client, compression
+
+
+class TestCompression(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    TOKEN = "zzz"
+    LOGGER = logging.getLogger()
+    BODY = '{"additionalParamsForNs": {"vpc_cidr_block": "10.100.0.0/16"}}'
+
+    def test_compress_body(self):
+        data, compressed = compression.compress_body(
+            self.BODY,
+            'application/json',
+            10
+        )
+        self.assertTrue(compressed)
+        self.assertEqual(gzip.decompress(data).decode('utf-8'), self.BODY)
+
+    def test_compress_body_below_threshold(self):
+        self.assertEqual(
+            compression.compress_body(self.BODY, 'application/json', 1024),
+            (self.BODY, False)
+        )
+        self.assertEqual(
+            compression.compress_body(self.BODY, 'application/json', None),
+            (self.BODY, False)
+        )
+
+    def test_compress_body_skips_packages_and_streams(self):
+        self.assertEqual(
+            compression.compress_body(b'PK' * 100, 'application/zip', 10),
+            (b'PK' * 100, False)
+        )
+        stream = io.BytesIO(self.BODY.encode('utf-8'))
+        self.assertEqual(
+            compression.compress_body(stream, 'application/json', 10),
+            (stream, False)
+        )
+
+    def test_accept_encoding(self):
+        with mock.patch.object(
+                compression,
+                '_brotli_available',
+                return_value=True
+        ):
+            self.assertEqual(
+                compression.accept_encoding(),
+                'gzip, deflate, br'
+            )
+
+    def test_client_request(self):
+        sol_client = client.Client(
+            credentials=client.Credentials(token=self.TOKEN),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            compress_threshold=10
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'POST',
+                self.ENDPOINT_URL + '/path',
+                status_code=201,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Content-Encoding': 'gzip'
+                },
+                content=gzip.compress(b'{"id": "1"}')
+            )
+            self.assertEqual(
+                sol_client.post('/path', self.BODY),
+                {"id": "1"}
+            )
+            request = m.last_request
+        self.assertEqual(request.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            request.headers['Accept-Encoding'],
+            compression.ACCEPT_ENCODING
+        )
+        self.assertEqual(
+            json.loads(gzip.decompress(request.body)),
+            json.loads(self.BODY)
+        )
@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import os
+import tempfile
+import zipfile
+from unittest import TestCase, mock
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk import csar
+from mano_sdk import function_package as fp
+
+VNFD = 'tosca_definitions_version: tosca_simple_yaml_1_3\n'
+IMAGE = os.urandom(3000)
+MANIFEST = """metadata:
+  vnf_provider_id: Acme
+  vnf_product_name: router
+  vnf_release_date_time: 2026-01-01T10:00:00+00:00
+  vnf_package_version: '1.0'
+
+Source: Definitions/router.yaml
+Algorithm: SHA-256
+Hash: {vnfd}
+
+Source: Artifacts/image.qcow2
+Algorithm: SHA-512
+Hash: {image}
+
+Source: https://images.example.com/router.qcow2
+Algorithm: SHA-256
+Hash: 00
+
+non_mano_artifact_sets:
+  onap_ves_events:
+    Source: Files/events.yaml
+
+-----BEGIN CMS-----
+Source: not/an/artifact
+-----END CMS-----
+"""
+
+
+class TestCsar(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    TOSCA_META = (
+        'TOSCA-Meta-File-Version: 1.0\n'
+        'CSAR-Version: 1.1\n'
+        'Created-By: Acme\n'
+        'Entry-Definitions: Definitions/router.yaml\n'
+        'ETSI-Entry-Manifest: router.mf\n'
+    )
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def _package(self, entries, name='router.zip'):
+        path = os.path.join(self.directory, name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+            for entry, content in entries.items():
+                package.writestr(entry, content)
+        return path
+
+    def _entries(self, **overrides):
+        entries = {
+            csar.TOSCA_META: self.TOSCA_META,
+            'Definitions/router.yaml': VNFD,
+            'Artifacts/image.qcow2': IMAGE,
+            'router.mf': MANIFEST.format(
+                vnfd=hashlib.sha256(VNFD.encode()).hexdigest(),
+                image=hashlib.sha512(IMAGE).hexdigest()
+            )
+        }
+        entries.update(overrides)
+        return {name: value for name, value in entries.items() if value}
+
+    def test_valid_package(self):
+        report = csar.inspect_csar(self._package(self._entries()), 'vnf')
+        self.assertTrue(report.valid, report.errors)
+        self.assertEqual(report.entry_definitions, 'Definitions/router.yaml')
+        self.assertEqual(report.manifest, 'router.mf')
+        self.assertEqual(report.metadata['vnf_provider_id'], 'Acme')
+        self.assertEqual(report.verified, 2)
+
+    def test_without_tosca_meta(self):
+        entries = self._entries()
+        entries = {
+            'router.yaml': VNFD,
+            'Artifacts/image.qcow2': IMAGE,
+            'router.mf': entries['router.mf'].replace(
+                'Definitions/router.yaml',
+                'router.yaml'
+            )
+        }
+        report = csar.inspect_csar(self._package(entries), 'vnf')
+        self.assertTrue(report.valid, report.errors)
+        self.assertEqual(report.entry_definitions, 'router.yaml')
+
+    def test_invalid_package(self):
+        entries = self._entries(**{
+            csar.TOSCA_META: self.TOSCA_META.replace('Created-By: Acme\n', ''),
+            'Artifacts/image.qcow2': IMAGE[:-1]
+        })
+        entries['router.mf'] = entries['router.mf'] \
+            .replace('  vnf_product_name: router\n', '') \
+            .replace('Definitions/router.yaml', 'Definitions/missing.yaml')
+        report = csar.inspect_csar(self._package(entries), 'vnf')
+        self.assertEqual(report.errors, [
+            '{} has no Created-By.'.format(csar.TOSCA_META),
+            'Manifest metadata has no vnf_product_name.',
+            'Manifest lists Definitions/missing.yaml which is not in the '
+            'package.',
+            'Digest of Artifacts/image.qcow2 does not match the manifest.'
+        ])
+
+    def test_missing_manifest(self):
+        report = csar.inspect_csar(
+            self._package(self._entries(**{'router.mf': None}))
+        )
+        self.assertEqual(report.errors, ['Package has no manifest file.'])
+
+    def test_entry_digest_streams(self):
+        path = self._package(self._entries())
+        with zipfile.ZipFile(path) as package:
+            self.assertEqual(
+                csar.entry_digest(
+                    package,
+                    'Artifacts/image.qcow2',
+                    'sha256',
+                    block_size=7
+                ),
+                hashlib.sha256(IMAGE).hexdigest()
+            )
+
+    def test_validate_csar(self):
+        plain_path = os.path.join(self.directory, 'nsd.yaml')
+        with open(plain_path, 'w') as plain:
+            plain.write(VNFD)
+        self.assertTrue(csar.validate_csar(plain_path).valid)
+        not_zip = os.path.join(self.directory, 'broken.zip')
+        with open(not_zip, 'w') as broken:
+            broken.write('not a zip')
+        with self.assertRaisesRegex(NonRecoverableError, 'Not a valid CSAR'):
+            csar.validate_csar(not_zip)
+
+    def test_upload_validates(self):
+        path = self._package(self._entries(**{'router.mf': None}))
+        function_package = fp.FunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with mock.patch('mano_sdk.Client.put') as put:
+            with self.assertRaisesRegex(NonRecoverableError, 'no manifest'):
+                function_package.upload('1', path, validate=True)
+            put.assert_not_called()
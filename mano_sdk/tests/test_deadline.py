@@ -0,0 +1,88 @@
+import logging
+from unittest import TestCase, mock
+
+import requests
+import requests_mock
+from cloudify.exceptions import RecoverableError
+
+from mano_sdk import client as client
+from mano_sdk import deadline
+
+
+class TestDeadline(TestCase):
+
+    def test_no_deadline(self):
+        self.assertIsNone(deadline.remaining())
+        self.assertEqual(deadline.cap_timeout(10.0), 10.0)
+        with deadline.deadline(None):
+            self.assertIsNone(deadline.remaining())
+
+    def test_nested_deadline_cannot_extend(self):
+        with deadline.deadline(5):
+            with deadline.deadline(60):
+                self.assertLessEqual(deadline.remaining(), 5)
+            with deadline.deadline(1):
+                self.assertLessEqual(deadline.cap_timeout(10.0), 1)
+                self.assertLessEqual(deadline.cap_timeout(None), 1)
+        self.assertIsNone(deadline.remaining())
+
+    def test_with_deadline(self):
+        @deadline.with_deadline(0)
+        def expired():
+            deadline.check_deadline('test')
+
+        with self.assertRaisesRegex(RecoverableError, 'Deadline exceeded'):
+            expired()
+
+
+class TestClientDeadline(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+
+    def setUp(self) -> None:
+        self.client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            connect_timeout=3.0,
+            read_timeout=30.0
+        )
+
+    def test_timeouts(self):
+        with mock.patch(
+                'requests.Session.request',
+                mock.MagicMock(return_value=requests.Response())
+        ) as request:
+            request.return_value.status_code = 204
+            self.client.delete('/path')
+            self.assertEqual(request.call_args[1]['timeout'], (3.0, 30.0))
+            with deadline.deadline(2):
+                self.client.delete('/path')
+            connect_timeout, read_timeout = request.call_args[1]['timeout']
+            self.assertLessEqual(connect_timeout, 2)
+            self.assertLessEqual(read_timeout, 2)
+
+    def test_expired_deadline(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + '/path', json={})
+            with deadline.deadline(0):
+                with self.assertRaisesRegex(
+                        RecoverableError,
+                        'Deadline exceeded'
+                ):
+                    self.client.get('/path', "")
+            self.assertEqual(m.call_count, 0)
+
+    def test_no_retry_beyond_deadline(self):
+        self.client.retry_policy.backoff_factor = 5.0
+        self.client.retry_policy.jitter = False
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                exc=requests.exceptions.ReadTimeout
+            )
+            with deadline.deadline(1):
+                with self.assertRaises(RecoverableError):
+                    self.client.get('/path', "")
+            self.assertEqual(m.call_count, 1)
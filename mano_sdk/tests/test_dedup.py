@@ -0,0 +1,251 @@
+import hashlib
+import logging
+import os
+import tempfile
+import zipfile
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from mano_sdk import csar, dedup
+from mano_sdk import function_package as fp
+from mano_sdk import network_package as np
+
+VNFD = """
+tosca_definitions_version: tosca_simple_yaml_1_3
+topology_template:
+  node_templates:
+    router:
+      type: company.router.VNF
+      properties:
+        descriptor_id: b1bb0ce7-ebca-4fa7-95ed-4840d70a1177
+        descriptor_version: '1.0'   # bumped on each release
+        provider: "Acme"
+"""
+
+# Standard SOL001 layout: the VNF node type, in an imported file, gives
+# the identity as property defaults.
+VNFD_TYPES = """
+tosca_definitions_version: tosca_simple_yaml_1_3
+node_types:
+  company.router.VNF:
+    derived_from: tosca.nodes.nfv.VNF
+    properties:
+      descriptor_id:
+        type: string
+        default: b1bb0ce7-ebca-4fa7-95ed-4840d70a1177
+      descriptor_version:
+        type: string
+        default: '1.0'
+      provider:
+        type: string
+        default: Acme
+      flavour_id:
+        type: string
+        constraints: [ valid_values: [ simple ] ]
+"""
+VNFD_TOP = """
+tosca_definitions_version: tosca_simple_yaml_1_3
+imports:
+  - router_types.yaml
+topology_template:
+  node_templates:
+    router:
+      type: company.router.VNF
+      properties:
+        flavour_id: simple
+"""
+
+
+class TestDedup(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    IDENTITY = {
+        'vnfdId': 'b1bb0ce7-ebca-4fa7-95ed-4840d70a1177',
+        'vnfProvider': 'Acme',
+        'vnfdVersion': '1.0'
+    }
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.package_path = os.path.join(self.directory, 'router.zip')
+        with zipfile.ZipFile(self.package_path, 'w') as package:
+            package.writestr(
+                csar.TOSCA_META,
+                'TOSCA-Meta-File-Version: 1.0\n'
+                'Entry-Definitions: Definitions/router.yaml\n'
+            )
+            package.writestr('Definitions/router.yaml', VNFD)
+
+    def test_file_sha256(self):
+        with open(self.package_path, 'rb') as package_file:
+            expected = hashlib.sha256(package_file.read()).hexdigest()
+        self.assertEqual(
+            dedup.file_sha256(self.package_path, block_size=7),
+            expected
+        )
+
+    def test_hash_files(self):
+        paths = []
+        for index in range(3):
+            path = os.path.join(self.directory, '{}.bin'.format(index))
+            with open(path, 'wb') as data:
+                data.write(os.urandom(1000))
+            paths.append(path)
+        self.assertEqual(
+            dedup.hash_files(paths, max_workers=2),
+            {path: dedup.file_sha256(path) for path in paths}
+        )
+
+    def test_package_identity(self):
+        self.assertEqual(
+            dedup.package_identity(self.package_path),
+            self.IDENTITY
+        )
+        plain_path = os.path.join(self.directory, 'plain.txt')
+        with open(plain_path, 'w') as plain:
+            plain.write('not a csar')
+        self.assertEqual(dedup.package_identity(plain_path), {})
+
+    def test_package_identity_from_node_types(self):
+        with zipfile.ZipFile(self.package_path, 'w') as package:
+            package.writestr(
+                csar.TOSCA_META,
+                'TOSCA-Meta-File-Version: 1.0\n'
+                'Entry-Definitions: Definitions/router.yaml\n'
+            )
+            package.writestr('Definitions/router.yaml', VNFD_TOP)
+            package.writestr('Definitions/router_types.yaml', VNFD_TYPES)
+        self.assertEqual(
+            dedup.package_identity(self.package_path),
+            self.IDENTITY
+        )
+
+    def test_find_duplicate(self):
+        packages = [
+            {'id': 'created', 'checksum': {
+                'algorithm': 'SHA-256',
+                'hash': 'AB12'
+            }},
+            dict(self.IDENTITY, id='same-descriptor'),
+            {'id': 'tagged', 'userDefinedData': {
+                dedup.CHECKSUM_KEY: 'ab12'
+            }},
+            {'id': 'md5', 'checksum': {'algorithm': 'MD5', 'hash': 'ab12'}}
+        ]
+        self.assertEqual(
+            dedup.find_duplicate(packages, 'ab12', exclude_id='created'),
+            packages[2]
+        )
+        self.assertEqual(
+            dedup.find_duplicate(packages, 'ab12')['id'],
+            'created'
+        )
+        self.assertEqual(
+            dedup.find_duplicate(packages, 'cd34', self.IDENTITY)['id'],
+            'same-descriptor'
+        )
+        self.assertIsNone(dedup.find_duplicate(packages, 'cd34'))
+
+    def test_find_onboarded(self):
+        function_package = fp.FunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with mock.patch('mano_sdk.Client.iter_items',
+                        return_value=iter([{'id': '1'}])) as iter_items:
+            self.assertIsNone(function_package.find_onboarded('ab12'))
+            iter_items.assert_called_with(
+                content_type='application/json',
+                params={
+                    'filter': '(eq,onboardingState,ONBOARDED)',
+                    'fields': 'checksum,userDefinedData',
+                    'exclude_default': ''
+                },
+                path=fp.SOL_FUNCTION_PACKAGE_PATH,
+                return_code=200
+            )
+            # An incomplete identity matches nothing, nothing is listed.
+            self.assertIsNone(function_package.find_onboarded(
+                identity={'vnfdId': self.IDENTITY['vnfdId']}
+            ))
+            self.assertEqual(iter_items.call_count, 1)
+
+    def test_find_onboarded_network_package(self):
+        network_package = np.NetworkPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with mock.patch('mano_sdk.Client.iter_items', return_value=iter([
+                {'id': '1', 'userDefinedData': {dedup.CHECKSUM_KEY: 'ab12'}}
+        ])) as iter_items:
+            self.assertEqual(
+                network_package.find_onboarded('AB12')['id'],
+                '1'
+            )
+            iter_items.assert_called_with(
+                content_type='application/json',
+                params={
+                    'filter': '(eq,nsdOnboardingState,ONBOARDED)',
+                    'fields': 'userDefinedData',
+                    'exclude_default': ''
+                },
+                path=np.SOL_NETWORK_PACKAGE_PATH,
+                return_code=200
+            )
+
+    def test_update_user_defined_data(self):
+        network_package = np.NetworkPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with mock.patch('mano_sdk.Client.patch') as patch:
+            network_package.update_user_defined_data(
+                'nsd-1',
+                {dedup.CHECKSUM_KEY: 'ab12'}
+            )
+            patch.assert_called_with(
+                content_type='application/json',
+                data=network_package.client.codec.dumps({
+                    'userDefinedData': {dedup.CHECKSUM_KEY: 'ab12'}
+                }),
+                params='',
+                path='{}/nsd-1'.format(np.SOL_NETWORK_PACKAGE_PATH),
+                return_code=200
+            )
+
+
+class TestAsyncDedup(IsolatedAsyncioTestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+
+    async def test_find_onboarded_stops_at_checksum(self):
+        listed = []
+
+        async def iter_items(client, **kwargs):
+            for package in [
+                    {'id': '1', 'vnfdId': 'a', 'vnfProvider': 'Acme',
+                     'vnfdVersion': '1.0'},
+                    {'id': '2', 'checksum': {'hash': 'AB12'}},
+                    {'id': '3', 'checksum': {'hash': 'ab12'}}
+            ]:
+                listed.append(package['id'])
+                yield package
+
+        function_package = fp.AsyncFunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with mock.patch(
+                'mano_sdk.async_client.AsyncClient.iter_items',
+                new=iter_items
+        ):
+            found = await function_package.find_onboarded('ab12')
+            self.assertEqual(found['id'], '2')
+            self.assertEqual(listed, ['1', '2'])
+            # Without a checksum match, the identity match is returned.
+            found = await function_package.find_onboarded(
+                'cd34',
+                {'vnfdId': 'a', 'vnfProvider': 'Acme', 'vnfdVersion': '1.0'}
+            )
+            self.assertEqual(found['id'], '1')
@@ -1,5 +1,11 @@
+import json
 import logging
-from unittest import TestCase, mock
+import os
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from cloudify.exceptions import NonRecoverableError, RecoverableError
 
 from mano_sdk import function_package as fp
 
@@ -30,7 +36,9 @@ class TestFunctionPackage(TestCase):
         self.function_package.create(tags=self.TAGS)
         post_mock.assert_called_with(
             content_type='application/json',
-            data='{"tags": {"test": "tag"}}',
+            data=self.function_package.client.codec.dumps({
+                "tags": {"test": "tag"}
+            }),
             params='',
             path=fp.SOL_FUNCTION_PACKAGE_PATH
         )
@@ -71,6 +79,30 @@ class TestFunctionPackage(TestCase):
             return_code=202
         )
 
+    @mock.patch('mano_sdk.Client.post')
+    def test_upload_from_uri(self, mock_post):
+        self.function_package.upload_from_uri(
+            function_id=self.FUNCTION_ID,
+            uri="https://artifacts.example.com/vnf.zip",
+            username="repo",
+            password="secret"
+        )
+        mock_post.assert_called_with(
+            content_type='application/json',
+            data=self.function_package.client.codec.dumps({
+                "addressInformation": "https://artifacts.example.com/vnf.zip",
+                "authType": "BASIC",
+                "userName": "repo",
+                "password": "secret"
+            }),
+            params='',
+            path="{}/{}/package_content/upload_from_uri".format(
+                fp.SOL_FUNCTION_PACKAGE_PATH,
+                self.FUNCTION_ID
+            ),
+            return_code=202
+        )
+
     @mock.patch('mano_sdk.Client.patch')
     def test_update(self, mock_patch):
         self.function_package.update(
@@ -79,7 +111,9 @@ class TestFunctionPackage(TestCase):
         )
         mock_patch.assert_called_with(
             content_type='application/json',
-            data='{"operationalState": "DISABLED"}',
+            data=self.function_package.client.codec.dumps({
+                "operationalState": "DISABLED"
+            }),
             params='',
             path="{}/{}".format(
                 fp.SOL_FUNCTION_PACKAGE_PATH,
@@ -125,5 +159,303 @@ class TestFunctionPackage(TestCase):
                 fp.SOL_FUNCTION_PACKAGE_PATH,
                 self.FUNCTION_ID
             ),
+            return_code=200,
+            cache=True
+        )
+
+    @mock.patch('mano_sdk.Client.iter_items')
+    def test_iter_packages(self, mock_iter_items):
+        self.function_package.iter_packages()
+        mock_iter_items.assert_called_with(
+            content_type='application/json',
+            params='',
+            path=fp.SOL_FUNCTION_PACKAGE_PATH,
             return_code=200
         )
+
+    @mock.patch('mano_sdk.Client.get')
+    def test_list_filter(self, mock_get):
+        self.function_package.list(
+            filter="(eq,operationalState,ENABLED)",
+            exclude_default=True
+        )
+        mock_get.assert_called_with(
+            content_type='application/json',
+            data='',
+            params={
+                'filter': '(eq,operationalState,ENABLED)',
+                'exclude_default': ''
+            },
+            path=fp.SOL_FUNCTION_PACKAGE_PATH,
+            return_code=200
+        )
+
+    @mock.patch('mano_sdk.Client.get')
+    def test_get_fields(self, mock_get):
+        self.function_package.get(
+            package_id=self.FUNCTION_ID,
+            fields=["checksum"]
+        )
+        mock_get.assert_called_with(
+            content_type='application/json',
+            data='',
+            params={'fields': 'checksum'},
+            path="{}/{}".format(
+                fp.SOL_FUNCTION_PACKAGE_PATH,
+                self.FUNCTION_ID
+            ),
+            return_code=200,
+            cache=True
+        )
+
+
+def _package_files(test, specs):
+    """
+        Creates the files of `specs` in a temporary directory and
+        returns specs pointing at them.
+    """
+    directory = tempfile.TemporaryDirectory()
+    test.addCleanup(directory.cleanup)
+    package_specs = []
+    for spec in specs:
+        path = os.path.join(directory.name, spec['file_name'])
+        with open(path, 'wb') as package_file:
+            package_file.write(b'PK' + spec['file_name'].encode())
+        package_specs.append(dict(spec, file_name=path))
+    return package_specs
+
+
+class FakeNfvo:
+    """
+        Serves function packages from memory: each package reports
+        `PROCESSING` once, then the state scripted for its file.
+    """
+
+    def __init__(self, onboarding_states=None, failing_uploads=()):
+        self.onboarding_states = onboarding_states or {}
+        self.failing_uploads = failing_uploads
+        self.packages = {}
+        self.updates = []
+        self._lock = threading.Lock()
+
+    def post(self, path, data, params, content_type):
+        with self._lock:
+            package_id = str(len(self.packages))
+            self.packages[package_id] = {
+                'id': package_id,
+                'onboardingState': 'CREATED',
+                'operationalState': 'DISABLED'
+            }
+        return dict(self.packages[package_id])
+
+    def put(self, path, data, params, content_type, return_code):
+        package_id = path.split('/')[-2]
+        file_name = os.path.basename(data.name)
+        if file_name in self.failing_uploads:
+            raise RecoverableError('upload of {} failed'.format(file_name))
+        self.packages[package_id].update({
+            'onboardingState': 'PROCESSING',
+            'file_name': file_name
+        })
+        return {}
+
+    def get(self, path, data, params, content_type, return_code,
+            cache=True):
+        package = self.packages[path.split('/')[-1]]
+        if package['onboardingState'] == 'PROCESSING' and \
+                'exclude_default' in params:
+            response = dict(package)
+            package['onboardingState'] = self.onboarding_states.get(
+                package['file_name'],
+                'ONBOARDED'
+            )
+            return response
+        return dict(package)
+
+    def patch(self, path, data, params, content_type, return_code):
+        package_id = path.split('/')[-1]
+        changes = json.loads(data)
+        if 'userDefinedData' in changes:
+            self.packages[package_id]['userDefinedData'] = \
+                changes['userDefinedData']
+            return {}
+        self.updates.append(package_id)
+        self.packages[package_id]['operationalState'] = 'ENABLED'
+        return {}
+
+    def iter_items(self, path, params, content_type, return_code):
+        return iter([
+            dict(package) for package in self.packages.values()
+            if package['onboardingState'] == 'ONBOARDED'
+        ])
+
+
+class TestBulkOnboard(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    SPECS = [
+        {'file_name': 'amf.zip'},
+        {'file_name': 'smf.zip', 'tags': {'nf': 'smf'}},
+        {'file_name': 'upf.zip'},
+        {'file_name': 'nrf.zip', 'operational_state': None}
+    ]
+
+    def setUp(self) -> None:
+        self.function_package = fp.FunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+
+    def _patch(self, nfvo):
+        patches = [
+            mock.patch('mano_sdk.Client.{}'.format(method),
+                       side_effect=getattr(nfvo, method))
+            for method in ('post', 'put', 'get', 'patch', 'iter_items')
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_bulk_onboard(self):
+        nfvo = FakeNfvo(
+            onboarding_states={'upf.zip': 'ERROR'},
+            failing_uploads=('smf.zip',)
+        )
+        self._patch(nfvo)
+        specs = _package_files(self, self.SPECS)
+        results = self.function_package.bulk_onboard(
+            specs,
+            max_workers=2,
+            poll_interval=0
+        )
+        self.assertEqual(
+            [result.spec for result in results],
+            specs
+        )
+        amf, smf, upf, nrf = results
+        self.assertTrue(amf.ok)
+        self.assertEqual(amf.package['operationalState'], 'ENABLED')
+        self.assertEqual(amf.package['onboardingState'], 'ONBOARDED')
+        self.assertEqual(smf.stage, 'upload')
+        self.assertIsInstance(smf.error, RecoverableError)
+        self.assertIsNotNone(smf.package_id)
+        self.assertEqual(upf.stage, 'onboarding')
+        self.assertIsInstance(upf.error, NonRecoverableError)
+        self.assertTrue(nrf.ok)
+        self.assertEqual(nrf.package['operationalState'], 'DISABLED')
+        self.assertEqual(nfvo.updates, [amf.package_id])
+
+    def test_bulk_onboard_deduplicate(self):
+        nfvo = FakeNfvo()
+        self._patch(nfvo)
+        amf, smf = _package_files(
+            self,
+            [{'file_name': 'amf.zip'}, {'file_name': 'smf.zip'}]
+        )
+        first, = self.function_package.bulk_onboard(
+            [amf],
+            poll_interval=0,
+            deduplicate=True
+        )
+        self.assertFalse(first.reused)
+        self.assertEqual(
+            nfvo.packages[first.package_id]['userDefinedData'],
+            {'contentSha256': first.checksum}
+        )
+        reused, uploaded = self.function_package.bulk_onboard(
+            [amf, smf],
+            max_workers=2,
+            poll_interval=0,
+            deduplicate=True
+        )
+        self.assertTrue(reused.ok)
+        self.assertTrue(reused.reused)
+        self.assertEqual(reused.package_id, first.package_id)
+        self.assertTrue(uploaded.ok)
+        self.assertFalse(uploaded.reused)
+        self.assertEqual(len(nfvo.packages), 2)
+
+    def test_wait_onboarded_timeout(self):
+        with mock.patch('mano_sdk.Client.get',
+                        return_value={'onboardingState': 'PROCESSING'}):
+            with self.assertRaises(RecoverableError):
+                self.function_package.wait_onboarded(
+                    '1',
+                    poll_interval=0,
+                    timeout=0.01
+                )
+
+
+class TestAsyncBulkOnboard(IsolatedAsyncioTestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+
+    async def test_bulk_onboard(self):
+        nfvo = FakeNfvo(failing_uploads=('smf.zip',))
+        function_package = fp.AsyncFunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        patches = [
+            mock.patch(
+                'mano_sdk.async_client.AsyncClient.{}'.format(method),
+                new=mock.AsyncMock(side_effect=getattr(nfvo, method))
+            )
+            for method in ('post', 'put', 'get', 'patch')
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        results = await function_package.bulk_onboard(
+            _package_files(
+                self,
+                [{'file_name': 'amf.zip'}, {'file_name': 'smf.zip'}]
+            ),
+            max_workers=1,
+            poll_interval=0
+        )
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].stage, 'upload')
+        self.assertEqual(nfvo.updates, [results[0].package_id])
+
+    async def test_bulk_onboard_deduplicate(self):
+        nfvo = FakeNfvo()
+        function_package = fp.AsyncFunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+
+        async def iter_items(client, **kwargs):
+            for package in nfvo.iter_items(**kwargs):
+                yield package
+
+        patches = [
+            mock.patch(
+                'mano_sdk.async_client.AsyncClient.{}'.format(method),
+                new=mock.AsyncMock(side_effect=getattr(nfvo, method))
+            )
+            for method in ('post', 'put', 'get', 'patch')
+        ] + [mock.patch(
+            'mano_sdk.async_client.AsyncClient.iter_items',
+            new=iter_items
+        )]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        specs = _package_files(self, [{'file_name': 'amf.zip'}])
+        first, = await function_package.bulk_onboard(
+            specs,
+            poll_interval=0,
+            deduplicate=True
+        )
+        self.assertEqual(
+            nfvo.packages[first.package_id]['userDefinedData'],
+            {'contentSha256': first.checksum}
+        )
+        second, = await function_package.bulk_onboard(
+            specs,
+            poll_interval=0,
+            deduplicate=True
+        )
+        self.assertTrue(second.reused)
+        self.assertEqual(second.package_id, first.package_id)
@@ -0,0 +1,155 @@
+import logging
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import requests_mock
+
+from mano_sdk import client as client
+from mano_sdk import metrics
+
+
+class TestMetrics(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    INSTANCE_ID = "tp-07aa863e53460a2a6"
+
+    def _metrics(self, status=200, total=0.2):
+        return metrics.RequestMetrics(
+            endpoint_url=self.ENDPOINT_URL,
+            method='GET',
+            path='/sol/nslcm/v1/ns_instances/{id}',
+            status=status,
+            connect=0.0,
+            ttfb=0.1,
+            total=total,
+            request_bytes=None,
+            response_bytes=120
+        )
+
+    def test_template_path(self):
+        self.assertEqual(
+            metrics.template_path(
+                '/sol/nslcm/v1/ns_instances/{}/instantiate'.format(
+                    self.INSTANCE_ID
+                )
+            ),
+            '/sol/nslcm/v1/ns_instances/{id}/instantiate'
+        )
+        self.assertEqual(
+            metrics.template_path(
+                '/sol/vnfpkgm/v1/vnf_packages/fc-1/package_content'
+            ),
+            '/sol/vnfpkgm/v1/vnf_packages/{id}/package_content'
+        )
+        self.assertEqual(
+            metrics.template_path('/sol/nsd/v1/ns_descriptors'),
+            '/sol/nsd/v1/ns_descriptors'
+        )
+
+    def test_in_memory_histogram(self):
+        histogram = metrics.InMemoryHistogram(buckets=(0.1, 1.0))
+        histogram(self._metrics())
+        histogram(self._metrics(status=503, total=2.0))
+        self.assertEqual(histogram.count(status=200), 1)
+        total = histogram.histogram(
+            'GET',
+            '/sol/nslcm/v1/ns_instances/{id}'
+        )
+        self.assertEqual(total.cumulative(),
+                         [('0.1', 0), ('1.0', 1), ('+Inf', 2)])
+        self.assertEqual(total.sum, 2.2)
+
+    def test_prometheus_textfile(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'mano_sdk.prom')
+        exporter = metrics.PrometheusTextfileExporter(
+            path,
+            const_labels={'pid': '1'},
+            buckets=(1.0,)
+        )
+        exporter(self._metrics())
+        with open(path) as metrics_file:
+            content = metrics_file.read()
+        self.assertIn(
+            'mano_sdk_requests_total{pid="1",method="GET",'
+            'path="/sol/nslcm/v1/ns_instances/{id}",status="200"} 1',
+            content
+        )
+        self.assertIn(
+            'mano_sdk_request_seconds_bucket{pid="1",method="GET",'
+            'path="/sol/nslcm/v1/ns_instances/{id}",phase="total",'
+            'le="+Inf"} 1',
+            content
+        )
+        self.assertIn('direction="response"} 120', content)
+
+    def test_prometheus_textfile_shared(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'mano_sdk.prom')
+        exporters = [
+            metrics.PrometheusTextfileExporter(path, buckets=(1.0,))
+            for _ in range(2)
+        ]
+        for exporter in exporters:
+            exporter(self._metrics())
+        exporters[0](self._metrics(total=2.0))
+        exporters[0].flush()
+        with open(path) as metrics_file:
+            samples = metrics.parse_samples(metrics_file.read())
+        series = 'method="GET",path="/sol/nslcm/v1/ns_instances/{id}"'
+        self.assertEqual(
+            samples['mano_sdk_requests_total{{{},status="200"}}'.format(
+                series
+            )],
+            3
+        )
+        self.assertEqual(
+            samples['mano_sdk_request_seconds_bucket{{{},phase="total",'
+                    'le="1.0"}}'.format(series)],
+            2
+        )
+        self.assertAlmostEqual(
+            samples['mano_sdk_request_seconds_sum{{{},phase="total"}}'
+                    .format(series)],
+            2.4
+        )
+
+    def test_client_hooks(self):
+        histogram = metrics.InMemoryHistogram()
+        failing = []
+        sol_client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            metrics_hooks=[failing.pop, histogram]
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'POST',
+                self.ENDPOINT_URL + '/sol/nslcm/v1/ns_instances/{}'
+                '/instantiate'.format(self.INSTANCE_ID),
+                status_code=202,
+                content=b'{}'
+            )
+            sol_client.post(
+                '/sol/nslcm/v1/ns_instances/{}/instantiate'.format(
+                    self.INSTANCE_ID
+                ),
+                '{"nsFlavourId": "default"}',
+                return_code=202
+            )
+        record, = histogram.records
+        self.assertEqual(
+            record.path,
+            '/sol/nslcm/v1/ns_instances/{id}/instantiate'
+        )
+        self.assertEqual(
+            (record.method, record.status, record.request_bytes,
+             record.response_bytes),
+            ('POST', 202, 26, 2)
+        )
+        self.assertGreaterEqual(record.total, 0)
@@ -0,0 +1,141 @@
+import logging
+import tracemalloc
+from unittest import TestCase, mock
+
+from mano_sdk import function_package as fp
+from mano_sdk import models
+from mano_sdk import network_operation as no
+
+VNF_PKG_INFO = {
+    'id': 'fc-034567decf2122745',
+    'vnfdId': 'vnfd-1',
+    'vnfProvider': 'acme',
+    'vnfProductName': 'router',
+    'vnfSoftwareVersion': '1.0',
+    'vnfdVersion': '1.2',
+    'onboardingState': 'ONBOARDED',
+    'operationalState': 'ENABLED',
+    'usageState': 'NOT_IN_USE',
+    'checksum': {'algorithm': 'SHA-256', 'hash': 'ab12'},
+    'softwareImages': [{
+        'id': 'image-1',
+        'name': 'router.qcow2',
+        'diskFormat': 'qcow2',
+        'checksum': {'algorithm': 'SHA-256', 'hash': 'cd34'}
+    }],
+    'userDefinedData': {'owner': 'team'},
+    '_links': {'self': {'href': '/vnf_packages/fc-034567decf2122745'}}
+}
+NS_LCM_OP_OCC = {
+    'id': 'dp-00f03c1129c6c8bf8',
+    'operationState': 'FAILED',
+    'statusEnteredTime': '2024-01-01T00:00:00Z',
+    'nsInstanceId': 'tp-0b85fcbe94a34cc04',
+    'lcmOperationType': 'INSTANTIATE',
+    'error': {'status': 500, 'detail': 'VIM unreachable'}
+}
+
+
+class TestModels(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+
+    def test_hot_fields(self):
+        package = models.VnfPkgInfo(VNF_PKG_INFO)
+        self.assertEqual(package.id, VNF_PKG_INFO['id'])
+        self.assertEqual(package.vnfd_id, 'vnfd-1')
+        self.assertEqual(package.onboarding_state, 'ONBOARDED')
+        self.assertIsNone(models.VnfPkgInfo({'id': '1'}).usage_state)
+
+    def test_nested_fields_are_lazy(self):
+        package = models.VnfPkgInfo(VNF_PKG_INFO)
+        self.assertIsNone(package._decoded)
+        self.assertEqual(package.checksum.hash, 'ab12')
+        self.assertEqual(list(package._decoded), ['checksum'])
+        self.assertIs(package.checksum, package.checksum)
+        image = package.software_images[0]
+        self.assertEqual(image.disk_format, 'qcow2')
+        self.assertEqual(image.checksum.algorithm, 'SHA-256')
+        self.assertIsNone(package.additional_artifacts)
+        operation = models.NsLcmOpOcc(NS_LCM_OP_OCC)
+        self.assertEqual(operation.error.detail, 'VIM unreachable')
+
+    def test_raw(self):
+        package = models.VnfPkgInfo(VNF_PKG_INFO)
+        package.checksum
+        self.assertEqual(package.raw, VNF_PKG_INFO)
+        self.assertEqual(package.get('userDefinedData'), {'owner': 'team'})
+        self.assertEqual(package.get('vnfdId'), 'vnfd-1')
+        self.assertEqual(package, models.VnfPkgInfo(dict(VNF_PKG_INFO)))
+
+    def test_raw_keeps_nulls(self):
+        data = {'id': '1', 'usageState': None, 'userDefinedData': None}
+        package = models.VnfPkgInfo(data)
+        self.assertEqual(package.raw, data)
+        self.assertIsNone(package.get('usageState', 'default'))
+        self.assertEqual(package.get('vnfdId', 'default'), 'default')
+        self.assertNotEqual(package, models.VnfPkgInfo({'id': '1'}))
+
+    def test_slots(self):
+        package = models.VnfPkgInfo(VNF_PKG_INFO)
+        self.assertFalse(hasattr(package, '__dict__'))
+        with self.assertRaises(AttributeError):
+            package.unknown = 1
+
+    def test_memory(self):
+        items = [dict(VNF_PKG_INFO, id=str(index)) for index in range(1000)]
+
+        def allocated(build):
+            tracemalloc.start()
+            try:
+                built = build()
+                size = tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+            del built
+            return size
+
+        self.assertLess(
+            allocated(lambda: [models.VnfPkgInfo(item) for item in items]),
+            allocated(lambda: [dict(item) for item in items])
+        )
+
+    def test_to_models(self):
+        self.assertEqual(
+            [item.id for item in models.to_models(
+                models.NsdInfo,
+                [{'id': '1'}, {'id': '2'}]
+            )],
+            ['1', '2']
+        )
+        self.assertEqual(models.to_models(models.NsdInfo, {}), {})
+        self.assertIsNone(models.to_models(models.NsdInfo, None))
+
+    def test_resource_models(self):
+        function_package = fp.FunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            models=True
+        )
+        with mock.patch('mano_sdk.Client.get', return_value=VNF_PKG_INFO):
+            package = function_package.get(VNF_PKG_INFO['id'])
+        self.assertIsInstance(package, models.VnfPkgInfo)
+        with mock.patch('mano_sdk.Client.iter_items',
+                        return_value=iter([NS_LCM_OP_OCC])):
+            operations = list(no.NetworkOperation(
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER,
+                models=True
+            ).iter_operations())
+        self.assertEqual(operations[0].operation_state, 'FAILED')
+
+    def test_resource_dicts_by_default(self):
+        function_package = fp.FunctionPackage(
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with mock.patch('mano_sdk.Client.get', return_value=VNF_PKG_INFO):
+            self.assertIs(
+                function_package.get(VNF_PKG_INFO['id']),
+                VNF_PKG_INFO
+            )
@@ -1,4 +1,3 @@
-import json
 import logging
 from unittest import TestCase, mock
 
@@ -46,7 +45,7 @@ class TestNetworkInstance(TestCase):
             }
             d.assert_called_with(
                 content_type='application/json',
-                data=json.dumps(data),
+                data=self.network_instance.client.codec.dumps(data),
                 params='',
                 path=ni.SOL_NETWORK_INSTANCE_PATH
             )
@@ -65,7 +64,7 @@ class TestNetworkInstance(TestCase):
             }
             d.assert_called_with(
                 content_type='application/json',
-                data=json.dumps(data),
+                data=self.network_instance.client.codec.dumps(data),
                 params={'dryRun': False},
                 path='{}/{}/instantiate'.format(
                     ni.SOL_NETWORK_INSTANCE_PATH,
@@ -110,7 +109,7 @@ class TestNetworkInstance(TestCase):
             )
             d.assert_called_with(
                 content_type='application/json',
-                data=json.dumps(body),
+                data=self.network_instance.client.codec.dumps(body),
                 params="",
                 path='{}/{}/update'.format(
                     ni.SOL_NETWORK_INSTANCE_PATH,
@@ -159,7 +158,8 @@ class TestNetworkInstance(TestCase):
                     ni.SOL_NETWORK_INSTANCE_PATH,
                     self.NSD_ID
                 ),
-                return_code=200
+                return_code=200,
+                cache=True
             )
 
     def test_list(self):
@@ -170,3 +170,13 @@ class TestNetworkInstance(TestCase):
                 params="",
                 path=ni.SOL_NETWORK_INSTANCE_PATH
             )
+
+    def test_iter_instances(self):
+        with mock.patch('mano_sdk.Client.iter_items') as d:
+            self.network_instance.iter_instances()
+            d.assert_called_with(
+                content_type='application/json',
+                params='',
+                path=ni.SOL_NETWORK_INSTANCE_PATH,
+                return_code=200
+            )
@@ -34,7 +34,8 @@ class TestNetworkOperation(TestCase):
                     no.SOL_NETWORK_OPERATION_PATH,
                     self.OPERATION_ID
                 ),
-                return_code=200
+                return_code=200,
+                cache=True
             )
 
     def test_list(self):
@@ -47,3 +48,13 @@ class TestNetworkOperation(TestCase):
                 path=no.SOL_NETWORK_OPERATION_PATH,
                 return_code=200
             )
+
+    def test_iter_operations(self):
+        with mock.patch('mano_sdk.Client.iter_items') as d:
+            self.network_operation.iter_operations()
+            d.assert_called_with(
+                content_type='application/json',
+                params='',
+                path=no.SOL_NETWORK_OPERATION_PATH,
+                return_code=200
+            )
@@ -32,7 +32,9 @@ class TestNetworkPackage(TestCase):
             )
             d.assert_called_with(
                 content_type='application/json',
-                data='{"tags": {"test": "tag"}}',
+                data=self.network_package.client.codec.dumps({
+                    "tags": {"test": "tag"}
+                }),
                 params='',
                 path=np.SOL_NETWORK_PACKAGE_PATH
             )
@@ -73,6 +75,26 @@ class TestNetworkPackage(TestCase):
                 return_code=200
             )
 
+    def test_upload_from_uri(self):
+        with mock.patch('mano_sdk.Client.post') as d:
+            self.network_package.upload_from_uri(
+                nsd_id=self.NSD_ID,
+                uri="https://artifacts.example.com/nsd.zip"
+            )
+            d.assert_called_with(
+                content_type='application/json',
+                data=self.network_package.client.codec.dumps({
+                    "addressInformation":
+                        "https://artifacts.example.com/nsd.zip"
+                }),
+                params='',
+                path="{}/{}/nsd_content/upload_from_uri".format(
+                    np.SOL_NETWORK_PACKAGE_PATH,
+                    self.NSD_ID
+                ),
+                return_code=202
+            )
+
     def test_update(self):
         with mock.patch('mano_sdk.Client.patch') as d:
             self.network_package.update(
@@ -81,7 +103,9 @@ class TestNetworkPackage(TestCase):
             )
             d.assert_called_with(
                 content_type='application/json',
-                data='{"nsdOperationalState": "DISABLED"}',
+                data=self.network_package.client.codec.dumps({
+                    "nsdOperationalState": "DISABLED"
+                }),
                 params='',
                 path="{}/{}".format(
                     np.SOL_NETWORK_PACKAGE_PATH,
@@ -127,5 +151,16 @@ class TestNetworkPackage(TestCase):
                     np.SOL_NETWORK_PACKAGE_PATH,
                     self.NSD_ID
                 ),
+                return_code=200,
+                cache=True
+            )
+
+    def test_iter_packages(self):
+        with mock.patch('mano_sdk.Client.iter_items') as d:
+            self.network_package.iter_packages()
+            d.assert_called_with(
+                content_type='application/json',
+                params='',
+                path=np.SOL_NETWORK_PACKAGE_PATH,
                 return_code=200
             )
@@ -0,0 +1,164 @@
+import logging
+import os
+import shutil
+import stat
+import tempfile
+from unittest import TestCase, mock
+
+import requests_mock
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk import client as client
+from mano_sdk import oauth
+
+
+class TestOAuth2ClientCredentials(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    TOKEN_URL = "https://auth.test_aws.amazonaws.com/token"
+    LOGGER = logging.getLogger()
+
+    def setUp(self) -> None:
+        self.token_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.token_dir)
+        self.addCleanup(oauth.clear_oauth2_auths)
+        self.oauth2 = {
+            'token_url': self.TOKEN_URL,
+            'client_id': 'cloudify',
+            'client_secret': 'secret',
+            'token_dir': self.token_dir
+        }
+
+    def _auth(self, **options):
+        return oauth.OAuth2ClientCredentials(
+            self.ENDPOINT_URL,
+            self.TOKEN_URL,
+            'cloudify',
+            'secret',
+            token_dir=self.token_dir,
+            **options
+        )
+
+    def _register_token(self, m, expires_in=3600):
+        m.register_uri(
+            'POST',
+            self.TOKEN_URL,
+            [
+                {'json': {'access_token': 'token{}'.format(number),
+                          'expires_in': expires_in}}
+                for number in range(1, 4)
+            ]
+        )
+
+    def test_token_cached_on_disk(self):
+        with requests_mock.Mocker() as m:
+            self._register_token(m)
+            self.assertEqual(self._auth().access_token(), 'token1')
+            # A new provider, e.g. in another process, reads the file.
+            self.assertEqual(self._auth().access_token(), 'token1')
+            self.assertEqual(m.call_count, 1)
+            request = m.last_request
+        self.assertEqual(request.text, 'grant_type=client_credentials')
+        self.assertTrue(request.headers['Authorization'].startswith('Basic'))
+        self.assertEqual(len(os.listdir(self.token_dir)), 2)
+
+    def test_refresh_before_expiry(self):
+        auth = self._auth(refresh_margin=60)
+        with requests_mock.Mocker() as m:
+            self._register_token(m, expires_in=120)
+            self.assertEqual(auth.access_token(), 'token1')
+            with mock.patch(
+                    'mano_sdk.oauth.time.time',
+                    return_value=oauth.time.time() + 61
+            ):
+                self.assertEqual(auth.access_token(), 'token2')
+
+    def test_rejected_credentials(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('POST', self.TOKEN_URL, status_code=401)
+            with self.assertRaises(NonRecoverableError):
+                self._auth().access_token()
+
+    def test_invalid_token_response(self):
+        for response in ({'text': 'Service unavailable'},
+                         {'json': {'token_type': 'Bearer'}},
+                         {'json': ['token']}):
+            with requests_mock.Mocker() as m:
+                m.register_uri('POST', self.TOKEN_URL, **response)
+                with self.assertRaisesRegex(
+                        NonRecoverableError,
+                        'Invalid token response'
+                ):
+                    self._auth().access_token()
+
+    def test_token_dir_made_private(self):
+        os.chmod(self.token_dir, 0o755)
+        auth = self._auth()
+        with requests_mock.Mocker() as m:
+            self._register_token(m)
+            self.assertEqual(auth.access_token(), 'token1')
+            self.assertEqual(stat.S_IMODE(os.stat(self.token_dir).st_mode),
+                             0o700)
+            # A token file others can write is not trusted.
+            os.chmod(auth.path, 0o666)
+            self.assertEqual(self._auth().access_token(), 'token2')
+            self.assertEqual(stat.S_IMODE(os.stat(auth.path).st_mode),
+                             0o600)
+
+    def test_token_dir_of_other_user(self):
+        with mock.patch('mano_sdk.oauth.os.geteuid',
+                        return_value=os.geteuid() + 1):
+            with self.assertRaisesRegex(NonRecoverableError, 'owned by'):
+                self._auth().access_token()
+
+    def test_invalidate_keeps_newer_token(self):
+        first, second = self._auth(), self._auth()
+        with requests_mock.Mocker() as m:
+            self._register_token(m)
+            self.assertEqual(first.access_token(), 'token1')
+            self.assertEqual(second.access_token(), 'token1')
+            first.invalidate()
+            self.assertEqual(first.access_token(), 'token2')
+            # Rejected too, the token refreshed by the first is reused.
+            second.invalidate()
+            self.assertEqual(second.access_token(), 'token2')
+            self.assertEqual(m.call_count, 2)
+
+    def test_client_uses_bearer_token(self):
+        sol_client = client.Client(
+            credentials=client.Credentials(oauth2=self.oauth2),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with requests_mock.Mocker() as m:
+            self._register_token(m)
+            m.register_uri('GET', self.ENDPOINT_URL + '/path', json={})
+            sol_client.get('/path', "")
+            sol_client.get('/path', "")
+            self.assertEqual(
+                m.last_request.headers['Authorization'],
+                'Bearer token1'
+            )
+            self.assertEqual(m.call_count, 3)
+
+    def test_client_refreshes_rejected_token(self):
+        sol_client = client.Client(
+            credentials=client.Credentials(oauth2=self.oauth2),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with requests_mock.Mocker() as m:
+            self._register_token(m)
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                [
+                    {'status_code': 401},
+                    {'json': {'id': '1'},
+                     'headers': {'Content-Type': 'application/json'}}
+                ]
+            )
+            self.assertEqual(sol_client.get('/path', ""), {'id': '1'})
+            self.assertEqual(
+                m.last_request.headers['Authorization'],
+                'Bearer token2'
+            )
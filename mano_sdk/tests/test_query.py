@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk.query import build_query_params
+
+
+class TestQuery(TestCase):
+
+    def test_no_selectors(self):
+        self.assertEqual(build_query_params(), "")
+
+    def test_filter(self):
+        self.assertEqual(
+            build_query_params(filter="(eq,operationalState,ENABLED)"),
+            {'filter': '(eq,operationalState,ENABLED)'}
+        )
+        self.assertEqual(
+            build_query_params(filter=[
+                "(eq,operationalState,ENABLED)",
+                "(eq,vnfProvider,test)"
+            ]),
+            {'filter': '(eq,operationalState,ENABLED);(eq,vnfProvider,test)'}
+        )
+
+    def test_fields_with_exclude_default(self):
+        self.assertEqual(
+            build_query_params(fields=["error", "operationParams"],
+                               exclude_default=True),
+            {
+                'fields': 'error,operationParams',
+                'exclude_default': ''
+            }
+        )
+
+    def test_all_fields(self):
+        self.assertEqual(
+            build_query_params(all_fields=True),
+            {'all_fields': ''}
+        )
+
+    def test_invalid_combinations(self):
+        with self.assertRaises(NonRecoverableError):
+            build_query_params(all_fields=True, fields="error")
+        with self.assertRaises(NonRecoverableError):
+            build_query_params(exclude_fields="error", exclude_default=True)
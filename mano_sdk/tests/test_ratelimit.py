@@ -0,0 +1,84 @@
+import logging
+import multiprocessing
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import requests_mock
+
+from mano_sdk import client as client
+from mano_sdk import ratelimit
+
+
+def _reserve(state_dir):
+    limiter = ratelimit.RateLimiter('https://nfvo', 0.001, 10, state_dir)
+    return [limiter.reserve() for _ in range(4)]
+
+
+class TestRateLimiter(TestCase):
+
+    def setUp(self) -> None:
+        self.state_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.state_dir)
+        self.now = 1000.0
+        patcher = mock.patch(
+            'mano_sdk.ratelimit.time.time',
+            lambda: self.now
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _limiter(self):
+        return ratelimit.RateLimiter('https://nfvo', 2, 3, self.state_dir)
+
+    def test_burst_then_rate(self):
+        limiter = self._limiter()
+        self.assertEqual(
+            [limiter.reserve() for _ in range(5)],
+            [0.0, 0.0, 0.0, 0.5, 1.0]
+        )
+        self.now += 1.0
+        self.assertEqual(limiter.reserve(), 0.5)
+
+    def test_refill_is_capped_by_burst(self):
+        limiter = self._limiter()
+        limiter.reserve()
+        self.now += 60.0
+        self.assertEqual(
+            [limiter.reserve() for _ in range(4)],
+            [0.0, 0.0, 0.0, 0.5]
+        )
+
+    def test_bucket_shared_by_limiters(self):
+        first, second = self._limiter(), self._limiter()
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.0)
+        self.assertEqual(first.reserve(), 0.0)
+        self.assertEqual(second.reserve(), 0.5)
+
+    def test_bucket_shared_by_processes(self):
+        with multiprocessing.get_context('spawn').Pool(3) as pool:
+            delays = pool.map(_reserve, [self.state_dir] * 3)
+        self.assertEqual(
+            len([delay for batch in delays for delay in batch if delay]),
+            2
+        )
+
+    def test_client_waits_for_token(self):
+        self.addCleanup(ratelimit.clear_rate_limiters)
+        sol_client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url="https://test_aws.amazonaws.com",
+            logger=logging.getLogger(),
+            rate_limit={'rate': 2, 'burst': 1, 'state_dir': self.state_dir}
+        )
+        with requests_mock.Mocker() as m, \
+                mock.patch('mano_sdk.client.time.sleep') as sleep:
+            m.register_uri(
+                'GET',
+                'https://test_aws.amazonaws.com/path',
+                json={}
+            )
+            sol_client.get('/path', "")
+            sol_client.get('/path', "")
+        sleep.assert_called_once_with(0.5)
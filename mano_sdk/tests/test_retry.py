@@ -0,0 +1,175 @@
+import io
+import logging
+from unittest import TestCase, mock
+
+import requests
+import requests_mock
+from cloudify.exceptions import NonRecoverableError, RecoverableError
+
+from mano_sdk import client as client
+from mano_sdk.retry import RetryPolicy
+
+
+class TestRetryPolicy(TestCase):
+
+    def test_idempotent_methods(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable('GET', 502))
+        self.assertFalse(policy.is_retryable('POST', 502))
+        self.assertTrue(policy.is_retryable('POST', 503))
+        self.assertTrue(policy.is_retryable('PATCH', 429))
+        self.assertFalse(policy.is_retryable('GET', 500))
+        self.assertTrue(policy.is_retryable('DELETE'))
+        self.assertFalse(policy.is_retryable('POST'))
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.1, backoff_max=0.5, jitter=False)
+        self.assertEqual(
+            [policy.backoff(retry_number) for retry_number in range(4)],
+            [0.1, 0.2, 0.4, 0.5]
+        )
+
+    def test_backoff_jitter(self):
+        policy = RetryPolicy(backoff_factor=0.1)
+        for retry_number in range(5):
+            self.assertLessEqual(
+                policy.backoff(retry_number),
+                0.1 * 2 ** retry_number
+            )
+
+    def test_parse_retry_after(self):
+        self.assertEqual(RetryPolicy.parse_retry_after('2'), 2.0)
+        self.assertEqual(
+            RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'),
+            0.0
+        )
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+
+    def test_max_attempts(self):
+        retry = RetryPolicy(max_attempts=3, jitter=False).start()
+        self.assertIsNotNone(retry.next_delay('GET', 503))
+        self.assertIsNotNone(retry.next_delay('GET', 503))
+        self.assertIsNone(retry.next_delay('GET', 503))
+
+    def test_retry_budget(self):
+        retry = RetryPolicy(retry_budget=1.0).start()
+        self.assertEqual(retry.next_delay('GET', 503, {'Retry-After': '1'}), 1)
+        self.assertIsNone(retry.next_delay('GET', 503, {'Retry-After': '1'}))
+
+
+class TestClientRetry(TestCase):
+    USERNAME = "xxx"
+    PASSWORD = "yyy"
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    JSON_HEADERS = {'Content-Type': 'application/json'}
+
+    def setUp(self) -> None:
+        self.client = client.Client(
+            credentials=client.Credentials(
+                username=self.USERNAME,
+                password=self.PASSWORD
+            ),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            retry_policy={'backoff_factor': 0.001}
+        )
+
+    def test_transient_status_absorbed(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + '/path', [
+                {'status_code': 503},
+                {'status_code': 429, 'headers': {'Retry-After': '0'}},
+                {'json': {'id': '1'}, 'headers': self.JSON_HEADERS}
+            ])
+            self.assertEqual(self.client.get('/path', ''), {'id': '1'})
+            self.assertEqual(m.call_count, 3)
+
+    def test_non_idempotent_not_retried(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('POST', self.ENDPOINT_URL + '/path', [
+                {'status_code': 502},
+                {'json': {'id': '1'}, 'status_code': 201}
+            ])
+            with self.assertRaises(RecoverableError):
+                self.client.post('/path', '{}')
+            self.assertEqual(m.call_count, 1)
+
+    def test_exhausted_retries(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                status_code=503,
+                headers={'Retry-After': '0'}
+            )
+            with self.assertRaises(RecoverableError):
+                self.client.get('/path', '')
+            self.assertEqual(
+                m.call_count,
+                self.client.retry_policy.max_attempts
+            )
+
+    def test_client_error_not_retried(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + '/path', [
+                {'status_code': 404},
+                {'json': {'id': '1'}, 'headers': self.JSON_HEADERS}
+            ])
+            with self.assertRaises(NonRecoverableError):
+                self.client.get('/path', '')
+            self.assertEqual(m.call_count, 1)
+
+    def test_connection_error(self):
+        with requests_mock.Mocker() as m:
+            m.register_uri('GET', self.ENDPOINT_URL + '/path', [
+                {'exc': requests.exceptions.ConnectionError},
+                {'json': {'id': '1'}, 'headers': self.JSON_HEADERS}
+            ])
+            self.assertEqual(self.client.get('/path', ''), {'id': '1'})
+            m.register_uri(
+                'DELETE',
+                self.ENDPOINT_URL + '/path',
+                exc=requests.exceptions.ConnectionError
+            )
+            with self.assertRaises(RecoverableError):
+                self.client.delete('/path')
+
+    def test_body_rewound(self):
+        bodies = []
+
+        def _callback(request, context):
+            bodies.append(request.body.read())
+            context.status_code = 503 if len(bodies) == 1 else 202
+            return ''
+
+        with requests_mock.Mocker() as m:
+            m.register_uri('PUT', self.ENDPOINT_URL + '/path', text=_callback)
+            with mock.patch('time.sleep'):
+                self.client.put('/path', io.BytesIO(b'package'))
+        self.assertEqual(bodies, [b'package', b'package'])
+
+    def test_upload_read_timeout(self):
+        self.client.read_timeout = 60.0
+        with mock.patch(
+                'requests.Session.request',
+                side_effect=requests.exceptions.ReadTimeout
+        ) as request:
+            with self.assertRaises(RecoverableError):
+                self.client.put(
+                    '/path',
+                    io.BytesIO(b'0' * 2 * client.UPLOAD_READ_RATE),
+                    return_code=202
+                )
+            # Given time to process the body, and not sent again.
+            request.assert_called_once()
+            self.assertEqual(request.call_args[1]['timeout'][1], 62.0)
+            request.reset_mock()
+            with self.assertRaises(RecoverableError):
+                self.client.get('/path', '')
+            self.assertEqual(
+                request.call_count,
+                self.client.retry_policy.max_attempts
+            )
+            self.assertEqual(request.call_args[1]['timeout'][1], 60.0)
@@ -0,0 +1,112 @@
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase
+
+from mano_sdk import session
+from mano_sdk.function_package import FunctionPackage
+from mano_sdk.network_instance import NetworkInstance
+from mano_sdk.network_operation import NetworkOperation
+from mano_sdk.network_package import NetworkPackage
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSession(TestCase):
+    USERNAME = "xxx"
+    PASSWORD = "yyy"
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    OTHER_ENDPOINT_URL = "https://other_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+
+    def tearDown(self) -> None:
+        session.close_all_sessions()
+
+    def test_same_endpoint_shares_session(self):
+        self.assertIs(
+            session.get_session(self.ENDPOINT_URL),
+            session.get_session(self.ENDPOINT_URL + "/")
+        )
+
+    def test_connect_time(self):
+        server = HTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = 'http://127.0.0.1:{}'.format(server.server_port)
+        endpoint_session = session.get_session(url)
+        session.pop_connect_time()
+        endpoint_session.get(url)
+        self.assertGreater(session.pop_connect_time(), 0)
+        endpoint_session.get(url)
+        self.assertEqual(session.pop_connect_time(), 0)
+
+    def test_other_endpoint_gets_own_session(self):
+        self.assertIsNot(
+            session.get_session(self.ENDPOINT_URL),
+            session.get_session(self.OTHER_ENDPOINT_URL)
+        )
+
+    def test_pool_maxsize(self):
+        pooled = session.get_session(self.ENDPOINT_URL, pool_maxsize=25)
+        adapter = pooled.get_adapter(self.ENDPOINT_URL)
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    def test_close_session(self):
+        pooled = session.get_session(self.ENDPOINT_URL)
+        session.close_session(self.ENDPOINT_URL)
+        self.assertIsNot(pooled, session.get_session(self.ENDPOINT_URL))
+
+    def test_resources_share_session(self):
+        resources = [
+            resource_class(
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER,
+                username=self.USERNAME,
+                password=self.PASSWORD
+            )
+            for resource_class in [
+                FunctionPackage,
+                NetworkPackage,
+                NetworkInstance,
+                NetworkOperation
+            ]
+        ]
+        sessions = {id(resource.client.session) for resource in resources}
+        self.assertEqual(len(sessions), 1)
+
+    def test_credentials_get_own_session(self):
+        def resource(username):
+            return FunctionPackage(
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER,
+                username=username,
+                password=self.PASSWORD
+            )
+        self.assertIs(
+            resource(self.USERNAME).client.session,
+            resource(self.USERNAME).client.session
+        )
+        self.assertIsNot(
+            resource(self.USERNAME).client.session,
+            resource('other').client.session
+        )
+
+    def test_resource_close(self):
+        with FunctionPackage(
+                endpoint_url=self.ENDPOINT_URL,
+                logger=self.LOGGER,
+                username=self.USERNAME,
+                password=self.PASSWORD
+        ) as function_package:
+            pooled = function_package.client.session
+        self.assertIsNot(pooled, session.get_session(self.ENDPOINT_URL))
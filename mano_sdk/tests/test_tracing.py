@@ -0,0 +1,139 @@
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import requests_mock
+
+from mano_sdk import client as client
+from mano_sdk import tracing
+
+
+class RecordingExporter(tracing.SpanExporter):
+
+    def __init__(self):
+        self.spans = []
+        self.flushes = 0
+
+    def export(self, span):
+        self.spans.append(span)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TestTracing(TestCase):
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+
+    def test_child_spans(self):
+        exporter = RecordingExporter()
+        with tracing.start_span('root', exporters=[exporter]) as root:
+            self.assertTrue(tracing.tracing_enabled())
+            with tracing.start_span('child', {'key': 'value'}) as child:
+                self.assertIs(tracing.current_span(), child)
+        self.assertIsNone(tracing.current_span())
+        self.assertFalse(tracing.tracing_enabled())
+        self.assertEqual(exporter.spans, [child, root])
+        self.assertEqual(exporter.flushes, 1)
+        self.assertEqual(child.trace_id, root.trace_id)
+        self.assertEqual(child.parent_id, root.span_id)
+        self.assertRegex(
+            child.traceparent,
+            '^00-{}-[0-9a-f]{{16}}-01$'.format(root.trace_id)
+        )
+
+    def test_error_status(self):
+        exporter = RecordingExporter()
+        with self.assertRaises(ValueError):
+            with tracing.start_span('root', exporters=[exporter]):
+                raise ValueError('boom')
+        span, = exporter.spans
+        self.assertEqual(span.status, 'error')
+        self.assertEqual(span.attributes['exception'], 'ValueError: boom')
+
+    def test_console_exporter(self):
+        stream = io.StringIO()
+        with tracing.start_span(
+                'root',
+                exporters=[tracing.ConsoleExporter(stream)]
+        ):
+            pass
+        self.assertIn(' root ', stream.getvalue())
+
+    def test_jsonl_exporter(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'spans.jsonl')
+        exporters = tracing.get_exporters({'jsonl': path, 'console': False})
+        self.assertIs(tracing.get_exporters({'jsonl': path})[0], exporters[0])
+        with tracing.start_span('root', exporters=exporters):
+            with tracing.start_span('child'):
+                pass
+        with open(path) as spans_file:
+            spans = [json.loads(line) for line in spans_file]
+        self.assertEqual([span['name'] for span in spans], ['child', 'root'])
+
+    def test_exporter_errors_logged(self):
+        exporter = RecordingExporter()
+        broken = tracing.JsonlExporter(
+            os.path.join(tempfile.gettempdir(), 'missing', 'spans.jsonl')
+        )
+        with self.assertLogs('mano_sdk.tracing', 'WARNING') as logs:
+            with tracing.start_span('root', exporters=[broken, exporter]):
+                pass
+        self.assertEqual(len(exporter.spans), 1)
+        self.assertIn('not exported by JsonlExporter', logs.output[0])
+
+    def test_exporter_is_abstract(self):
+        with self.assertRaises(TypeError):
+            tracing.SpanExporter()
+
+    def test_otlp_exporter(self):
+        exporter = tracing.OtlpExporter()
+        with requests_mock.Mocker() as m:
+            m.register_uri('POST', tracing.DEFAULT_OTLP_ENDPOINT, json={})
+            with tracing.start_span('root', {'attempts': 2},
+                                    exporters=[exporter]):
+                with tracing.start_span('child'):
+                    pass
+            payload = m.last_request.json()
+        spans = payload['resourceSpans'][0]['scopeSpans'][0]['spans']
+        self.assertEqual([span['name'] for span in spans], ['child', 'root'])
+        self.assertEqual(
+            spans[1]['attributes'],
+            [{'key': 'attempts', 'value': {'intValue': '2'}}]
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri('POST', tracing.DEFAULT_OTLP_ENDPOINT,
+                           status_code=503)
+            with tracing.start_span('root', exporters=[exporter]):
+                pass
+        self.assertEqual(exporter.dropped, 1)
+
+    def test_client_request_span(self):
+        exporter = RecordingExporter()
+        sol_client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/sol/nslcm/v1/ns_instances/tp-1',
+                json={}
+            )
+            sol_client.get('/sol/nslcm/v1/ns_instances/tp-1', "")
+            self.assertNotIn('traceparent', m.last_request.headers)
+            with tracing.start_span('operation', exporters=[exporter]):
+                sol_client.get('/sol/nslcm/v1/ns_instances/tp-1', "")
+            traceparent = m.last_request.headers['traceparent']
+        span, root = exporter.spans
+        self.assertEqual(span.name, 'GET /sol/nslcm/v1/ns_instances/{id}')
+        self.assertEqual(span.parent_id, root.span_id)
+        self.assertEqual(span.attributes['http.status_code'], 200)
+        self.assertEqual(traceparent, span.traceparent)
@@ -0,0 +1,183 @@
+import logging
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+import requests
+import requests_mock
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk import client as client
+from mano_sdk import function_package as fp
+from mano_sdk import transport
+
+
+class TestTransport(TestCase):
+    USERNAME = "xxx"
+    PASSWORD = "yyy"
+    ENDPOINT_URL = "https://test_aws.amazonaws.com"
+    LOGGER = logging.getLogger()
+    FUNCTION_ID = "fc-034567decf2122745"
+    JSON_HEADERS = {'Content-Type': 'application/json'}
+
+    def setUp(self) -> None:
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.cassette = os.path.join(directory, 'lifecycle.jsonl')
+        self.addCleanup(transport.clear_transports)
+
+    def _package(self, mode, **options):
+        return fp.FunctionPackage(
+            self.ENDPOINT_URL,
+            self.LOGGER,
+            self.USERNAME,
+            self.PASSWORD,
+            transport=dict(mode=mode, cassette=self.cassette, **options)
+        )
+
+    def _lifecycle(self, package):
+        return [
+            package.create({"test": "tag"}),
+            package.get(self.FUNCTION_ID),
+            package.get(self.FUNCTION_ID),
+            package.update(self.FUNCTION_ID, "ENABLED")
+        ]
+
+    def _record(self):
+        package_url = '{}{}/{}'.format(
+            self.ENDPOINT_URL,
+            fp.SOL_FUNCTION_PACKAGE_PATH,
+            self.FUNCTION_ID
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'POST',
+                self.ENDPOINT_URL + fp.SOL_FUNCTION_PACKAGE_PATH,
+                status_code=201,
+                headers=self.JSON_HEADERS,
+                json={'id': self.FUNCTION_ID}
+            )
+            m.register_uri(
+                'GET',
+                package_url,
+                [
+                    {'headers': self.JSON_HEADERS,
+                     'json': {'onboardingState': 'PROCESSING'}},
+                    {'headers': self.JSON_HEADERS,
+                     'json': {'onboardingState': 'ONBOARDED'}}
+                ]
+            )
+            m.register_uri(
+                'PATCH',
+                package_url,
+                headers=self.JSON_HEADERS,
+                json={'operationalState': 'ENABLED'}
+            )
+            return self._lifecycle(self._package('record'))
+
+    def test_record_and_replay(self):
+        recorded = self._record()
+        with open(self.cassette) as cassette:
+            content = cassette.read()
+        self.assertNotIn(self.PASSWORD, content)
+        self.assertNotIn('Authorization', content)
+        transport.clear_transports()
+        package = self._package('replay')
+        self.assertEqual(self._lifecycle(package), recorded)
+        self.assertEqual(package.client.transport.remaining(), 0)
+        with self.assertRaisesRegex(NonRecoverableError, 'No recorded'):
+            package.get(self.FUNCTION_ID)
+
+    def test_reproduce_latency(self):
+        self._record()
+        transport.clear_transports()
+        package = self._package('replay', reproduce_latency=True)
+        with mock.patch('mano_sdk.transport.time.sleep') as sleep:
+            package.create({"test": "tag"})
+        sleep.assert_called_once()
+
+    def test_replay_connection_error(self):
+        sol_client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            retry_policy={'backoff_factor': 0.001},
+            transport={'mode': 'record', 'cassette': self.cassette}
+        )
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'GET',
+                self.ENDPOINT_URL + '/path',
+                [
+                    {'exc': requests.exceptions.ConnectionError},
+                    {'headers': self.JSON_HEADERS, 'json': {'id': '1'}}
+                ]
+            )
+            self.assertEqual(sol_client.get('/path', ""), {'id': '1'})
+        sol_client.transport = transport.ReplayTransport(self.cassette)
+        self.assertEqual(sol_client.get('/path', ""), {'id': '1'})
+        self.assertEqual(sol_client.transport.remaining(), 0)
+
+    def test_replay_resumes_across_transports(self):
+        recorded = self._record()
+        transport.clear_transports()
+        package = self._package('replay')
+        self.assertEqual(package.create({"test": "tag"}), recorded[0])
+        self.assertEqual(package.get(self.FUNCTION_ID), recorded[1])
+        # Another operation, possibly in another process, carries on.
+        transport.clear_transports()
+        package = self._package('replay')
+        self.assertEqual(package.get(self.FUNCTION_ID), recorded[2])
+        self.assertEqual(package.client.transport.remaining(), 1)
+        package.client.transport.rewind()
+        self.assertEqual(self._lifecycle(package), recorded)
+
+    def test_recording_again_restarts_replay(self):
+        recorded = self._record()
+        transport.clear_transports()
+        package = self._package('replay')
+        self._lifecycle(package)
+        os.remove(self.cassette)
+        self._record()
+        transport.clear_transports()
+        package = self._package('replay')
+        self.assertEqual(self._lifecycle(package), recorded)
+
+    def test_replay_matches_body(self):
+        sol_client = client.Client(
+            credentials=client.Credentials(token="zzz"),
+            endpoint_url=self.ENDPOINT_URL,
+            logger=self.LOGGER,
+            compress_threshold=8,
+            transport={'mode': 'record', 'cassette': self.cassette}
+        )
+        bodies = ['{"name": "first"}', '{"name": "second"}']
+        with requests_mock.Mocker() as m:
+            m.register_uri(
+                'POST',
+                self.ENDPOINT_URL + '/path',
+                [
+                    {'status_code': 201, 'headers': self.JSON_HEADERS,
+                     'json': {'id': '1'}},
+                    {'status_code': 201, 'headers': self.JSON_HEADERS,
+                     'json': {'id': '2'}}
+                ]
+            )
+            for body in bodies:
+                sol_client.post('/path', body)
+        with open(self.cassette) as cassette:
+            self.assertNotIn('first', cassette.read())
+        sol_client.transport = transport.ReplayTransport(self.cassette)
+        # Gzipped bodies match whenever they are compressed.
+        with mock.patch('gzip.time.time', return_value=0):
+            self.assertEqual(
+                sol_client.post('/path', bodies[1]),
+                {'id': '2'}
+            )
+            self.assertEqual(
+                sol_client.post('/path', bodies[0]),
+                {'id': '1'}
+            )
+            with self.assertRaisesRegex(NonRecoverableError, 'No recorded'):
+                sol_client.post('/path', '{"name": "third"}')
@@ -0,0 +1,220 @@
+import logging
+import os
+import re
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, mock
+
+from cloudify.exceptions import NonRecoverableError
+
+from mano_sdk import client, session, upload
+
+PACKAGE_PATH = '/sol/vnfpkgm/v1/vnf_packages/1/package_content'
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+        Receives package content whole or in `Content-Range` chunks. The
+        server drops the connection halfway through the chunks listed in
+        `server.drop_chunks`, keeping what it read, and answers `503` to
+        those listed in `server.busy_chunks`.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self, status, headers=None, body=b''):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _received(self):
+        received = len(self.server.content)
+        if not received:
+            return {}
+        return {'Range': 'bytes=0-{}'.format(received - 1)}
+
+    def do_PUT(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        content_range = self.headers.get('Content-Range')
+        server.requests.append(content_range)
+        if server.ignore_range:
+            # Every PUT replaces the content, whatever its Content-Range.
+            server.content = bytearray(self.rfile.read(length))
+            return self._reply(
+                202,
+                {'Content-Type': 'application/json'},
+                b'{"id": "1"}'
+            )
+        if content_range is None:
+            server.content = bytearray(self.rfile.read(length))
+            return self._reply(202)
+        if not server.partial:
+            self.rfile.read(length)
+            return self._reply(400)
+        if content_range.startswith('bytes */'):
+            return self._reply(308, self._received())
+        start, end, total = map(int, CONTENT_RANGE.match(
+            content_range
+        ).groups())
+        if start != len(server.content):
+            self.rfile.read(length)
+            return self._reply(416)
+        if start in server.busy_chunks:
+            server.busy_chunks.remove(start)
+            self.rfile.read(length)
+            return self._reply(503)
+        if start in server.drop_chunks:
+            server.drop_chunks.remove(start)
+            server.content += self.rfile.read(length // 2)
+            self.close_connection = True
+            return
+        server.content += self.rfile.read(length)
+        if end + 1 == total:
+            return self._reply(202)
+        return self._reply(308, self._received())
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUpload(TestCase):
+    LOGGER = logging.getLogger()
+    CHUNK_SIZE = 64 * 1024
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.content = bytearray()
+        self.server.requests = []
+        self.server.partial = True
+        self.server.ignore_range = False
+        self.server.drop_chunks = set()
+        self.server.busy_chunks = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True) \
+            .start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(session.close_all_sessions)
+        self.client = client.Client(
+            credentials=client.Credentials(username='xxx', password='yyy'),
+            endpoint_url='http://127.0.0.1:{}'.format(
+                self.server.server_port
+            ),
+            logger=self.LOGGER,
+            retry_policy={'max_attempts': 1}
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.content = os.urandom(self.CHUNK_SIZE * 3 + 100)
+        self.file_path = os.path.join(directory.name, 'package.zip')
+        with open(self.file_path, 'wb') as package_file:
+            package_file.write(self.content)
+
+    def _upload(self, **kwargs):
+        return upload.upload_file(
+            self.client,
+            PACKAGE_PATH,
+            self.file_path,
+            'application/zip',
+            **kwargs
+        )
+
+    def test_single_request(self):
+        progress = mock.Mock()
+        self._upload(progress=progress)
+        self.assertEqual(bytes(self.server.content), self.content)
+        self.assertEqual(self.server.requests, [None])
+        progress.assert_called_with(len(self.content), len(self.content))
+
+    def test_chunks(self):
+        sent = []
+        self._upload(
+            chunk_size=self.CHUNK_SIZE,
+            progress=lambda done, total: sent.append(done)
+        )
+        self.assertEqual(bytes(self.server.content), self.content)
+        self.assertEqual(self.server.requests, [
+            'bytes 0-65535/196708',
+            'bytes 65536-131071/196708',
+            'bytes 131072-196607/196708',
+            'bytes 196608-196707/196708'
+        ])
+        self.assertEqual(sent, sorted(sent))
+        self.assertEqual(sent[-1], len(self.content))
+
+    def test_resume_after_dropped_chunk(self):
+        self.server.drop_chunks.add(self.CHUNK_SIZE)
+        self._upload(chunk_size=self.CHUNK_SIZE)
+        self.assertEqual(bytes(self.server.content), self.content)
+        self.assertIn(
+            'bytes 98304-163839/196708',
+            self.server.requests
+        )
+
+    def test_resume_after_busy_chunk(self):
+        self.server.busy_chunks.add(self.CHUNK_SIZE)
+        self._upload(chunk_size=self.CHUNK_SIZE)
+        self.assertEqual(bytes(self.server.content), self.content)
+        self.assertEqual(self.server.requests[1:4], [
+            'bytes 65536-131071/196708',
+            'bytes */196708',
+            'bytes 65536-131071/196708'
+        ])
+
+    def test_resume_interrupted_upload(self):
+        self.server.content = bytearray(self.content[:1000])
+        self._upload(chunk_size=self.CHUNK_SIZE)
+        self.assertEqual(bytes(self.server.content), self.content)
+        # The NFVO answers 416 to the first chunk, then tells what it
+        # holds.
+        self.assertEqual(self.server.requests, [
+            'bytes 0-65535/196708',
+            'bytes */196708',
+            'bytes 1000-66535/196708',
+            'bytes 66536-132071/196708',
+            'bytes 132072-196707/196708'
+        ])
+
+    def test_partial_upload_not_supported(self):
+        self.server.partial = False
+        self._upload(chunk_size=self.CHUNK_SIZE)
+        self.assertEqual(bytes(self.server.content), self.content)
+        self.assertEqual(self.server.requests, [
+            'bytes 0-65535/196708',
+            None
+        ])
+
+    def test_content_range_ignored(self):
+        self.server.ignore_range = True
+        with self.assertRaisesRegex(NonRecoverableError, 'whole content'):
+            self._upload(chunk_size=self.CHUNK_SIZE)
+        self.assertEqual(self.server.requests, ['bytes 0-65535/196708'])
+
+    def test_file_section(self):
+        with open(self.file_path, 'rb') as package_file:
+            section = upload.FileSection(package_file, 10, 20, 100)
+            self.assertEqual(len(section), 20)
+            self.assertEqual(section.read(5), self.content[10:15])
+            self.assertEqual(section.tell(), 5)
+            self.assertEqual(section.read(), self.content[15:30])
+            self.assertEqual(section.read(), b'')
+            section.seek(0)
+            self.assertEqual(section.read(100), self.content[10:30])
+
+    def test_log_progress(self):
+        logger = mock.Mock()
+        progress = upload.log_progress(logger, 'package.zip', step=50)
+        for sent in (10, 40, 60, 90, 100):
+            progress(sent, 100)
+        self.assertEqual(
+            [call.args[0] for call in logger.info.call_args_list],
+            [
+                'Uploaded 10% of package.zip (10/100 bytes).',
+                'Uploaded 60% of package.zip (60/100 bytes).',
+                'Uploaded 100% of package.zip (100/100 bytes).'
+            ]
+        )
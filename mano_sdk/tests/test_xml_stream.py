@@ -0,0 +1,92 @@
+import os
+from unittest import TestCase
+
+import xmltodict
+
+from mano_sdk.xml_stream import XmlItemParser
+
+
+class TestXmlStream(TestCase):
+    LIST_XML = (
+        b'<VnfPkgInfos xmlns="urn:etsi:sol005">'
+        b'<VnfPkgInfo id="fc-1"><operationalState>ENABLED</operationalState>'
+        b'<tags><tag>a</tag><tag>b</tag></tags></VnfPkgInfo>'
+        b'<VnfPkgInfo id="fc-2"><operationalState>DISABLED'
+        b'</operationalState><note lang="en">text</note><empty/>'
+        b'</VnfPkgInfo>'
+        b'</VnfPkgInfos>'
+    )
+
+    def _parse(self, document, chunk_size):
+        parser = XmlItemParser()
+        items = []
+        for start in range(0, len(document), chunk_size):
+            items.extend(parser.feed(document[start:start + chunk_size]))
+        items.extend(parser.close())
+        return items
+
+    NAMESPACED_XML = (
+        b'<sol:VnfPkgInfos xmlns:sol="urn:etsi:sol005" '
+        b'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        b'<sol:VnfPkgInfo sol:id="fc-1" xsi:type="sol:VnfPkgInfo">'
+        b'<sol:operationalState>ENABLED</sol:operationalState>'
+        b'<ext:vendor xmlns:ext="urn:acme" xml:lang="en">acme</ext:vendor>'
+        b'</sol:VnfPkgInfo>'
+        b'<VnfPkgInfo xmlns="urn:etsi:sol005" id="fc-2">'
+        b'<operationalState>DISABLED</operationalState>'
+        b'<sol:usageState>IN_USE</sol:usageState>'
+        b'<link xmlns="urn:other">/fc-2</link>'
+        b'</VnfPkgInfo>'
+        b'</sol:VnfPkgInfos>'
+    )
+
+    def test_items_match_xmltodict(self):
+        expected = xmltodict.parse(
+            self.LIST_XML,
+            dict_constructor=dict
+        )['VnfPkgInfos']['VnfPkgInfo']
+        for chunk_size in [7, 64, len(self.LIST_XML)]:
+            self.assertEqual(self._parse(self.LIST_XML, chunk_size), expected)
+
+    def test_namespaced_items_match_xmltodict(self):
+        root = xmltodict.parse(
+            self.NAMESPACED_XML,
+            dict_constructor=dict
+        )['sol:VnfPkgInfos']
+        expected = [root['sol:VnfPkgInfo'], root['VnfPkgInfo']]
+        self.assertEqual(expected[0]['ext:vendor']['@xml:lang'], 'en')
+        for chunk_size in [5, 64, len(self.NAMESPACED_XML)]:
+            self.assertEqual(
+                self._parse(self.NAMESPACED_XML, chunk_size),
+                expected
+            )
+
+    def test_testdata_matches_xmltodict(self):
+        test_data_path = os.path.join(
+            os.path.dirname(__file__),
+            "testdata/response.xml"
+        )
+        with open(test_data_path, 'rb') as f:
+            document = f.read()
+        root = xmltodict.parse(document, dict_constructor=dict)['results']
+        self.assertEqual(
+            self._parse(document, 16),
+            [root['status'], root['hits']]
+        )
+
+    def test_items_not_kept(self):
+        parser = XmlItemParser()
+        parser.feed(self.LIST_XML[:-len(b'</VnfPkgInfos>')])
+        # The root keeps its attributes only.
+        self.assertEqual(parser._item, {'@xmlns': 'urn:etsi:sol005'})
+
+    def test_text(self):
+        parser = XmlItemParser()
+        self.assertEqual(
+            parser.feed(b'<root><id>1</id><id>2</id><x a="1">t</x>'),
+            ['1', '2', {'@a': '1', '#text': 't'}]
+        )
+        self.assertEqual(
+            parser.feed(b'<y>a<z/>b</y><empty/></root>'),
+            [{'z': None, '#text': 'ab'}, None]
+        )
@@ -0,0 +1,313 @@
+"""
+    mano_sdk.tracing
+    ~~~~~~~~
+    Lightweight spans with W3C trace context propagation.
+"""
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import requests
+
+DEFAULT_OTLP_ENDPOINT = 'http://localhost:4318/v1/traces'
+SERVICE_NAME = 'cloudify-mano-plugin'
+
+_current_span: ContextVar[Optional['Span']] = ContextVar(
+    'mano_sdk_span',
+    default=None
+)
+_default_exporters: List['SpanExporter'] = []
+_exporters: Dict[tuple, 'SpanExporter'] = {}
+_exporters_lock = threading.Lock()
+# Spans carry no logger of their own, exporter failures are logged here.
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """
+        Timed unit of work. Spans started while another one is current
+        become its children and share its trace id and exporters.
+    """
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'attributes',
+                 'start_time', 'end_time', 'status', 'exporters', 'root')
+
+    def __init__(
+            self,
+            name: str,
+            parent: Optional['Span'] = None,
+            attributes: Optional[Dict[str, Any]] = None,
+            exporters: Sequence['SpanExporter'] = ()
+    ):
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.root = parent.root if parent else self
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.exporters = parent.exporters if parent else list(exporters)
+        self.start_time = time.time()
+        self.end_time = None
+        self.status = 'ok'
+
+    @property
+    def traceparent(self) -> str:
+        """
+            W3C `traceparent` header value of the span.
+        """
+        return '00-{}-{}-01'.format(self.trace_id, self.span_id)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        """
+            Ends the span and hands it to its exporters. Exporter errors
+            are logged, tracing never fails the traced work.
+        """
+        self.end_time = time.time()
+        for exporter in self.exporters:
+            try:
+                exporter.export(self)
+                if self.root is self:
+                    exporter.flush()
+            except Exception as e:
+                logger.warning(
+                    'Span {} of trace {} not exported by {}: {}'.format(
+                        self.name,
+                        self.trace_id,
+                        type(exporter).__name__,
+                        e
+                    )
+                )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'duration': self.duration,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def tracing_enabled() -> bool:
+    """
+        Whether new spans would be exported anywhere.
+    """
+    span = _current_span.get()
+    return bool(span.exporters if span else _default_exporters)
+
+
+@contextmanager
+def start_span(
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        exporters: Optional[Sequence['SpanExporter']] = None
+) -> Iterator[Span]:
+    """
+        Runs the block inside a new span, child of the current one. A
+        root span is exported to `exporters`, by default those set with
+        `configure_tracing`; children go where their root goes. The span
+        status becomes `error` when the block raises.
+    """
+    parent = _current_span.get()
+    span = Span(
+        name,
+        parent=parent,
+        attributes=attributes,
+        exporters=_default_exporters if exporters is None else exporters
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = 'error'
+        span.set_attribute('exception', '{}: {}'.format(
+            type(e).__name__,
+            e
+        ))
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def configure_tracing(exporters: Sequence['SpanExporter']) -> None:
+    """
+        Sets exporters of root spans started without explicit ones.
+    """
+    _default_exporters[:] = list(exporters)
+
+
+class SpanExporter(ABC):
+    """
+        Receives ended spans. `flush` is called when a root span ends.
+    """
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """
+            Records an ended span.
+        """
+
+    def flush(self) -> None:
+        pass
+
+
+class ConsoleExporter(SpanExporter):
+    """
+        Prints one line per span.
+    """
+
+    def __init__(self, stream: Any = None):
+        self.stream = stream
+
+    def export(self, span: Span) -> None:
+        stream = self.stream or sys.stderr
+        stream.write('[trace {} span {}] {} {:.3f}s {} {}\n'.format(
+            span.trace_id,
+            span.span_id,
+            span.name,
+            span.duration,
+            span.status,
+            json.dumps(span.attributes, default=str)
+        ))
+
+
+class JsonlExporter(SpanExporter):
+    """
+        Appends spans to `path`, one JSON document per line.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + '\n'
+        with self._lock:
+            with open(self.path, 'a') as spans_file:
+                spans_file.write(line)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class OtlpExporter(SpanExporter):
+    """
+        Sends spans of a trace to an OpenTelemetry collector with
+        OTLP/HTTP JSON once its root span ends. Failures to reach the
+        collector drop the spans, they never fail an operation.
+    """
+
+    def __init__(
+            self,
+            endpoint: str = DEFAULT_OTLP_ENDPOINT,
+            timeout: float = 2.0
+    ):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.dropped = 0
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def payload(self, spans: Sequence[Span]) -> Dict[str, Any]:
+        return {'resourceSpans': [{
+            'resource': {'attributes': [{
+                'key': 'service.name',
+                'value': {'stringValue': SERVICE_NAME}
+            }]},
+            'scopeSpans': [{
+                'scope': {'name': 'mano_sdk'},
+                'spans': [{
+                    'traceId': span.trace_id,
+                    'spanId': span.span_id,
+                    'parentSpanId': span.parent_id or '',
+                    'name': span.name,
+                    'kind': 3 if span.parent_id else 1,
+                    'startTimeUnixNano': str(int(span.start_time * 1e9)),
+                    'endTimeUnixNano': str(int(span.end_time * 1e9)),
+                    'attributes': [
+                        {'key': key, 'value': _otlp_value(value)}
+                        for key, value in span.attributes.items()
+                    ],
+                    'status': {'code': 2 if span.status == 'error' else 1}
+                } for span in spans]
+            }]
+        }]}
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._spans = self._spans, []
+        if not spans:
+            return
+        try:
+            requests.post(
+                self.endpoint,
+                json=self.payload(spans),
+                timeout=self.timeout
+            ).raise_for_status()
+        except requests.exceptions.RequestException:
+            self.dropped += len(spans)
+
+
+def get_exporters(config: Optional[Dict[str, Any]]) -> List[SpanExporter]:
+    """
+        Exporters described by `config`, shared by callers giving the
+        same settings: `console` (bool), `jsonl` (file path), `otlp`
+        (collector url, or True for the local default).
+    """
+    exporters = []
+    for kind, value in sorted((config or {}).items()):
+        if not value:
+            continue
+        key = (kind, value)
+        with _exporters_lock:
+            exporter = _exporters.get(key)
+            if exporter is None:
+                if kind == 'console':
+                    exporter = ConsoleExporter()
+                elif kind == 'jsonl':
+                    exporter = JsonlExporter(os.path.expanduser(value))
+                elif kind == 'otlp':
+                    exporter = OtlpExporter(
+                        DEFAULT_OTLP_ENDPOINT if value is True else value
+                    )
+                else:
+                    continue
+                _exporters[key] = exporter
+        exporters.append(exporter)
+    return exporters
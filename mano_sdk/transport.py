@@ -0,0 +1,333 @@
+"""
+    mano_sdk.transport
+    ~~~~~~~~
+    Pluggable transports under `Client`, with record/replay cassettes.
+"""
+import base64
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from cloudify.exceptions import NonRecoverableError
+from requests.structures import CaseInsensitiveDict
+
+from mano_sdk.upload import FileSection
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Headers describing the body on the wire, which is stored decoded.
+WIRE_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+# Suffix of the file next to a cassette holding the replay position.
+CURSOR_SUFFIX = '.cursor'
+BODY_BLOCK_SIZE = 1024 * 1024
+
+_transports: Dict[Tuple[str, str], 'Transport'] = {}
+_transports_lock = threading.Lock()
+
+
+class Transport:
+    """
+        Sends a request through the pooled session of the endpoint.
+        Subclasses may record, replay or alter exchanges.
+    """
+
+    def request(
+            self,
+            session: requests.Session,
+            method: str,
+            url: str,
+            **kwargs
+    ) -> requests.Response:
+        return session.request(method, url, **kwargs)
+
+
+def _request_url(method: str, url: str, params: Any) -> str:
+    return requests.Request(method, url, params=params).prepare().url
+
+
+def _body_sha256(
+        data: Any,
+        headers: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+        SHA-256 of a request body, None without body. Gzipped bodies are
+        hashed decoded, as the gzip header holds the time. File bodies
+        are read from their position and rewound.
+    """
+    if isinstance(data, bytes) and \
+            CaseInsensitiveDict(headers or {}).get('Content-Encoding') == \
+            'gzip':
+        data = gzip.decompress(data)
+    if data is None or isinstance(data, (str, bytes)) and not data:
+        return None
+    digest = hashlib.sha256()
+    if isinstance(data, FileSection):
+        # A copy, so upload progress is not reported while hashing.
+        data = FileSection(data.file, data.start, data.length, data.total)
+    if hasattr(data, 'read'):
+        position = data.tell()
+        for block in iter(lambda: data.read(BODY_BLOCK_SIZE), b''):
+            digest.update(block)
+        data.seek(position)
+    else:
+        digest.update(data.encode('utf-8') if isinstance(data, str) else data)
+    return digest.hexdigest()
+
+
+def _read_cursor(fd: int) -> Optional[Dict[str, Any]]:
+    content = b''
+    while True:
+        block = os.read(fd, BODY_BLOCK_SIZE)
+        if not block:
+            break
+        content += block
+    try:
+        cursor = json.loads(content.decode('utf-8'))
+    except ValueError:
+        return None
+    return cursor if isinstance(cursor, dict) else None
+
+
+def _interaction_key(request: Dict[str, Any]) -> str:
+    return json.dumps(
+        [request['method'], request['url'], request.get('body_sha256')]
+    )
+
+
+class RecordingTransport(Transport):
+    """
+        Sends requests for real and appends each exchange (request,
+        response, timing, or connection error) to `cassette`, one JSON
+        document per line. Credentials are not recorded, request bodies
+        only by their SHA-256.
+    """
+
+    def __init__(self, cassette: str):
+        self.cassette = cassette
+        self._lock = threading.Lock()
+
+    def request(
+            self,
+            session: requests.Session,
+            method: str,
+            url: str,
+            **kwargs
+    ) -> requests.Response:
+        interaction = {
+            'request': {
+                'method': method,
+                'url': _request_url(method, url, kwargs.get('params'))
+            }
+        }
+        body_sha256 = _body_sha256(
+            kwargs.get('data'),
+            kwargs.get('headers')
+        )
+        if body_sha256 is not None:
+            interaction['request']['body_sha256'] = body_sha256
+        start = time.perf_counter()
+        try:
+            response = super().request(session, method, url, **kwargs)
+            # Read the body now, streaming callers get it from memory.
+            content = response.content
+        except requests.exceptions.RequestException as e:
+            interaction['error'] = type(e).__name__
+            interaction['elapsed'] = time.perf_counter() - start
+            self._write(interaction)
+            raise
+        interaction['elapsed'] = time.perf_counter() - start
+        interaction['response'] = {
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in WIRE_HEADERS
+            },
+            'body': base64.b64encode(content).decode('ascii')
+        }
+        self._write(interaction)
+        return response
+
+    def _write(self, interaction: Dict[str, Any]) -> None:
+        line = json.dumps(interaction, sort_keys=True) + '\n'
+        with self._lock:
+            with open(self.cassette, 'a') as cassette:
+                cassette.write(line)
+
+
+class ReplayTransport(Transport):
+    """
+        Serves exchanges recorded by `RecordingTransport` without any
+        network. Requests are matched by method, url and body; repeated
+        requests (e.g. polling) get the recorded responses in order.
+        With `reproduce_latency` each response is delayed by the time
+        the real one took.
+
+        The responses served of each request are counted in a cursor
+        file next to the cassette, shared under a lock by all replays of
+        the cassette, so a replay carries on across operations and
+        processes. It starts over once the cassette changes, or with
+        `rewind`.
+    """
+
+    def __init__(self, cassette: str, reproduce_latency: bool = False):
+        self.cassette = cassette
+        self.cursor = cassette + CURSOR_SUFFIX
+        self.reproduce_latency = reproduce_latency
+        self._interactions: Dict[str, List[Dict[str, Any]]] = \
+            defaultdict(list)
+        self._lock = threading.Lock()
+        with open(cassette) as cassette_file:
+            stat = os.fstat(cassette_file.fileno())
+            for line in cassette_file:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                self._interactions[
+                    _interaction_key(interaction['request'])
+                ].append(interaction)
+        # Identifies the recording the cursor file counts replays of.
+        self._recording = [stat.st_mtime_ns, stat.st_size]
+
+    @contextmanager
+    def _shared_cursor(self) -> Iterator[Dict[str, int]]:
+        """
+            Yields the responses served of each request, locked, and
+            writes them back when the block exits.
+        """
+        with self._lock:
+            fd = os.open(self.cursor, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                cursor = _read_cursor(fd)
+                if cursor is None or \
+                        cursor.get('recording') != self._recording:
+                    cursor = {'recording': self._recording, 'replayed': {}}
+                before = dict(cursor['replayed'])
+                yield cursor['replayed']
+                if cursor['replayed'] != before:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.ftruncate(fd, 0)
+                    os.write(fd, json.dumps(cursor).encode('utf-8'))
+            finally:
+                # Closing the descriptor releases the lock.
+                os.close(fd)
+
+    def rewind(self) -> None:
+        """
+            Replays the cassette from the start again.
+        """
+        with self._lock:
+            try:
+                os.remove(self.cursor)
+            except FileNotFoundError:
+                pass
+
+    def remaining(self) -> int:
+        """
+            Number of recorded exchanges not replayed yet.
+        """
+        with self._shared_cursor() as replayed:
+            return sum(
+                len(interactions) - replayed.get(key, 0)
+                for key, interactions in self._interactions.items()
+            )
+
+    def request(
+            self,
+            session: Optional[requests.Session],
+            method: str,
+            url: str,
+            **kwargs
+    ) -> requests.Response:
+        request_url = _request_url(method, url, kwargs.get('params'))
+        key = _interaction_key({
+            'method': method,
+            'url': request_url,
+            'body_sha256': _body_sha256(
+                kwargs.get('data'),
+                kwargs.get('headers')
+            )
+        })
+        interaction = None
+        interactions = self._interactions.get(key)
+        if interactions:
+            with self._shared_cursor() as replayed:
+                served = replayed.get(key, 0)
+                if served < len(interactions):
+                    interaction = interactions[served]
+                    replayed[key] = served + 1
+        if interaction is None:
+            raise NonRecoverableError(
+                'No recorded response for {} {} in cassette {}.'.format(
+                    method,
+                    request_url,
+                    repr(self.cassette)
+                )
+            )
+        if self.reproduce_latency:
+            time.sleep(interaction['elapsed'])
+        if 'error' in interaction:
+            error = getattr(
+                requests.exceptions,
+                interaction['error'],
+                requests.exceptions.ConnectionError
+            )
+            raise error('Replayed {}'.format(interaction['error']))
+        recorded = interaction['response']
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = recorded['reason']
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.raw = io.BytesIO(base64.b64decode(recorded['body']))
+        response.url = request_url
+        response.elapsed = datetime.timedelta(seconds=interaction['elapsed'])
+        return response
+
+
+def get_transport(
+        mode: str,
+        cassette: str,
+        reproduce_latency: bool = False
+) -> Transport:
+    """
+        Returns the `record` or `replay` transport of `cassette`, shared
+        by all clients of the process. Replays keep their position next
+        to the cassette, see `ReplayTransport`.
+    """
+    key = (mode, cassette)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            if mode == 'record':
+                transport = RecordingTransport(cassette)
+            elif mode == 'replay':
+                transport = ReplayTransport(cassette, reproduce_latency)
+            else:
+                raise NonRecoverableError(
+                    'Unknown transport mode {}.'.format(repr(mode))
+                )
+            _transports[key] = transport
+        return transport
+
+
+def clear_transports() -> None:
+    """
+        Forgets shared transports. Replay positions are kept, see
+        `ReplayTransport.rewind`.
+    """
+    with _transports_lock:
+        _transports.clear()
@@ -0,0 +1,313 @@
+"""
+    mano_sdk.upload
+    ~~~~~~~~
+    Streaming and resumable upload of package content.
+"""
+import io
+import os
+import re
+from typing import Any, BinaryIO, Callable, Optional
+
+from cloudify.exceptions import NonRecoverableError, RecoverableError
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+# Resumptions of a chunked upload after its chunk failed for good.
+MAX_RESUMES = 5
+# Status of a received chunk when more are expected.
+RESUME_INCOMPLETE = 308
+# Status of a chunk not starting where the content held by the NFVO ends.
+RANGE_NOT_SATISFIABLE = 416
+# Status of a first chunk refused by NFVOs without partial upload support.
+PARTIAL_UNSUPPORTED_STATUSES = (400, 501)
+RANGE_PATTERN = re.compile(r'^bytes=0-(\d+)$')
+
+Progress = Callable[[int, int], None]
+
+
+class FileSection:
+    """
+        Read-only window of `length` bytes of `file` starting at
+        `start`, read straight from the file so memory use does not grow
+        with its size. `progress` is called with the bytes read up to
+        now from the start of the file and the file size.
+
+        `len()` is the window size and `tell()` the position in it, as
+        requests expects to compute `Content-Length` of the body.
+    """
+
+    def __init__(
+            self,
+            file: BinaryIO,
+            start: int,
+            length: int,
+            total: int,
+            progress: Optional[Progress] = None
+    ):
+        self.file = file
+        self.start = start
+        self.length = length
+        self.total = total
+        self.progress = progress
+        self.position = 0
+
+    def __len__(self):
+        return self.length
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.length
+        self.position = max(0, min(offset, self.length))
+        return self.position
+
+    def read(self, size=-1):
+        left = self.length - self.position
+        if size is None or size < 0 or size > left:
+            size = left
+        if size <= 0:
+            return b''
+        self.file.seek(self.start + self.position)
+        data = self.file.read(size)
+        self.position += len(data)
+        if self.progress is not None:
+            self.progress(self.start + self.position, self.total)
+        return data
+
+
+def log_progress(logger: Any, name: str, step: int = 10) -> Progress:
+    """
+        Progress callback logging the upload of `name` every `step`
+        percent.
+    """
+    logged = {'percent': -step}
+
+    def progress(sent: int, total: int) -> None:
+        percent = 100 * sent // total if total else 100
+        if percent - logged['percent'] >= step or \
+                (percent == 100 and logged['percent'] != 100):
+            logged['percent'] = percent
+            logger.info('Uploaded {}% of {} ({}/{} bytes).'.format(
+                percent,
+                name,
+                sent,
+                total
+            ))
+    return progress
+
+
+def _received_bytes(headers: Any) -> int:
+    match = RANGE_PATTERN.match(headers.get('Range') or '')
+    return int(match.group(1)) + 1 if match else 0
+
+
+def _query_offset(
+        client: Any,
+        path: str,
+        content_type: str,
+        total: int
+) -> Optional[int]:
+    """
+        Asks the NFVO how much of the content it holds with an empty
+        `Content-Range: bytes */total` request. Returns the offset to
+        resume from, or None when the NFVO does not answer `308`.
+        Only sent once the NFVO showed it takes partial uploads, as
+        others could take the empty body as the whole content.
+        Completion is never inferred from the probe: the last chunk is
+        always sent.
+    """
+    response = client._send(
+        method="PUT",
+        path=path,
+        data="",
+        content_type=content_type,
+        headers={'Content-Range': 'bytes */{}'.format(total)}
+    )
+    response.close()
+    if response.status_code == RESUME_INCOMPLETE:
+        return _received_bytes(response.headers)
+    return None
+
+
+def _put_whole(
+        client: Any,
+        path: str,
+        data: BinaryIO,
+        content_type: str,
+        total: int,
+        return_code: int,
+        progress: Optional[Progress]
+) -> Any:
+    return client.put(
+        path=path,
+        data=FileSection(data, 0, total, total, progress),
+        params="",
+        content_type=content_type,
+        return_code=return_code
+    )
+
+
+def upload_file(
+        client: Any,
+        path: str,
+        file_path: str,
+        content_type: str,
+        return_code: int = 202,
+        chunk_size: Optional[int] = None,
+        progress: Optional[Progress] = None
+) -> Any:
+    """
+        Streams `file_path` to `path` with `PUT` and returns the parsed
+        response completing the upload.
+
+        Without `chunk_size` the file is sent in a single request. With
+        it, the file is sent in chunks of `chunk_size` bytes, each with
+        its `Content-Range`; the NFVO answers `308` with the received
+        `Range` until the last one. When a chunk fails after the client
+        retries, or when the upload is run again (e.g. an operation
+        retry) and the NFVO answers `416` to the first chunk, the upload
+        resumes from what the NFVO reports having received. NFVOs
+        refusing the first chunk get the file in a single request; those
+        taking it as the whole content fail the upload.
+    """
+    total = os.path.getsize(file_path)
+    with open(file_path, 'rb') as data:
+        if chunk_size is None or total <= chunk_size:
+            return _put_whole(
+                client,
+                path,
+                data,
+                content_type,
+                total,
+                return_code,
+                progress
+            )
+        offset = 0
+        # Whether the NFVO answered a chunk the way partial uploads do.
+        partial = False
+        resumes = 0
+        while offset < total:
+            end = min(offset + chunk_size, total)
+            try:
+                response = client._send(
+                    method="PUT",
+                    path=path,
+                    data=FileSection(
+                        data,
+                        offset,
+                        end - offset,
+                        total,
+                        progress
+                    ),
+                    content_type=content_type,
+                    headers={'Content-Range': 'bytes {}-{}/{}'.format(
+                        offset,
+                        end - 1,
+                        total
+                    )}
+                )
+            except RecoverableError:
+                if not partial:
+                    raise
+                response = None
+            status_code = None if response is None else \
+                response.status_code
+            if status_code == RESUME_INCOMPLETE:
+                response.close()
+                partial = True
+                received = _received_bytes(response.headers)
+                if received < offset:
+                    raise NonRecoverableError(
+                        'NFVO lost uploaded content of {}, {} bytes '
+                        'received of {} sent.'.format(
+                            repr(file_path),
+                            received,
+                            end
+                        )
+                    )
+                offset = received
+                continue
+            if status_code == RANGE_NOT_SATISFIABLE:
+                # The NFVO holds content of an earlier upload.
+                response.close()
+                partial = True
+            elif response is not None and (
+                    not partial or
+                    status_code not in client.retry_policy.retry_statuses
+            ):
+                if not partial and \
+                        status_code in PARTIAL_UNSUPPORTED_STATUSES:
+                    response.close()
+                    client.logger.debug(
+                        'Sending {} whole to {}.'.format(
+                            repr(file_path),
+                            repr(client.url)
+                        )
+                    )
+                    return _put_whole(
+                        client,
+                        path,
+                        data,
+                        content_type,
+                        total,
+                        return_code,
+                        progress
+                    )
+                if end < total and status_code < 300:
+                    response.close()
+                    raise NonRecoverableError(
+                        'NFVO took the first {} bytes of {} as the whole '
+                        'content, upload it without a chunk size.'.format(
+                            end,
+                            repr(file_path)
+                        )
+                    )
+                return client._handle_response(
+                    status_code=status_code,
+                    reason=response.reason,
+                    url=response.url,
+                    headers=response.headers,
+                    content=response.content,
+                    return_code=return_code
+                )
+            else:
+                # The chunk failed for good, e.g. a dropped connection
+                # or a 503 left after the client retries.
+                if response is not None:
+                    response.close()
+                resumes += 1
+                if resumes > MAX_RESUMES:
+                    raise RecoverableError(
+                        'Upload of {} failed {} times, last at byte '
+                        '{}.'.format(repr(file_path), resumes, offset)
+                    )
+            offset = _query_offset(client, path, content_type, total)
+            if offset is None:
+                raise NonRecoverableError(
+                    'NFVO does not report how much of {} it received.'
+                    .format(repr(file_path))
+                )
+            client.logger.info(
+                'Resuming upload of {} at byte {}.'.format(
+                    repr(file_path),
+                    offset
+                )
+            )
+        # The NFVO reports holding all the content without having
+        # completed the upload.
+        client.logger.debug('Sending {} whole to {}.'.format(
+            repr(file_path),
+            repr(client.url)
+        ))
+        return _put_whole(
+            client,
+            path,
+            data,
+            content_type,
+            total,
+            return_code,
+            progress
+        )
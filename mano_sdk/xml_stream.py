@@ -0,0 +1,87 @@
+"""
+    mano_sdk.xml_stream
+    ~~~~~~~~
+    Incremental decoding of large XML list responses.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from xml.parsers import expat
+
+
+def _push(parent: Optional[Dict[str, Any]], name: str, value: Any) -> \
+        Dict[str, Any]:
+    """
+        Adds child `name` to `parent`, repeated children becoming a list.
+    """
+    if parent is None:
+        parent = {}
+    if name not in parent:
+        parent[name] = value
+    elif isinstance(parent[name], list):
+        parent[name].append(value)
+    else:
+        parent[name] = [parent[name], value]
+    return parent
+
+
+class XmlItemParser:
+    """
+        Parses an XML document fed in chunks and returns children of the
+        root element as soon as they are complete, converted the way
+        `xmltodict.parse(dict_constructor=dict)` does: attributes become
+        `@name` keys, text next to attributes or children `#text`, and
+        repeated children a list. Names are kept as written, prefix
+        included, and namespace declarations are `@xmlns` attributes.
+
+        Returned children are not kept, so memory stays bounded by the
+        largest item rather than the whole document.
+    """
+
+    def __init__(self):
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._parser.ordered_attributes = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._characters
+        # Value and text of the open elements, innermost one apart.
+        self._stack: List[Tuple[Optional[Dict[str, Any]], List[str]]] = []
+        self._item: Optional[Dict[str, Any]] = None
+        self._text: List[str] = []
+        self._items: List[Any] = []
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._parser.Parse(data, False)
+        return self._read_items()
+
+    def close(self) -> List[Any]:
+        self._parser.Parse(b'', True)
+        return self._read_items()
+
+    def _read_items(self) -> List[Any]:
+        items, self._items = self._items, []
+        return items
+
+    def _start(self, name: str, attributes: List[str]) -> None:
+        self._stack.append((self._item, self._text))
+        self._item = {
+            '@' + attribute: value
+            for attribute, value in zip(attributes[::2], attributes[1::2])
+        } or None
+        self._text = []
+
+    def _characters(self, data: str) -> None:
+        self._text.append(data)
+
+    def _end(self, name: str) -> None:
+        value = self._item
+        text = ''.join(self._text).strip() or None
+        if value is None:
+            value = text
+        elif text:
+            value['#text'] = text
+        self._item, self._text = self._stack.pop()
+        if len(self._stack) == 1:
+            # Child of the root element.
+            self._items.append(value)
+        elif self._stack:
+            self._item = _push(self._item, name, value)
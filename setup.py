@@ -10,8 +10,14 @@ setup(
     zip_safe=False,
     install_requires=[
         "cloudify-common==6.4.0",
+        "aiohttp",
+        "PyYAML",
         "requests",
         "xmltodict"
     ],
+    extras_require={
+        "fast-json": ["orjson"],
+        "brotli": ["brotli"]
+    },
     test_requires=[]
 )
\ No newline at end of file